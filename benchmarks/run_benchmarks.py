@@ -0,0 +1,332 @@
+"""
+Benchmark suite for TITAN.
+
+Runs the shipped settings and the `tests/params` scenarios at a range of population sizes with fixed seeds, measuring population creation, population save/load, time per step by phase (see `titan.timing`), report writing and peak memory.  Each scenario runs in its own process so peak memory is measured per scenario.
+
+Run the benchmarks and save the results:
+
+    python benchmarks/run_benchmarks.py run --sizes 1000 10000 -o results.json
+
+Compare results against a baseline (exits non-zero if anything is slower than the threshold):
+
+    python benchmarks/run_benchmarks.py compare baseline.json results.json
+
+Compare the time per step spent on rare hazards (mortality, incarceration, HAART discontinuation and knowledge conversion) drawn each time step and with time-to-event sampling (`model.time_to_event`):
+
+    python benchmarks/run_benchmarks.py hazards --sizes 10000 50000
+"""
+
+import argparse
+from datetime import datetime
+import json
+from multiprocessing import get_context
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+from typing import Dict, List, Optional
+
+path_to_this_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_to_this_dir, ".."))
+
+from titan.model import TITAN  # noqa: E402
+from titan.population import Population  # noqa: E402
+import titan.population_io as pop_io  # noqa: E402
+from titan.parse_params import create_params  # noqa: E402
+from titan import utils  # noqa: E402
+
+SETTINGS = ["atlanta", "chicago", "mississippi", "nyc-msm", "scott"]
+TEST_PARAMS = ["basic", "basic_seeded", "integration_base", "simple_integration"]
+SCENARIOS = [f"setting:{s}" for s in SETTINGS] + [f"params:{p}" for p in TEST_PARAMS]
+SIZES = [1000, 10000, 50000, 200000]
+
+BENCHMARK_PARAMS = os.path.join(path_to_this_dir, "params", "benchmark.yml")
+TEST_PARAMS_DIR = os.path.join(path_to_this_dir, "..", "tests", "params")
+
+# metrics where a higher value is better, all others are times/memory
+HIGHER_IS_BETTER = {"steps_per_second"}
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        return max_rss / 1024**2
+    return max_rss / 1024
+
+
+def get_params(scenario: str, outdir: str):
+    """
+    Create the params for a scenario (`setting:<name>` or `params:<tests/params file>`)
+    """
+    kind, name = scenario.split(":")
+    if kind == "setting":
+        return create_params(name, BENCHMARK_PARAMS, outdir)
+    elif kind == "params":
+        return create_params(None, os.path.join(TEST_PARAMS_DIR, f"{name}.yml"), outdir)
+    else:
+        raise ValueError(f"Unknown scenario {scenario}")
+
+
+def run_scenario(
+    scenario: str,
+    size: int,
+    num_steps: int,
+    burn_steps: int,
+    param_overrides: Optional[Dict] = None,
+) -> Dict:
+    """
+    Benchmark one scenario at one population size, intended to run in a fresh process.  `param_overrides` are further params to set, keyed by param path (e.g. `model|time_to_event`).
+    """
+    outdir = tempfile.mkdtemp()
+    try:
+        params = get_params(scenario, outdir)
+        overrides = {
+            "model|num_pop": size,
+            "model|time|num_steps": num_steps,
+            "model|time|burn_steps": burn_steps,
+            "model|seed|run": 1234,
+            "model|seed|ppl": 4321,
+            "model|num_reps": 1,
+            "outputs|timing": True,
+            "outputs|logging|destination": "file",
+            "outputs|logging|filepath": outdir,
+            **(param_overrides or {}),
+        }
+        for param_path, value in overrides.items():
+            utils.override_param(params, param_path, value)
+        os.mkdir(os.path.join(outdir, "network"))
+
+        tic = perf_counter()
+        pop = Population(params)
+        create_time = perf_counter() - tic
+
+        pop_dir = os.path.join(outdir, "pop")
+        os.mkdir(pop_dir)
+        tic = perf_counter()
+        pop_path = pop_io.write(pop, pop_dir)
+        save_time = perf_counter() - tic
+
+        tic = perf_counter()
+        pop_io.read(params, pop_path)
+        load_time = perf_counter() - tic
+
+        model = TITAN(params, pop=pop)
+        tic = perf_counter()
+        model.run(outdir)
+        run_time = perf_counter() - tic
+
+        total_steps = num_steps + burn_steps
+        timer = model.timer
+        return {
+            "scenario": scenario,
+            "size": size,
+            "num_agents": pop.all_agents.num_members(),
+            "steps": total_steps,
+            "population_create_seconds": create_time,
+            "population_save_seconds": save_time,
+            "population_load_seconds": load_time,
+            "run_seconds": run_time,
+            "steps_per_second": total_steps / run_time,
+            "report_seconds": timer.seconds.get("print_stats", 0.0),
+            "peak_rss_mb": peak_rss_mb(),
+            "phase_seconds_per_step": {
+                name: seconds / total_steps for name, seconds in timer.seconds.items()
+            },
+            "phase_calls": timer.calls,
+        }
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+
+
+def run(
+    scenarios: List[str],
+    sizes: List[int],
+    num_steps: int,
+    burn_steps: int,
+    out: str,
+):
+    """
+    Run every scenario at every size, each in a fresh process, and save the results as json
+    """
+    results = []
+    for scenario in scenarios:
+        for size in sizes:
+            print(f"Running {scenario} with {size} agents...", flush=True)
+            with get_context("spawn").Pool(1) as pool:
+                try:
+                    result = pool.apply(
+                        run_scenario, (scenario, size, num_steps, burn_steps)
+                    )
+                except Exception as e:
+                    print(f"  failed: {e}")
+                    continue
+            print(
+                f"  create {result['population_create_seconds']:.2f}s, "
+                f"{result['steps_per_second']:.2f} steps/s, "
+                f"peak {result['peak_rss_mb']:.0f}MB"
+            )
+            results.append(result)
+
+    output = {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "num_steps": num_steps,
+        "burn_steps": burn_steps,
+        "results": results,
+    }
+    with open(out, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results saved to {out}")
+
+
+def hazards(scenarios: List[str], sizes: List[int], num_steps: int, burn_steps: int):
+    """
+    Run every scenario at every size with rare hazards drawn each time step and with time-to-event sampling, each in a fresh process, and print the time per step of the phases the hazards are drawn in
+    """
+    phases = ["die_and_replace", "update_agents", "hazards"]
+    print(
+        f"{'scenario':<28}{'size':>8}  {'time_to_event':<15}"
+        + "".join(f"{phase + ' ms':>20}" for phase in phases)
+        + f"{'total ms':>12}"
+    )
+    for scenario in scenarios:
+        for size in sizes:
+            totals = []
+            for time_to_event in (False, True):
+                with get_context("spawn").Pool(1) as pool:
+                    result = pool.apply(
+                        run_scenario,
+                        (
+                            scenario,
+                            size,
+                            num_steps,
+                            burn_steps,
+                            {"model|time_to_event": time_to_event},
+                        ),
+                    )
+                per_step = result["phase_seconds_per_step"]
+                times = [per_step.get(phase, 0.0) * 1000 for phase in phases]
+                totals.append(sum(times))
+                print(
+                    f"{scenario:<28}{size:>8}  {str(time_to_event):<15}"
+                    + "".join(f"{t:>20.2f}" for t in times)
+                    + f"{sum(times):>12.2f}"
+                )
+            print(f"{'':<36}speedup {totals[0] / totals[1]:.2f}x")
+
+
+def compare(baseline: str, current: str, threshold: float) -> int:
+    """
+    Compare benchmark results against a baseline, printing the change in each metric and flagging those worse than the threshold (e.g. 0.1 is 10% worse)
+
+    returns:
+        the number of regressions
+    """
+    with open(baseline) as f:
+        base = {(r["scenario"], r["size"]): r for r in json.load(f)["results"]}
+    with open(current) as f:
+        curr = {(r["scenario"], r["size"]): r for r in json.load(f)["results"]}
+
+    metrics = [
+        "population_create_seconds",
+        "population_save_seconds",
+        "population_load_seconds",
+        "steps_per_second",
+        "report_seconds",
+        "peak_rss_mb",
+    ]
+    regressions = 0
+    print(f"{'scenario':<28}{'size':>8}  {'metric':<28}{'baseline':>12}{'current':>12}")
+    for key in sorted(base.keys() & curr.keys()):
+        for metric in metrics:
+            old: Optional[float] = base[key].get(metric)
+            new: Optional[float] = curr[key].get(metric)
+            if not old or new is None:
+                continue
+
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = ""
+            if worse > threshold:
+                flag = "  <-- worse"
+                regressions += 1
+            print(
+                f"{key[0]:<28}{key[1]:>8}  {metric:<28}{old:>12.3f}{new:>12.3f}"
+                f"  {change:+.1%}{flag}"
+            )
+
+    for key in sorted(base.keys() ^ curr.keys()):
+        print(f"{key[0]} ({key[1]}) only in {'baseline' if key in base else 'current'}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run or compare TITAN benchmarks")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser("run", help="run benchmarks")
+    run_parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=SCENARIOS,
+        help="scenarios to run, setting:<name> or params:<tests/params file>",
+    )
+    run_parser.add_argument(
+        "--sizes", nargs="+", type=int, default=SIZES, help="population sizes"
+    )
+    run_parser.add_argument(
+        "--steps", type=int, default=10, help="number of time steps to run"
+    )
+    run_parser.add_argument(
+        "--burn", type=int, default=0, help="number of burn in time steps to run"
+    )
+    run_parser.add_argument(
+        "-o", "--out", default="benchmark_results.json", help="results file"
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="compare to a baseline")
+    compare_parser.add_argument("baseline", help="baseline results file")
+    compare_parser.add_argument("current", help="current results file")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fractional change that counts as worse (default 0.1)",
+    )
+
+    hazards_parser = subparsers.add_parser(
+        "hazards", help="compare rare hazards with and without time-to-event sampling"
+    )
+    hazards_parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=[f"setting:{s}" for s in SETTINGS],
+        help="scenarios to run, setting:<name> or params:<tests/params file>",
+    )
+    hazards_parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10000], help="population sizes"
+    )
+    hazards_parser.add_argument(
+        "--steps", type=int, default=10, help="number of time steps to run"
+    )
+    hazards_parser.add_argument(
+        "--burn", type=int, default=0, help="number of burn in time steps to run"
+    )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.scenarios, args.sizes, args.steps, args.burn, args.out)
+    elif args.command == "hazards":
+        hazards(args.scenarios, args.sizes, args.steps, args.burn)
+    else:
+        sys.exit(1 if compare(args.baseline, args.current, args.threshold) else 0)
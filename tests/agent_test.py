@@ -2,6 +2,7 @@ import pytest
 import os
 
 from titan.agent import *
+from titan.parse_params import ObjMap
 
 from conftest import FakeRandom
 
@@ -34,6 +35,73 @@ def test_agent_init(make_agent):
     assert a.hiv.aids is False
 
 
+@pytest.mark.unit
+def test_agent_init_inactive(make_agent, params):
+    params.features.random_trial = False
+    a = make_agent()
+    b = make_agent()
+
+    # enabled features get their own instance
+    assert a.prep is not b.prep
+    assert a.prep.agent is a
+
+    # disabled features share a read only inactive instance
+    assert a.random_trial is b.random_trial
+    assert isinstance(a.random_trial, features.RandomTrial)
+    assert a.random_trial.active is False
+    assert a.random_trial.treated is False
+    assert a.random_trial.agent is None
+
+    a.random_trial.active = False  # not a change
+    with pytest.raises(AttributeError):
+        a.random_trial.active = True
+
+
+@pytest.mark.unit
+def test_agent_init_location_override(make_agent, params):
+    # features are enabled for the whole model, a location can't turn one off
+    params.location.scaling.world["features|high_risk"] = ObjMap(
+        {"field": "override", "override": False}
+    )
+    world = Location("world", params.classes.locations.world, params)
+    assert world.params.features.high_risk is False
+
+    a = make_agent(location=world)
+    assert a.high_risk.agent is a
+    assert a.high_risk is not make_agent(location=world).high_risk
+
+    # the location's params still keep its agents from becoming high risk
+    a.high_risk.become_high_risk(None, 0)
+    assert a.high_risk.active is False
+
+
+@pytest.mark.unit
+def test_get_risk_multiplier(make_agent):
+    a = make_agent()
+    model_features = [features.Prep, features.HAART, features.Vaccine]
+    assert a.get_risk_multiplier(model_features, "acquisition", 0, "sex", 1) == 1.0
+
+    a.prep.active = True
+    a.prep.type = "Oral"
+    a.prep.adherent = True
+    a.prep.last_dose_time = 0
+    # cached until reset or the next time step
+    assert a.get_risk_multiplier(model_features, "acquisition", 0, "sex", 1) == 1.0
+    a.reset_risk_multipliers()
+    expected = 1.0 - a.location.params.prep.efficacy.adherent
+    assert a.get_risk_multiplier(model_features, "acquisition", 0, "sex", 1) == expected
+
+    a.prep.adherent = False
+    expected = 1.0 - a.location.params.prep.efficacy.non_adherent
+    assert a.get_risk_multiplier(model_features, "acquisition", 0, "sex", 2) == expected
+
+    # transmission is cached separately, prep doesn't affect it
+    assert a.get_risk_multiplier(model_features, "transmission", 0, "sex", 2) == 1.0
+
+    a.vaccine.vaccinate(2)
+    assert a.risk_multipliers == {}
+
+
 @pytest.mark.unit
 def test_get_partners(make_agent):
     a = make_agent()
@@ -149,6 +217,18 @@ def test_relationship(make_agent, make_relationship):
     assert r2 in p2.relationships
 
 
+@pytest.mark.unit
+def test_relationship_slots(make_agent, make_relationship):
+    a = make_agent()
+    p = make_agent()
+    rel = make_relationship(a, p)
+
+    # relationships only have their declared attributes
+    assert not hasattr(rel, "__dict__")
+    with pytest.raises(AttributeError):
+        rel.total_sex_acts = 0
+
+
 @pytest.mark.unit
 def test_get_partner(make_agent, make_relationship):
     a = make_agent()
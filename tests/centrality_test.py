@@ -0,0 +1,109 @@
+import pytest
+import networkx as nx  # type: ignore
+import numpy as np
+
+from titan.centrality import Centrality
+from titan import utils
+
+
+@pytest.fixture
+def graph():
+    g = nx.gnm_random_graph(60, 50, seed=1234)
+    g.add_edges_from([(100, 101), (101, 102), (102, 100), (102, 103)])
+    g.add_node(200)
+    return g
+
+
+@pytest.mark.unit
+def test_components(graph):
+    c = Centrality(graph, version=3)
+    assert c.version == 3
+    expected = utils.connected_components(graph)
+    assert len(c.components) == len(expected)
+    for comp, exp in zip(c.components, expected):
+        assert len(comp) == exp.number_of_nodes()
+    for label, comp in enumerate(c.components):
+        nodes = set(c.get_nodes(comp))
+        assert nx.is_connected(graph.subgraph(nodes))
+        assert all(c.labels[c.node_index[n]] == label for n in nodes)
+
+
+@pytest.mark.unit
+def test_degree_closeness(graph):
+    c = Centrality(graph)
+    degree = nx.degree_centrality(graph)
+    closeness = c.closeness_centrality()
+    for i, node in enumerate(c.nodes):
+        assert c.degree_centrality()[i] == pytest.approx(degree[node])
+        assert closeness[i] == pytest.approx(nx.closeness_centrality(graph, node))
+
+
+@pytest.mark.unit
+def test_eigenvector(graph):
+    c = Centrality(graph)
+    eigenvector = c.eigenvector_centrality(max_iter=1000)
+    for comp in c.components:
+        nodes = c.get_nodes(comp)
+        expected = nx.eigenvector_centrality(graph.subgraph(nodes), max_iter=1000)
+        for i, node in zip(comp, nodes):
+            assert eigenvector[i] == pytest.approx(expected[node], abs=1e-4)
+
+
+@pytest.mark.unit
+def test_bridges(graph):
+    c = Centrality(graph)
+    bridges = {frozenset(c.get_nodes(edge)) for edge in c.bridges().tolist()}
+    expected = {frozenset(edge) for edge in nx.bridges(graph)}
+    assert bridges == expected
+    assert frozenset((102, 103)) in bridges
+    assert frozenset((100, 101)) not in bridges
+
+
+@pytest.mark.unit
+def test_approximate_closeness(graph):
+    c = Centrality(graph)
+    exact = c.closeness_centrality()
+    approximate = c.approximate_closeness(100, np.random.default_rng(0))
+    assert approximate == pytest.approx(exact)
+    assert c.approximate_closeness(1, None) is approximate  # cached
+
+    c = Centrality(graph)
+    approximate = c.approximate_closeness(10, np.random.default_rng(0))
+    assert approximate == pytest.approx(exact, rel=0.5)
+
+
+@pytest.mark.unit
+def test_sample_clustering():
+    graph = nx.powerlaw_cluster_graph(500, 3, 0.5, seed=1)
+    c = Centrality(graph)
+    assert c.num_edges() == graph.number_of_edges()
+    assert c.degree_histogram() == nx.degree_histogram(graph)
+
+    estimate, bound = c.sample_clustering(20000, np.random.default_rng(1))
+    assert 0 < bound < 0.05
+    assert estimate == pytest.approx(nx.average_clustering(graph), abs=bound)
+
+
+@pytest.mark.unit
+def test_component_stats():
+    graph = nx.powerlaw_cluster_graph(100, 2, 0.5, seed=1)
+    graph.add_edges_from([(100, 101), (101, 102), (102, 100), (102, 103)])
+    graph.add_node(200)
+    c = Centrality(graph)
+
+    expected_triangles = nx.triangles(graph)
+    for i, node in enumerate(c.nodes):
+        assert c.triangles()[i] == expected_triangles[node]
+
+    density, effective_size, deg_cent = c.component_stats()
+    for label, comp in enumerate(c.components):
+        subgraph = graph.subgraph(c.get_nodes(comp))
+        assert density[label] == pytest.approx(nx.density(subgraph))
+        assert effective_size[label] == pytest.approx(
+            np.mean(list(nx.effective_size(subgraph).values()))
+            if subgraph.number_of_nodes() > 1
+            else 0
+        )
+        assert deg_cent[label] == pytest.approx(
+            np.mean(list(nx.degree_centrality(subgraph).values()))
+        )
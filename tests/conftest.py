@@ -1,6 +1,7 @@
 import pytest
 
 import os
+import itertools
 import shutil
 
 from titan.parse_params import create_params
@@ -93,6 +94,33 @@ def make_model(params):
     return _make_model
 
 
+@pytest.fixture
+def run_model(params, tmpdir):
+    run_num = itertools.count()
+
+    # run a seeded model, returning it and its basic report without the run_id
+    def _run_model(p=params, num_steps=5, before_run=None):
+        p.model.seed.run = 1234
+        p.model.seed.ppl = 5678
+        p.model.time.num_steps = num_steps
+        outdir = tmpdir.mkdir(f"run_{next(run_num)}")
+        outdir.mkdir("network")
+        # agent and relationship ids determine iteration order
+        Agent.next_agent_id = 0
+        Relationship.next_rel_id = 0
+        model = TITAN(p)
+        if before_run is not None:
+            before_run(model)
+        model.run(outdir)
+
+        with open(os.path.join(outdir, "basicReport.txt")) as f:
+            report = [line.split("\t")[1:] for line in f]
+
+        return model, report
+
+    return _run_model
+
+
 @pytest.fixture
 def make_population(params):
     def _make_population(n=0):
@@ -0,0 +1,37 @@
+import pytest
+
+from titan.events import EventScheduler
+
+
+@pytest.mark.unit
+def test_event_scheduler(make_model, make_agent):
+    model = make_model()
+    scheduler = EventScheduler()
+    agents = [make_agent() for _ in range(3)]
+    for agent in agents:
+        model.pop.add_agent(agent)
+
+    calls = []
+
+    def callback(agent):
+        return lambda model: calls.append((agent, model.time))
+
+    model.time = 0
+    scheduler.schedule(2, agents[2], callback(agents[2]))
+    scheduler.schedule(2, agents[0], callback(agents[0]))
+    scheduler.schedule(3, agents[1], callback(agents[1]))
+    scheduler.schedule(2, agents[1], callback(agents[1]))
+    assert len(scheduler) == 4
+
+    assert scheduler.run(model) == 0
+
+    # run in agent order, skipping agents no longer in the population
+    model.pop.remove_agent(agents[1])
+    model.time = 2
+    assert scheduler.run(model) == 2
+    assert calls == [(agents[0], 2), (agents[2], 2)]
+    assert len(scheduler) == 1
+
+    # events for time steps which have been run are dropped
+    scheduler.schedule(2, agents[0], callback(agents[0]))
+    assert len(scheduler) == 1
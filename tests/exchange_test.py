@@ -0,0 +1,123 @@
+import pytest
+
+from titan.exchange import Exchange, ExchangeRequest, ExchangeResponse
+from titan.population import Population
+from titan.parse_params import ObjMap
+
+from conftest import FakeRandom
+
+
+@pytest.fixture
+def params(params):
+    params.classes.locations = ObjMap(
+        {"north": {"ppl": 0.4}, "south": {"ppl": 0.4}, "east": {"ppl": 0.2}}
+    )
+    params.location.scaling = ObjMap({"north": {}, "south": {}, "east": {}})
+    params.location.edges = ObjMap(
+        {
+            "north_south": {
+                "location_1": "north",
+                "location_2": "south",
+                "distance": 1,
+            },
+            "south_east": {"location_1": "south", "location_2": "east", "distance": 3},
+        }
+    )
+    params.location.exchange.enable = True
+    return params
+
+
+@pytest.mark.unit
+def test_exchange_neighbors(params):
+    params.model.num_pop = 0
+    pop = Population(params)
+    exchange = Exchange(pop.geography)
+
+    assert exchange.neighbors["north"] == (["south"], [0.5])
+    assert exchange.neighbors["south"] == (["north", "east"], [0.5, 0.25])
+    assert exchange.neighbors["east"] == (["south"], [0.25])
+    assert exchange.has_neighbors("north")
+    assert not exchange.has_neighbors("west")
+
+
+@pytest.mark.unit
+def test_exchange_route(params):
+    params.model.num_pop = 0
+    pop = Population(params)
+    exchange = Exchange(pop.geography)
+
+    exchange.submit([ExchangeRequest(3, "east", "Sex")])
+    exchange.submit([ExchangeRequest(2, "north", "Sex")])
+    routed = exchange.route(FakeRandom(0.1))
+    assert exchange.requests == []
+    # requests are routed in agent id order
+    assert routed == {
+        "south": [ExchangeRequest(2, "north", "Sex"), ExchangeRequest(3, "east", "Sex")]
+    }
+
+    exchange.respond([ExchangeResponse(3, "east", "Sex", None)])
+    exchange.respond([ExchangeResponse(2, "north", "Sex", 5)])
+    assert exchange.deliver() == [
+        ExchangeResponse(2, "north", "Sex", 5),
+        ExchangeResponse(3, "east", "Sex", None),
+    ]
+    assert exchange.responses == []
+
+
+@pytest.mark.unit
+def test_exchange_answer_apply(params):
+    params.model.num_pop = 0
+    pop = Population(params)
+    exchange = Exchange(pop.geography)
+    north = pop.geography.locations["north"]
+    south = pop.geography.locations["south"]
+
+    agent = pop.create_agent(north, "white", 0, "MSM")
+    local = pop.create_agent(north, "white", 0, "MSM")
+    other = pop.create_agent(south, "white", 0, "MSM")
+    for a in (agent, local, other):
+        pop.add_agent(a)
+        a.target_partners["Sex"] = 1
+    agents = {a.id: a for a in (agent, local, other)}
+
+    partnerable = {"north": {local}, "south": {other}, "east": set()}
+    exchange.submit([ExchangeRequest(agent.id, "north", "Sex")])
+    routed = exchange.route(FakeRandom(0.1))
+    responses = pop.answer_exchange(routed["south"], partnerable["south"], agents)
+    assert responses == [ExchangeResponse(agent.id, "north", "Sex", other.id)]
+    # answering doesn't form the relationship
+    assert agent.get_partners() == set()
+
+    exchange.respond(responses)
+    assert pop.apply_exchange(exchange.deliver(), partnerable, agents) == 1
+    assert agent.get_partners() == {other}
+
+    # agents with their target number of partners aren't answered or partnered
+    responses = pop.answer_exchange(
+        [ExchangeRequest(agent.id, "north", "Sex")], {local}, agents
+    )
+    assert responses == [ExchangeResponse(agent.id, "north", "Sex", None)]
+    response = ExchangeResponse(agent.id, "north", "Sex", local.id)
+    assert pop.apply_exchange([response], partnerable, agents) == 0
+
+
+@pytest.mark.unit
+def test_exchange_answer_capacity(params):
+    params.model.num_pop = 0
+    params.calibration.partnership.buffer = 1
+    pop = Population(params)
+    north = pop.geography.locations["north"]
+    south = pop.geography.locations["south"]
+
+    requesters = [pop.create_agent(north, "white", 0, "MSM") for _ in range(3)]
+    other = pop.create_agent(south, "white", 0, "MSM")
+    for a in requesters + [other]:
+        pop.add_agent(a)
+        a.target_partners["Sex"] = 1
+    agents = {a.id: a for a in requesters + [other]}
+
+    # as in bond, the partner can take partners until they have more than
+    # target * buffer
+    requests = [ExchangeRequest(a.id, "north", "Sex") for a in requesters]
+    responses = pop.answer_exchange(requests, {other}, agents)
+    assert [response.partner_id for response in responses] == [other.id, other.id, None]
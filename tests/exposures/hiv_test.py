@@ -71,14 +71,20 @@ def test_hiv_convert(make_model, make_agent):
     a.prep.active = True
 
     model.run_random = FakeRandom(-0.1)
+    num_hiv = HIV.counts[a.race]
 
     a.hiv.convert(model)
 
     assert a.hiv.active
     assert a.hiv.time == model.time
     assert a in HIV.agents
+    assert HIV.counts[a.race] == num_hiv + 1
     assert a.prep.active is False
 
+    # diagnosis doesn't re-count the agent
+    a.hiv.diagnose(model)
+    assert HIV.counts[a.race] == num_hiv + 1
+
 
 @pytest.mark.unit
 def test_diagnose_hiv(make_model, make_agent):
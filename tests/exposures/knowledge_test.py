@@ -4,7 +4,7 @@ from conftest import FakeRandom
 
 from titan.agent import Relationship
 from titan import utils
-from titan.exposures import influence
+from titan.exposures import influence, Knowledge
 
 
 @pytest.mark.unit
@@ -108,3 +108,40 @@ def test_knowledge_exposure(make_model, make_agent, params):
 
     assert a.knowledge.active
     assert a.prep.active
+
+
+@pytest.mark.unit
+def test_get_influence(make_model, params):
+    params.exposures.knowledge = True
+    model = make_model(params)
+    agent = max(model.pop.all_agents, key=lambda a: len(a.relationships))
+    assert len(agent.relationships) >= 2
+    rel = next(iter(agent.relationships))
+
+    centrality = model.pop.get_centrality()
+    expected = centrality.node_closeness(centrality.node_index[agent])
+    assert Knowledge.get_influence(model, agent) == expected
+    assert Knowledge.centrality is centrality
+
+    # network changes, exact centrality is recalculated
+    rel.progress(force=True)
+    model.pop.remove_relationship(rel)
+    assert Knowledge.get_influence(model, agent) < expected
+    assert Knowledge.centrality.version == model.pop.graph_version
+
+    # approximate centrality re-used for refresh time steps
+    model.params.knowledge.influence.centrality = "approximate"
+    model.params.knowledge.influence.refresh = 2
+    Knowledge.init_class(model.params)
+    model.time = 1
+    Knowledge.get_influence(model, agent)
+    centrality = Knowledge.centrality
+    rel = next(iter(agent.relationships))
+    rel.progress(force=True)
+    model.pop.remove_relationship(rel)
+    model.time = 2
+    Knowledge.get_influence(model, agent)
+    assert Knowledge.centrality is centrality
+    model.time = 3
+    Knowledge.get_influence(model, agent)
+    assert Knowledge.centrality is not centrality
@@ -10,6 +10,7 @@ from conftest import FakeRandom
 def test_become_high_risk(make_model, make_agent):
     model = make_model()
     a = make_agent()
+    num_high_risk = HighRisk.counts[a.race]
 
     a.high_risk.become_high_risk(model.pop, model.time, 10)
 
@@ -17,6 +18,11 @@ def test_become_high_risk(make_model, make_agent):
     assert a.high_risk.ever
     assert a.high_risk.duration == 10
     assert a.high_risk.time == model.time
+    assert HighRisk.counts[a.race] == num_high_risk + 1
+
+    # already high risk, not counted again
+    a.high_risk.become_high_risk(model.pop, model.time, 10)
+    assert HighRisk.counts[a.race] == num_high_risk + 1
 
     a.location.params.features.high_risk = False
     assert not a.high_risk.become_high_risk(model.pop, model.time, 10)
@@ -80,3 +86,25 @@ def test_update_high_risk_incar(make_model, make_agent, make_relationship):
 
     assert a.high_risk.active
     assert a.high_risk.duration == 6
+
+
+@pytest.mark.unit
+def test_high_risk_end_event(make_model, make_agent, params):
+    params.model.feature_events = True
+    model = make_model(params)
+    a = make_agent()
+    model.pop.add_agent(a)
+
+    a.high_risk.become_high_risk(model.pop, model.time, 1)
+    assert a.high_risk.end_time == model.time + 2
+
+    model.time += 1
+    a.high_risk.update_agent(model)
+    model.pop.events.run(model)
+    assert a.high_risk.active
+    assert a.high_risk.duration == 1
+
+    model.time += 1
+    model.pop.events.run(model)
+    assert a.high_risk.active is False
+    assert a.high_risk.ever
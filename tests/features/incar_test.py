@@ -47,12 +47,20 @@ def test_incarcerate_not_diagnosed(make_model, make_agent):
     rel = Relationship(a, p, 10, bond_type="Sex")
 
     model.run_random = FakeRandom(0.0)  # always less than params
+    num_incar = Incar.counts[a.race]
 
     a.incar.update_agent(model)
 
     assert a.incar.active
     assert a.incar.release_time == model.time + 1
     assert a.hiv.dx
+    assert Incar.counts[a.race] == num_incar + 1
+
+    model.time = a.incar.release_time
+    a.incar.update_agent(model)
+
+    assert not a.incar.active
+    assert Incar.counts[a.race] == num_incar
 
 
 @pytest.mark.unit
@@ -96,3 +104,27 @@ def test_incarcerate_diagnosed(make_model, make_agent):
     assert a.incar.release_time == model.time + 1
     assert a.haart.active
     assert not a.haart.adherent
+
+
+@pytest.mark.unit
+def test_incar_release_event(make_model, make_agent, params):
+    params.model.feature_events = True
+    model = make_model(params)
+    model.run_random = FakeRandom(-0.1)
+    a = make_agent()
+    model.pop.add_agent(a)
+    a.hiv.active = True
+    a.haart.active = True
+
+    a.incar.active = True
+    a.incar.release_time = model.time + 2
+    a.incar.schedule_events(model.pop.events)
+
+    # released by the scheduled event, not by update_agent
+    model.time += 2
+    a.incar.update_agent(model)
+    assert a.incar.active
+
+    model.pop.events.run(model)
+    assert a.incar.active is False
+    assert a.haart.active is False
@@ -42,3 +42,33 @@ def test_partner_tracing(make_model, make_agent):
     p.partner_tracing.update_agent(model)
     assert p.partner_tracing.active is False
     assert p.partner_tracing.time is None
+
+
+@pytest.mark.unit
+def test_partner_tracing_end_event(make_model, make_agent, params):
+    params.model.feature_events = True
+    model = make_model(params)
+    model.time = model.params.partner_tracing.start_time + 1
+    a = make_agent()
+    p = make_agent()
+    model.pop.add_agent(a)
+    model.pop.add_agent(p)
+    a.hiv.active = True
+    p.location.params.partner_tracing.trace_duration = 2
+    a.partners["Sex"].add(p)
+
+    model.run_random = FakeRandom(-0.1)  # always less than param
+    a.hiv.diagnose(model)
+
+    model.time += 1
+    a.partner_tracing.update_agent(model)
+    assert p.partner_tracing.active
+
+    # tracing is stopped by the scheduled event, not by update_agent
+    model.time += 2
+    p.partner_tracing.update_agent(model)
+    assert p.partner_tracing.active
+
+    model.pop.events.run(model)
+    assert p.partner_tracing.active is False
+    assert p.partner_tracing.time is None
@@ -426,3 +426,26 @@ def test_get_acquisition_risk_multiplier(make_agent):
 
     a.prep.type = "Inj"
     assert 0 < a.prep.get_acquisition_risk_multiplier(t, "sex") < 1.0
+
+
+@pytest.mark.unit
+def test_inj_prep_end_event(make_agent, params, make_model):
+    params.model.feature_events = True
+    model = make_model(params)
+    model.time = model.params.prep.start_time
+    model.run_random = FakeRandom(1.1)
+    a = make_agent()
+    model.pop.add_agent(a)
+    a.location.params.prep.type = ["Inj"]
+
+    a.prep.initiate(model, force=True)
+    assert a.prep.type == "Inj"
+
+    # ended by the scheduled event, not by update_agent
+    model.time += model.params.model.time.steps_per_year
+    a.prep.update_agent(model)
+    assert a.prep.active
+
+    model.pop.events.run(model)
+    assert a.prep.active is False
+    assert a.prep.last_dose_time is None
@@ -8,6 +8,7 @@ from titan.features import RandomTrial
 
 @pytest.mark.unit
 def test_initialize_random_trial_prep_all(make_model, params):
+    params.features.random_trial = True
     params.features.prep = True
     params.vaccine.on_init = False
     params.prep.cap = 0
@@ -25,6 +26,7 @@ def test_initialize_random_trial_prep_all(make_model, params):
 
 @pytest.mark.unit
 def test_initialize_random_trial_prep_eigenvector(make_model, params):
+    params.features.random_trial = True
     params.features.prep = True
     params.vaccine.on_init = False
     params.prep.cap = 0
@@ -51,6 +53,7 @@ def test_initialize_random_trial_prep_eigenvector(make_model, params):
 
 @pytest.mark.unit
 def test_initialize_random_trial_prep_random(make_model, params):
+    params.features.random_trial = True
     params.features.prep = True
     params.vaccine.on_init = False
     params.prep.cap = 0
@@ -77,6 +80,7 @@ def test_initialize_random_trial_prep_random(make_model, params):
 
 @pytest.mark.unit
 def test_initialize_random_trial_pca_bridge(make_model, params):
+    params.features.random_trial = True
     # knowledge bridge trial
     params.random_trial.treatment = "knowledge"
     params.hiv.start_time = 5
@@ -20,3 +20,34 @@ def test_update_syringe_services(make_model):
         if a.drug_type == "Inj":
             assert a in model.pop.pwid_agents.members
             assert a.syringe_services.active
+
+
+@pytest.mark.unit
+def test_syringe_services_pools(make_model):
+    model = make_model()
+    for agent in list(model.pop.all_agents)[:10]:
+        if agent not in model.pop.pwid_agents.members:
+            agent.drug_type = "Inj"
+            model.pop.pwid_agents.add_agent(agent)
+    num_pwid = model.pop.pwid_agents.num_members()
+
+    model.time = 3
+    SyringeServices.update_pop(model)
+    assert len(SyringeServices.enrolled) + len(SyringeServices.unenrolled) == num_pwid
+    for agent in model.pop.pwid_agents:
+        assert agent.syringe_services.active == (agent in SyringeServices.enrolled)
+
+    # remove slots, everyone unenrolled
+    model.time = 20
+    SyringeServices.update_pop(model)
+    assert len(SyringeServices.enrolled) == 0
+    assert len(SyringeServices.unenrolled) == num_pwid
+    assert not any(a.syringe_services.active for a in model.pop.pwid_agents)
+
+    # dead agents leave the pool
+    agent = next(iter(model.pop.pwid_agents))
+    model.pop.remove_agent(agent)
+    model.deaths.append(agent)
+    SyringeServices.update_pop(model)
+    assert agent not in SyringeServices.unenrolled
+    assert len(SyringeServices.unenrolled) == num_pwid - 1
@@ -64,3 +64,34 @@ def test_vaccine_cquisition_risk_multiplier(make_agent):
     a.vaccine.vaccinate(0)
 
     assert a.vaccine.get_acquisition_risk_multiplier(1, "sex") < 1.0
+
+
+@pytest.mark.unit
+def test_vaccine_booster_event(make_model, make_agent, params):
+    params.model.feature_events = True
+    model = make_model(params)
+    model.time = model.params.vaccine.start_time
+    model.run_random = FakeRandom(-0.1)
+    a = make_agent()
+    model.pop.add_agent(a)
+
+    a.vaccine.update_agent(model)
+    assert a.vaccine.active
+
+    interval = (
+        a.location.params.demographics[a.race]
+        .sex_type[a.sex_type]
+        .vaccine.booster.interval
+    )
+    model.time += interval
+    a.vaccine.update_agent(model)
+    assert a.vaccine.time == model.time - interval
+
+    model.pop.events.run(model)
+    assert a.vaccine.time == model.time
+
+    # the next booster is scheduled, but not given to agents on PrEP
+    a.prep.active = True
+    model.time += interval
+    model.pop.events.run(model)
+    assert a.vaccine.time == model.time - interval
@@ -0,0 +1,117 @@
+import pytest
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from titan.hazards import HazardEngine
+
+
+@pytest.mark.unit
+def test_hazard_engine(make_model, make_agent):
+    model = make_model()
+    engine = HazardEngine()
+    a = make_agent()
+    b = make_agent()
+    for agent in (a, b):
+        model.pop.add_agent(agent)
+
+    probs = {a: 1.0, b: 0.0}
+    calls = []
+    engine.add_hazard(
+        "hazard",
+        lambda model, agent: probs[agent],
+        lambda model, agent: calls.append((agent, model.time)),
+    )
+
+    # drawn from the next time step, and only for agents at risk
+    model.time = 0
+    engine.update(model, a)
+    engine.update(model, b)
+    assert engine.draws["hazard"] == {a: (1.0, 1)}
+
+    # occurrences run when due, and the next one is drawn
+    model.time = 1
+    assert engine.run(model, "hazard") == 1
+    assert calls == [(a, 1)]
+    assert engine.draws["hazard"][a] == (1.0, 2)
+
+    # redrawn occurrences are skipped when they come due
+    probs[a] = 0.0
+    engine.update(model, a)
+    assert a not in engine.draws["hazard"]
+    model.time = 2
+    engine.run(model, "hazard")
+    assert calls == [(a, 1)]
+
+    # the waiting time is kept while the probability doesn't change
+    probs[b] = 0.001
+    engine.update(model, b)
+    draw = engine.draws["hazard"][b]
+    assert draw[1] > 2
+    engine.update(model, b)
+    assert engine.draws["hazard"][b] is draw
+
+    engine.remove_agent(b)
+    assert engine.draws["hazard"] == {}
+
+
+@pytest.mark.unit
+def test_hazard_engine_start_time(make_model, make_agent):
+    model = make_model()
+    engine = HazardEngine()
+    agent = make_agent()
+    engine.add_hazard(
+        "hazard",
+        lambda model, agent: 1.0,
+        lambda model, agent: None,
+        lambda model, agent: 10,
+    )
+
+    model.time = 0
+    engine.update(model, agent)
+    assert engine.draws["hazard"][agent] == (1.0, 10)
+
+
+class FakeAgent:
+    def __init__(self, id: int):
+        self.id = id
+
+
+@pytest.mark.unit
+def test_hazard_engine_distribution():
+    # the time to a hazard occuring is distributed the same as with per step
+    # draws, including when the probability changes (e.g. timeline scaling)
+    num_agents = 20000
+    num_steps = 60
+    probs = [0.02] * 20 + [0.05] * (num_steps - 20)
+    agents = [FakeAgent(i) for i in range(num_agents)]
+    model = SimpleNamespace(
+        time=-1,
+        np_random=np.random.default_rng(1234),
+        pop=SimpleNamespace(all_agents=set(agents)),
+    )
+    engine = HazardEngine()
+
+    times = np.full(num_agents, num_steps)
+    engine.add_hazard(
+        "hazard",
+        lambda model, agent: probs[max(model.time, 0)],
+        lambda model, agent: times.__setitem__(
+            agent.id, min(times[agent.id], model.time)
+        ),
+    )
+    for agent in agents:
+        engine.update(model, agent)
+
+    for time in range(num_steps):
+        model.time = time
+        if time == 20:
+            for agent in agents:
+                engine.update(model, agent, time)
+        engine.run(model, "hazard")
+
+    expected = 1.0 - np.cumprod([1.0 - p for p in probs])
+    cdf = np.array([np.mean(times <= t) for t in range(num_steps)])
+
+    assert np.max(np.abs(cdf - expected)) < 0.015
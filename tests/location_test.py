@@ -29,6 +29,21 @@ def test_location_init(params):
     assert len(world.edges) == 0
 
 
+@pytest.mark.unit
+def test_location_params_shared(params):
+    world = Location("world", params.classes.locations.world, params)
+
+    # only the overridden path is copied
+    assert world.params is not params
+    assert world.params.demographics is not params.demographics
+    assert world.params.demographics.black is params.demographics.black
+    assert world.params.prep is params.prep
+
+    # changes to the shared tree are seen by the location
+    params.prep.cap = 0.123
+    assert world.params.prep.cap == 0.123
+
+
 @pytest.mark.unit
 def test_location_init_error(params):
     location = "world"
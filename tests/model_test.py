@@ -3,10 +3,14 @@ import pytest
 from copy import copy, deepcopy
 import os
 import math
+import csv
+import subprocess
+import sys
 
 from titan.model import *
-from titan.agent import Relationship
+from titan.agent import Agent, Relationship
 from titan.features import HighRisk
+from titan.exposures import HIV
 
 from conftest import FakeRandom
 
@@ -29,6 +33,19 @@ def test_model_init(params):
     assert model.pop.pop_seed > 0
 
 
+@pytest.mark.unit
+def test_model_location_feature_override(params):
+    params.location.scaling.world["features|high_risk"] = ObjMap(
+        {"field": "override", "override": False}
+    )
+    model = TITAN(params)
+
+    assert all(agent.high_risk.agent is agent for agent in model.pop.all_agents)
+    model.time = 1
+    model.update_all_agents()
+    assert not any(agent.high_risk.active for agent in model.pop.all_agents)
+
+
 @pytest.mark.unit
 def test_update_all_agents(make_model, make_agent):
     # make agent 0
@@ -183,3 +200,459 @@ def test_timeline_scaling_prep_def(make_model):
     model.timeline_scaling()
 
     assert math.isclose(original_prep_target, model.params.prep.cap, abs_tol=0.001)
+
+
+@pytest.mark.unit
+def test_timeline_scaling_location_params(make_model):
+    model = make_model()
+    scalar = 0.5
+    model.params.timeline_scaling.timeline = ObjMap(
+        {
+            "scale": {
+                "parameter": "prep|cap",
+                "start_time": 1,
+                "stop_time": 3,
+                "scalar": scalar,
+            }
+        }
+    )
+    original_prep_target = model.params.prep.cap
+    location = model.pop.geography.locations["world"]
+
+    # prep params are shared between the model and location, only scale once
+    model.time = 1
+    model.timeline_scaling()
+
+    assert math.isclose(
+        original_prep_target * scalar, model.params.prep.cap, abs_tol=0.001
+    )
+    assert math.isclose(
+        original_prep_target * scalar, location.params.prep.cap, abs_tol=0.001
+    )
+
+
+@pytest.mark.unit
+def test_networkx_not_imported_eagerly():
+    # networkx is only needed if the network is enabled
+    code = "import sys, titan, titan.model; assert 'networkx' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.unit
+def test_counts_match_population(make_model, tmpdir):
+    model = make_model()
+    for t in range(1, 6):
+        model.time = t
+        model.step(tmpdir)
+        model.reset_trackers()
+
+    agents = model.pop.all_agents
+    for race in model.params.classes.races:
+        race_agents = [a for a in agents if a.race == race]
+        assert model.pop.counts["race"][race] == len(race_agents)
+        assert exposures.HIV.counts[race] == sum(1 for a in race_agents if a.hiv.active)
+        assert features.Prep.counts[race] == sum(
+            1 for a in race_agents if a.prep.active
+        )
+        assert features.Incar.counts[race] == sum(
+            1 for a in race_agents if a.incar.active
+        )
+        assert features.HighRisk.counts[race] == sum(
+            1 for a in race_agents if a.high_risk.active
+        )
+
+        for sex_type in model.params.classes.sex_types:
+            assert features.HAART.counts[race][sex_type] == sum(
+                1 for a in race_agents if a.haart.active and a.sex_type == sex_type
+            )
+
+    for sex_type in model.params.classes.sex_types:
+        assert model.pop.counts["sex_type"][sex_type] == sum(
+            1 for a in agents if a.sex_type == sex_type
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("mode", ["exact", "sampled"])
+def test_network_stats_burn_in(params, tmpdir, mode):
+    params.outputs.network.calc_network_stats = True
+    params.outputs.network.stats.mode = mode
+    params.outputs.print_frequency = 1
+    params.model.time.burn_steps = 2
+    params.model.time.num_steps = 1
+    tmpdir.mkdir("network")
+    model = TITAN(params)
+    model.run(tmpdir)
+
+    # stats are written for burn in time steps too
+    assert os.path.isfile(
+        os.path.join(tmpdir, "network", f"{model.id}_NetworkStats_t-1.txt")
+    )
+
+
+@pytest.mark.unit
+def test_temporal_network_log(make_model, params, tmpdir):
+    params.outputs.network.temporal_log.enable = True
+    params.outputs.network.temporal_log.keyframe_frequency = 3
+    params.model.time.num_steps = 5
+    model = make_model(params)
+    tmpdir.mkdir("network")
+    model.run(tmpdir)
+    assert model.pop.network_log is None
+
+    path = os.path.join(tmpdir, "network", f"{model.id}_TemporalNetwork.bin")
+    rels = temporal_network.read_relationships(path, model.time)
+    assert rels == {
+        rel.id: (rel.agent1.id, rel.agent2.id, rel.bond_type)
+        for rel in model.pop.relationships
+    }
+
+
+@pytest.mark.unit
+def test_background_writer(params, run_model, tmpdir):
+    params.outputs.print_frequency = 1
+    params.outputs.network.calc_network_stats = True
+
+    reports = []
+    for run, enable in enumerate((False, True)):
+        params.outputs.background_writer.enable = enable
+        model, report = run_model()
+        assert model.report_writer.thread is None
+        reports.append(report)
+        reports.append(
+            sorted(os.listdir(os.path.join(tmpdir, f"run_{run}", "network")))
+        )
+
+    assert reports[0] == reports[2]
+    num_steps = params.model.time.num_steps + params.model.time.burn_steps
+    # a network stats file per time step and the component report
+    assert len(reports[1]) == len(reports[3]) == num_steps + 2
+
+
+@pytest.mark.unit
+def test_transmissible_only(params, run_model):
+    params.model.interactions.transmissible_only = True
+    interacted = []
+    num_rels = []
+
+    # record whether agents interact in relationships outside the index
+    def record_interactions(model):
+        agents_interact = model.agents_interact
+
+        def record(rel):
+            indexed = any(rel in rels for rels in model.pop.transmissible.values())
+            # or both agents converted earlier in the time step
+            concordant = rel.agent1.hiv.active and rel.agent2.hiv.active
+            interacted.append(indexed or concordant)
+            agents_interact(rel)
+
+        model.agents_interact = record
+
+        update_all_agents = model.update_all_agents
+
+        def count_relationships():
+            num_rels.append(len(model.pop.relationships))
+            update_all_agents()
+
+        model.update_all_agents = count_relationships
+
+    model, report = run_model(before_run=record_interactions)
+    assert all(interacted)
+    assert 0 < len(interacted) < sum(num_rels)
+    for rel in model.pop.relationships:
+        assert (rel in model.pop.transmissible["hiv"]) == HIV.is_transmissible(rel)
+
+    # interactions draw from their own streams, so the run is reproducible
+    _, same_report = run_model()
+    assert same_report == report
+
+
+@pytest.mark.unit
+def test_transmissible_only_converts(params, make_agent):
+    params.model.interactions.transmissible_only = True
+    model = TITAN(params)
+    pop = model.pop
+
+    a, b, c, d = [make_agent() for _ in range(4)]
+    for agent in (a, b, c, d):
+        pop.add_agent(agent)
+    a.hiv.active = True
+    rel_db = Relationship(d, b, 10, bond_type="Sex")
+    rel_ab = Relationship(a, b, 10, bond_type="Sex")
+    rel_bc = Relationship(b, c, 10, bond_type="Sex")
+    for rel in (rel_db, rel_ab, rel_bc):
+        pop.add_relationship(rel)
+    hiv = pop.transmissible["hiv"]
+    assert rel_ab in hiv
+    assert rel_db not in hiv and rel_bc not in hiv
+
+    interacted = []
+
+    def agents_interact(rel):
+        interacted.append(rel)
+        if rel is rel_ab:
+            b.hiv.convert(model)
+
+    model.agents_interact = agents_interact
+    model.interact_in_order([rel_ab])
+
+    # the relationship which became transmissible later in the order interacts too
+    assert interacted == [rel_ab, rel_bc]
+    assert rel_db in hiv
+    assert pop.transmissible_added is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("streams", [False, True])
+def test_random_streams(params, run_model, streams):
+    params.model.seed.streams = streams
+    model, report = run_model()
+    assert (("partnering",) in model.streams.streams) == streams
+
+    # with streams every subsystem draws from its own stream, so draws from the
+    # model's generators don't change the results
+    def draw(model):
+        model.run_random.random()
+        model.np_random.random()
+        model.pop.pop_random.random()
+        model.pop.np_random.random()
+
+    _, drawn_report = run_model(before_run=draw)
+    assert (drawn_report == report) == streams
+
+
+@pytest.mark.unit
+def test_location_partitions(params, run_model):
+    # the exchange processes the population by location, without edges no
+    # relationships are formed through it
+    params.location.exchange.enable = True
+    params.classes.locations = ObjMap({"north": {"ppl": 0.5}, "south": {"ppl": 0.5}})
+    params.location.scaling = ObjMap({"north": {}, "south": {}})
+    num_partitions = []
+
+    def count_partitions(model):
+        assert model.location_order == ["north", "south"]
+        get_partitions = model.get_partitions
+
+        def count():
+            num_partitions.append(model.time)
+            return get_partitions()
+
+        model.get_partitions = count
+
+    model, report = run_model(before_run=count_partitions)
+    # agents are partitioned once per time step
+    assert num_partitions and len(num_partitions) == len(set(num_partitions))
+    assert ("update_agent", "hiv", "south") in model.streams.streams
+
+    # results don't depend on the order locations are processed in
+    def reverse(model):
+        model.location_order.reverse()
+
+    _, reversed_report = run_model(before_run=reverse)
+    assert reversed_report == report
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prob", [0.0, 0.5])
+def test_location_exchange(params, run_model, prob):
+    params.classes.locations = ObjMap({"north": {"ppl": 0.5}, "south": {"ppl": 0.5}})
+    params.location.scaling = ObjMap({"north": {}, "south": {}})
+    params.location.edges = ObjMap(
+        {"north_south": {"location_1": "north", "location_2": "south", "distance": 1}}
+    )
+    params.location.exchange.enable = True
+    params.location.exchange.prob = prob
+    num_rels = []
+
+    def count_relationships(model):
+        num_rels.append(Relationship.next_rel_id)
+
+    model, report = run_model(before_run=count_relationships)
+    assert model.exchange.requests == model.exchange.responses == []
+    # relationships between locations are only formed through the exchange
+    assert any(
+        rel.agent1.location != rel.agent2.location
+        for rel in model.pop.relationships
+        if rel.id >= num_rels[0]
+    ) == (prob > 0)
+
+    # results don't depend on the order locations are processed in
+    def reverse(model):
+        model.location_order.reverse()
+
+    _, reversed_report = run_model(before_run=reverse)
+    assert reversed_report == report
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("expiry", ["table", "wheel"])
+def test_relationship_expiry(params, run_model, expiry):
+    ended = {}
+
+    # record the relationships which end each time step
+    def record_ended(model):
+        ended[model.params.model.relationship_expiry] = record = []
+        remove_relationship = model.pop.remove_relationship
+
+        def remove(rel):
+            record.append((model.time, rel.id))
+            remove_relationship(rel)
+
+        model.pop.remove_relationship = remove
+
+    params.model.relationship_expiry = "scan"
+    _, scan_report = run_model(before_run=record_ended)
+    params.model.relationship_expiry = expiry
+    model, report = run_model(before_run=record_ended)
+
+    rels = model.pop.rel_table if expiry == "table" else model.pop.rel_wheel
+    assert len(rels) == len(model.pop.relationships)
+    # the same relationships end as when scanning (later time steps differ as
+    # relationships are ended in a different order)
+    first_time = ended["scan"][0][0]
+    first_ended = {rel for time, rel in ended["scan"] if time == first_time}
+    assert first_ended
+    assert {rel for time, rel in ended[expiry] if time == first_time} == first_ended
+
+
+@pytest.mark.unit
+def test_feature_events(params, make_agent, run_model):
+    params.demographics.black.sex_type.MSM.vaccine.booster.interval = 3
+    params.demographics.black.sex_type.MSM.vaccine.booster.prob = 1.0
+
+    # the time steps an agent is released and boosted at, with and without events
+    def release_and_boost(feature_events):
+        params.model.feature_events = feature_events
+        model = TITAN(params)
+        model.run_random = FakeRandom(0.5)
+        model.time = 0
+        incarcerated = make_agent()
+        vaccinated = make_agent()
+        for agent in (incarcerated, vaccinated):
+            model.pop.add_agent(agent)
+
+        incarcerated.incar.active = True
+        incarcerated.incar.release_time = 4
+        incarcerated.incar.schedule_events(model.pop.events)
+        vaccinated.vaccine.vaccinate(0)
+        vaccinated.vaccine.schedule_events(model.pop.events)
+
+        released = []
+        boosted = []
+        for time in range(1, 10):
+            model.time = time
+            incarcerated.incar.update_agent(model)
+            vaccinated.vaccine.update_agent(model)
+            if model.pop.events is not None:
+                model.pop.events.run(model)
+            if not incarcerated.incar.active and not released:
+                released.append(time)
+            if vaccinated.vaccine.time == time:
+                boosted.append(time)
+
+        return released, boosted
+
+    assert release_and_boost(True) == release_and_boost(False) == ([4], [3, 6, 9])
+
+    # only future events are left after a run
+    params.model.feature_events = True
+    model, _ = run_model()
+    assert all(time > model.time for time in model.pop.events.buckets)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("time_to_event", [False, True])
+def test_time_to_event(params, run_model, monkeypatch, time_to_event):
+    params.model.time_to_event = time_to_event
+    params.calibration.mortality = 10
+
+    # count the mortality probabilities evaluated and the deaths when agents
+    # die and are replaced
+    calls = []
+    deaths = []
+    dying = [False]
+    get_mortality_prob = TITAN.get_mortality_prob
+    die = TITAN.die
+    die_and_replace = TITAN.die_and_replace
+
+    def count_mortality_prob(self, agent):
+        if dying[0]:
+            calls.append(agent)
+        return get_mortality_prob(self, agent)
+
+    def count_deaths(self, agent):
+        deaths.append(agent)
+        die(self, agent)
+
+    def count_die_and_replace(self):
+        dying[0] = True
+        die_and_replace(self)
+        dying[0] = False
+
+    monkeypatch.setattr(TITAN, "get_mortality_prob", count_mortality_prob)
+    monkeypatch.setattr(TITAN, "die", count_deaths)
+    monkeypatch.setattr(TITAN, "die_and_replace", count_die_and_replace)
+    model, report = run_model()
+    assert deaths
+
+    if time_to_event:
+        # only the agents who died (to draw their next death, which is dropped)
+        # and their replacements are evaluated, and only future occurrences of
+        # agents in the population are left
+        assert len(calls) == 2 * len(deaths)
+        draws = model.hazards.draws["mortality"]
+        assert set(draws) <= set(model.pop.all_agents)
+        assert all(time > model.time for _, time in draws.values())
+        assert run_model()[1] == report
+    else:
+        # every agent not incarcerated is evaluated each time step
+        assert model.hazards is None
+        assert len(calls) >= 5 * params.model.num_pop / 2
+
+
+@pytest.mark.unit
+def test_timing(make_model, params, tmpdir):
+    params.outputs.timing = True
+    params.model.time.num_steps = 2
+    model = make_model(params)
+    tmpdir.mkdir("network")
+    model.run(tmpdir)
+
+    with open(os.path.join(tmpdir, "timingReport.txt"), newline="") as f:
+        rows = {row["phase"]: row for row in csv.DictReader(f, delimiter="\t")}
+
+    num_steps = params.model.time.num_steps + params.model.time.burn_steps
+    assert rows["update_all_agents"]["calls"] == str(num_steps)
+    assert rows["update_pop.prep"]["calls"] == str(num_steps)
+    assert "interact.sex" in rows
+    assert "update_agent.hiv" in rows
+    assert all(row["run_id"] == model.id for row in rows.values())
+
+
+@pytest.mark.unit
+def test_memory_report(make_model, params, tmpdir):
+    params.outputs.memory.enable = True
+    params.outputs.memory.frequency = 2
+    params.outputs.memory.num_sites = 5
+    params.model.time.num_steps = 4
+    model = make_model(params)
+    tmpdir.mkdir("network")
+    model.run(tmpdir)
+
+    with open(os.path.join(tmpdir, "memoryReport.txt"), newline="") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+
+    times = sorted({int(row["t"]) for row in rows})
+    burn = params.model.time.burn_steps
+    assert times == [t for t in range(-burn, 5) if t % 2 == 0]
+
+    last = {row["name"]: row for row in rows if row["t"] == "4"}
+    assert int(last["current"]["bytes"]) > 0
+    assert last["Agent"]["count"] == str(model.pop.all_agents.num_members())
+    assert int(last["Agent"]["bytes"]) > 0
+    assert last["Relationship"]["count"] == str(len(model.pop.relationships))
+    assert "HIV" in last and "Prep" in last
+    assert "Population.graph" in last
+    assert int(last["stats"]["bytes"]) > 0
+    assert len([row for row in rows if row["t"] == "4" and row["kind"] == "site"]) == 5
@@ -5,6 +5,7 @@ import os
 import shutil
 import networkx as nx
 import nanoid
+import numpy as np
 
 from titan.output import *
 from titan import agent, features, exposures
@@ -12,6 +13,7 @@ from titan import agent, features, exposures
 
 @pytest.fixture
 def stats(params, world_location):
+    params.features.random_trial = True
     cur_time = 3
     a = agent.Agent("MSM", 20, "black", "Inj", world_location)
     a.hiv.active = True
@@ -105,9 +107,8 @@ def test_print_components(stats, params, make_population, tmpdir):
     run_id = nanoid.generate(size=8)
 
     pop = make_population(n=1)
-    components = pop.connected_components()
 
-    print_components(run_id, 0, 1, 2, components, tmpdir)
+    print_components(run_id, 0, 1, 2, pop.get_centrality(), tmpdir)
 
     result_file = os.path.join(tmpdir, f"{run_id}_componentReport_ALL.txt")
     assert os.path.isfile(result_file)
@@ -156,3 +157,30 @@ def test_write_network_stats(setup_results_dir, make_population):
 
     # make sure we tested something was tested
     assert asserted
+
+
+@pytest.mark.unit
+def test_write_network_stats_sampled(setup_results_dir, make_population):
+    id = "test"
+    t = 0
+    path = "results/network"
+    pop = make_population(n=100)
+
+    write_network_stats(
+        pop.graph,
+        path,
+        id,
+        t,
+        centrality=pop.get_centrality(),
+        mode="sampled",
+        num_samples=100,
+        rand_gen=np.random.default_rng(0),
+    )
+
+    file_path = os.path.join(path, f"{id}_NetworkStats_t{t}.txt")
+    with open(file_path, "r") as f:
+        lines = f.read()
+
+    assert "Number of nodes: 100" in lines
+    assert "Average node clustering:" in lines
+    assert "Average node clustering error bound (95%, 100 sampled wedges):" in lines
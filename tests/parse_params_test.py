@@ -39,3 +39,58 @@ def test_create_params_error(tmpdir):
         "[.demographics.black.sex_type.MSM.drug_type.Inj.num_partners.Sex.dist_type]"
         in str(excinfo.value)
     )
+
+
+@pytest.mark.unit
+def test_create_params_cache(tmpdir):
+    param_file = tmpdir.join("params.yml")
+    with open("tests/params/setting_params.yml") as f:
+        param_file.write(f.read())
+
+    cache_dir = os.path.join(tmpdir, "cache")
+    out_a = tmpdir.mkdir("a")
+    params_a = pp.create_params(setting, str(param_file), out_a, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # same files, re-use cached params
+    out_b = tmpdir.mkdir("b")
+    params_b = pp.create_params(setting, str(param_file), out_b, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    assert params_a == params_b
+    assert os.path.isfile(os.path.join(out_b, "params.yml"))
+
+    # changed file contents, new cache entry
+    param_file.write("\nmodel:\n  num_pop: 42\n", mode="a")
+    out_c = tmpdir.mkdir("c")
+    params_c = pp.create_params(setting, str(param_file), out_c, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+    assert params_c.model.num_pop == 42
+
+
+@pytest.mark.unit
+def test_get_params_hash_sorted(tmpdir, monkeypatch):
+    for name in ["a.yml", "b.yml", "c.yml"]:
+        tmpdir.join(name).write(f"{name}: 1\n")
+
+    params_hash = pp.get_params_hash([str(tmpdir)], False)
+
+    # doesn't depend on the order the file system lists files in
+    listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: list(reversed(listdir(path))))
+    assert pp.get_params_hash([str(tmpdir)], False) == params_hash
+
+
+@pytest.mark.unit
+def test_create_params_cache_error(tmpdir, monkeypatch):
+    def fail_dump(*args):
+        raise RuntimeError("can't pickle")
+
+    monkeypatch.setattr(pp.pickle, "dump", fail_dump)
+    cache_dir = os.path.join(tmpdir, "cache")
+    with pytest.raises(RuntimeError):
+        pp.create_params(
+            setting, "tests/params/setting_params.yml", tmpdir, cache_dir=cache_dir
+        )
+
+    # no temporary file left behind
+    assert os.listdir(cache_dir) == []
@@ -13,6 +13,7 @@ from titan.population_io import (
 )
 from titan.features import Prep, BaseFeature
 from titan.exposures import BaseExposure
+from titan import utils
 
 
 @pytest.mark.unit
@@ -35,7 +36,7 @@ def test_write_pop(tmpdir, make_population):
             res.append(row)
 
     for row, a in zip(res, pop.all_agents):
-        for attr in a.__dict__.keys():
+        for attr in utils.get_attrs(a):
             if any(
                 attr in exclude_set
                 for exclude_set in (
@@ -56,7 +57,7 @@ def test_write_pop(tmpdir, make_population):
             res.append(row)
 
     for row, r in zip(res, pop.relationships):
-        for attr in r.__dict__.keys():
+        for attr in utils.get_attrs(r):
             assert repr(getattr(r, attr)) == row[attr]
 
 
@@ -77,7 +78,7 @@ def test_read_pop(tmpdir, make_population, params):
     agent = next(iter(pop.all_agents))
     new_agent = find_agent(new_pop, str(agent.id))
 
-    attrs = agent.__dict__.keys()
+    attrs = utils.get_attrs(agent)
 
     for attr in attrs:
         if attr == "component":
@@ -86,11 +87,11 @@ def test_read_pop(tmpdir, make_population, params):
         orig_attr = getattr(agent, attr)
         new_attr = getattr(new_agent, attr)
         if isinstance(orig_attr, BaseFeature):
-            feat_attrs = orig_attr.__dict__.keys()
+            feat_attrs = utils.get_attrs(orig_attr)
             for feat_attr in feat_attrs:
                 assert getattr(orig_attr, feat_attr) == getattr(new_attr, feat_attr)
         elif isinstance(orig_attr, BaseExposure):
-            expose_attrs = orig_attr.__dict__.keys()
+            expose_attrs = utils.get_attrs(orig_attr)
             for expose_attr in expose_attrs:
                 assert getattr(orig_attr, expose_attr) == getattr(new_attr, expose_attr)
         else:
@@ -115,18 +116,66 @@ def test_write_read_pop_compressed(tmpdir, make_population, params):
     agent = next(iter(pop.all_agents))
     new_agent = find_agent(new_pop, str(agent.id))
 
-    attrs = agent.__dict__.keys()
+    attrs = utils.get_attrs(agent)
 
     for attr in attrs:
         orig_attr = getattr(agent, attr)
         new_attr = getattr(new_agent, attr)
         if isinstance(orig_attr, BaseFeature):
-            feat_attrs = orig_attr.__dict__.keys()
+            feat_attrs = utils.get_attrs(orig_attr)
             for feat_attr in feat_attrs:
                 assert getattr(orig_attr, feat_attr) == getattr(new_attr, feat_attr)
         elif isinstance(orig_attr, BaseExposure):
-            expose_attrs = orig_attr.__dict__.keys()
+            expose_attrs = utils.get_attrs(orig_attr)
             for expose_attr in expose_attrs:
                 assert getattr(orig_attr, expose_attr) == getattr(new_attr, expose_attr)
         else:
             assert orig_attr == new_attr
+
+
+@pytest.mark.unit
+def test_write_read_pop_table(tmpdir, make_population, params):
+    params.model.relationship_expiry = "table"
+    pop = make_population(n=10)
+
+    write(pop, tmpdir, compress=False)
+    new_pop = read(params, tmpdir)
+
+    assert len(new_pop.rel_table) == len(pop.relationships)
+    durations = {rel.id: rel.duration for rel in pop.relationships}
+    for rel in new_pop.relationships:
+        assert rel.duration == durations[rel.id]
+        assert new_pop.rel_table.rels[rel.slot] is rel
+
+
+@pytest.mark.unit
+def test_write_read_pop_wheel(tmpdir, make_population, params):
+    params.model.relationship_expiry = "wheel"
+    pop = make_population(n=10)
+
+    write(pop, tmpdir, compress=False)
+    new_pop = read(params, tmpdir)
+
+    assert len(new_pop.rel_wheel) == len(pop.relationships)
+    durations = {rel.id: rel.duration for rel in pop.relationships}
+    for rel in new_pop.relationships:
+        assert rel.duration == durations[rel.id]
+        assert rel.end == durations[rel.id]
+
+
+@pytest.mark.unit
+def test_write_read_pop_events(tmpdir, make_population, params):
+    params.model.feature_events = True
+    params.demographics.black.sex_type.MSM.incar.init = 0.5
+    pop = make_population(n=100)
+    assert len(pop.events) > 0
+
+    write(pop, tmpdir, compress=False)
+    new_pop = read(params, tmpdir)
+
+    assert sorted(new_pop.events.buckets) == sorted(pop.events.buckets)
+    for time, bucket in pop.events.buckets.items():
+        new_bucket = new_pop.events.buckets[time]
+        assert sorted(agent.id for agent, _ in new_bucket) == sorted(
+            agent.id for agent, _ in bucket
+        )
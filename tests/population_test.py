@@ -95,15 +95,25 @@ def test_add_remove_agent_to_pop(make_population):
     agent.hiv.dx = True
     agent.hiv.add_agent(agent)
 
+    num_white = pop.counts["race"]["white"]
+    num_hm = pop.counts["sex_type"]["HM"]
+    num_world = pop.counts["location"]["world"]
+
     pop.add_agent(agent)
 
     assert agent in pop.all_agents.members
+    assert pop.counts["race"]["white"] == num_white + 1
+    assert pop.counts["sex_type"]["HM"] == num_hm + 1
+    assert pop.counts["location"]["world"] == num_world + 1
 
     assert pop.graph.has_node(agent)
 
     pop.remove_agent(agent)
 
     assert agent not in pop.all_agents.members
+    assert pop.counts["race"]["white"] == num_white
+    assert pop.counts["sex_type"]["HM"] == num_hm
+    assert pop.counts["location"]["world"] == num_world
 
     assert not pop.graph.has_node(agent)
 
@@ -513,3 +523,52 @@ def test_trim_components(make_population):
     assert len(pop.components) > orig_num_components
     assert len(pop.components) != n
     assert max(map(len, pop.components)) == 2
+
+
+@pytest.mark.unit
+def test_get_centrality(make_population):
+    pop = make_population(n=100)
+    centrality = pop.get_centrality()
+    assert pop.get_centrality() is centrality
+    assert centrality.num_nodes == pop.all_agents.num_members()
+
+    rel = next(iter(pop.relationships))
+    rel.progress(force=True)
+    pop.remove_relationship(rel)
+    new_centrality = pop.get_centrality()
+    assert new_centrality is not centrality
+    assert new_centrality.version == pop.graph_version
+    assert (
+        new_centrality.degree.sum()
+        == centrality.degree.sum() - 2
+        == 2 * len(pop.relationships)
+    )
+
+
+@pytest.mark.unit
+def test_index_transmissible(params):
+    params.model.num_pop = 100
+    params.model.interactions.transmissible_only = True
+    pop = Population(params)
+    hiv = pop.transmissible["hiv"]
+    assert hiv == {
+        rel
+        for rel in pop.relationships
+        if rel.agent1.hiv.active != rel.agent2.hiv.active
+    }
+
+    # convert the negative agent in a discordant relationship
+    rel = next(iter(hiv))
+    agent = rel.agent2 if rel.agent1.hiv.active else rel.agent1
+    agent.hiv.active = True
+    pop.update_transmissible(agent)
+    assert rel not in hiv
+
+    agent.hiv.active = False
+    pop.update_transmissible(agent)
+    assert rel in hiv
+
+    rel.progress(force=True)
+    pop.remove_relationship(rel)
+    assert rel not in hiv
+    assert rel not in pop.get_transmissible_relationships()
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from titan.profiler import StackSampler, merge_collapsed, read_collapsed
+
+
+def busy():
+    total = 0
+    for i in range(2_000_000):
+        total += i % 7
+    return total
+
+
+@pytest.mark.unit
+def test_stack_sampler(tmpdir):
+    sampler = StackSampler(0.001)
+    sampler.start()
+    busy()
+    sampler.stop()
+    assert not sampler.running
+
+    stacks = sampler.collapsed()
+    assert sum(stacks.values()) > 0
+    assert any("busy (" in stack.split(";")[-1] for stack in stacks)
+    assert all(";" in stack for stack in stacks)
+
+    path_a = os.path.join(tmpdir, "a.folded")
+    sampler.write(path_a)
+    assert read_collapsed(path_a) == stacks
+
+    path_b = os.path.join(tmpdir, "b.folded")
+    with open(path_b, "w") as f:
+        f.write("main;other 3\n")
+
+    merged_path = os.path.join(tmpdir, "merged.folded")
+    merge_collapsed([path_a, path_b, path_a], merged_path)
+    merged = read_collapsed(merged_path)
+    assert merged["main;other"] == 3
+    for stack, count in stacks.items():
+        assert merged[stack] == 2 * count
+
+
+@pytest.mark.unit
+def test_stack_sampler_unsupported(monkeypatch):
+    monkeypatch.delattr("signal.setitimer")
+    sampler = StackSampler()
+    with pytest.raises(RuntimeError):
+        sampler.start()
+    assert not sampler.running
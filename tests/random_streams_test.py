@@ -0,0 +1,23 @@
+import pytest
+
+from titan.random_streams import RandomStreams
+
+
+@pytest.mark.unit
+def test_random_streams():
+    streams = RandomStreams(1234)
+    mortality = streams.get("mortality", "world")
+    assert streams.get("mortality", "world") is mortality
+    draws = [mortality.random.random() for _ in range(3)]
+    batch = mortality.uniform(5)
+    assert batch.shape == (5,)
+
+    # streams depend only on the seed and key, not the order they are created in
+    other = RandomStreams(1234)
+    other.get("partnering")
+    other_mortality = other.get("mortality", "world")
+    assert [other_mortality.random.random() for _ in range(3)] == draws
+    assert (other_mortality.uniform(5) == batch).all()
+
+    assert streams.get("mortality").random.random() not in draws
+    assert RandomStreams(5678).get("mortality", "world").random.random() not in draws
@@ -0,0 +1,142 @@
+import pytest
+
+from titan.agent import Relationship
+from titan.agent import RelationshipTable, TableRelationship
+from titan.agent import RelationshipWheel, WheelRelationship
+
+
+@pytest.mark.unit
+def test_relationship_table(make_agent):
+    table = RelationshipTable(["Sex", "Inj"], capacity=2)
+    agents = [make_agent() for _ in range(4)]
+    rels = [
+        TableRelationship(agents[0], agents[1], 0, "Sex"),
+        TableRelationship(agents[0], agents[2], 2, "Inj"),
+        TableRelationship(agents[1], agents[3], 1, "Sex"),
+    ]
+    for rel in rels:
+        table.add(rel)
+
+    # grew past the initial capacity
+    assert len(table) == 3
+    assert len(table.used) == 4
+    assert list(table.agent1[:3]) == [agents[0].id, agents[0].id, agents[1].id]
+    assert list(table.bond_type[:3]) == [0, 1, 0]
+
+    rels[1].duration = 3
+    assert table.duration[1] == 3
+    assert rels[1].total_duration == 2
+
+    assert table.progress() == [rels[0]]
+    assert rels[1].duration == 2
+    assert rels[2].duration == 0
+
+    # ending relationships are removed by the caller, their slots reused
+    rels[0].progress(force=True)
+    table.remove(rels[0])
+    assert rels[0].duration == 0
+    assert rels[0].slot == -1
+    assert len(table) == 2
+
+    new_rel = TableRelationship(agents[2], agents[3], 5, "Sex")
+    table.add(new_rel)
+    assert new_rel.slot == 0
+    # ids are shared with plain relationships
+    assert Relationship.next_rel_id == new_rel.id + 1
+
+    assert table.progress() == [rels[2]]
+    assert new_rel.duration == 4
+
+    with pytest.raises(AssertionError):
+        table.add(Relationship(agents[1], agents[2], 5, "Sex"))
+
+
+@pytest.mark.unit
+def test_relationship_table_population(make_population, params):
+    params.model.relationship_expiry = "table"
+    pop = make_population(n=100)
+
+    assert len(pop.rel_table) == len(pop.relationships)
+    for rel in pop.relationships:
+        assert isinstance(rel, TableRelationship)
+        assert pop.rel_table.rels[rel.slot] is rel
+
+    durations = {rel: rel.duration for rel in pop.relationships}
+    ending = pop.rel_table.progress()
+    assert set(ending) == {rel for rel, duration in durations.items() if duration <= 0}
+    for rel in ending:
+        rel.progress(force=True)
+        pop.remove_relationship(rel)
+
+    assert len(pop.rel_table) == len(pop.relationships)
+    for rel in pop.relationships:
+        assert rel.duration == durations[rel] - 1
+
+
+@pytest.mark.unit
+def test_relationship_wheel(make_agent):
+    wheel = RelationshipWheel()
+    agents = [make_agent() for _ in range(4)]
+    rels = [
+        WheelRelationship(agents[0], agents[1], 0, "Sex"),
+        WheelRelationship(agents[0], agents[2], 2, "Inj"),
+        WheelRelationship(agents[1], agents[3], 5, "Sex"),
+    ]
+    for rel in rels:
+        wheel.add(rel)
+
+    assert len(wheel) == 3
+    assert rels[2].end == 5
+    assert sorted(wheel.buckets) == [0, 2, 5]
+
+    assert wheel.progress() == [rels[0]]
+    assert rels[1].duration == 1
+    assert rels[2].duration == 4
+    assert rels[2].total_duration == 5
+
+    # ending relationships are removed by the caller
+    rels[0].progress(force=True)
+    wheel.remove(rels[0])
+    assert rels[0].duration == 0
+    assert rels[0].wheel is None
+    assert len(wheel) == 2
+
+    # forcing a relationship to end reschedules it
+    rels[2].duration = 0
+    assert wheel.progress() == [rels[2]]
+    assert rels[1].duration == 0
+
+    rels[2].progress(force=True)
+    wheel.remove(rels[2])
+    # the old entry for the rescheduled relationship is skipped
+    assert wheel.progress() == [rels[1]]
+    rels[1].progress(force=True)
+    wheel.remove(rels[1])
+    for _ in range(3):
+        assert wheel.progress() == []
+    assert wheel.buckets == {}
+
+    with pytest.raises(AssertionError):
+        wheel.add(Relationship(agents[1], agents[2], 5, "Sex"))
+
+
+@pytest.mark.unit
+def test_relationship_wheel_population(make_population, params):
+    params.model.relationship_expiry = "wheel"
+    pop = make_population(n=100)
+
+    assert len(pop.rel_wheel) == len(pop.relationships)
+    for rel in pop.relationships:
+        assert isinstance(rel, WheelRelationship)
+        assert rel in pop.rel_wheel.buckets[rel.end]
+
+    durations = {rel: rel.duration for rel in pop.relationships}
+    ending = pop.rel_wheel.progress()
+    assert set(ending) == {rel for rel, duration in durations.items() if duration <= 0}
+    for rel in ending:
+        rel.progress(force=True)
+        pop.remove_relationship(rel)
+
+    assert len(pop.rel_wheel) == len(pop.relationships)
+    for rel in pop.relationships:
+        assert rel.duration == durations[rel] - 1
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from titan.report_writer import ReportWriter
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("background", [False, True])
+def test_report_writer(background):
+    written = []
+    writer = ReportWriter(background, queue_size=2)
+    for i in range(10):
+        writer.submit(written.append, i)
+    writer.close()
+    assert written == list(range(10))
+
+    # after closing, reports are written immediately
+    writer.submit(written.append, 10)
+    assert written[-1] == 10
+
+
+@pytest.mark.unit
+def test_report_writer_backpressure():
+    release = threading.Event()
+    writer = ReportWriter(True, queue_size=1)
+    writer.submit(release.wait)  # blocks the writer thread
+    writer.submit(lambda: None)  # fills the queue
+
+    blocked = threading.Thread(target=writer.submit, args=(lambda: None,))
+    blocked.start()
+    blocked.join(timeout=0.1)
+    assert blocked.is_alive()  # waiting for room in the queue
+
+    release.set()
+    blocked.join()
+    writer.close()
+
+
+@pytest.mark.unit
+def test_report_writer_error():
+    def fail():
+        raise ValueError("bad report")
+
+    writer = ReportWriter(True)
+    writer.submit(fail)
+    with pytest.raises(ValueError, match="bad report"):
+        writer.close()
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from titan.agent import Relationship
+from titan.temporal_network import TemporalNetworkLog, read_relationships, read_graph
+
+
+def rel_tuples(pop):
+    return {
+        rel.id: (rel.agent1.id, rel.agent2.id, rel.bond_type)
+        for rel in pop.relationships
+    }
+
+
+@pytest.mark.unit
+def test_temporal_network_log(make_population, tmpdir):
+    pop = make_population(n=100)
+    path = os.path.join(tmpdir, "network.bin")
+    log = TemporalNetworkLog(path, pop.params.classes.bond_types.keys())
+    pop.network_log = log
+    log.write_keyframe(pop.relationships)
+    expected = {0: rel_tuples(pop)}
+
+    # end some relationships
+    log.time = 1
+    ended = list(pop.relationships)[:5]
+    for rel in ended:
+        rel.progress(force=True)
+        pop.remove_relationship(rel)
+    log.flush()
+    expected[1] = rel_tuples(pop)
+
+    # add a relationship back
+    log.time = 2
+    rel = ended[0]
+    pop.add_relationship(Relationship(rel.agent1, rel.agent2, 10, rel.bond_type))
+    log.write_keyframe(pop.relationships)
+    expected[2] = rel_tuples(pop)
+
+    log.time = 3
+    rel = next(iter(pop.relationships))
+    rel.progress(force=True)
+    pop.remove_relationship(rel)
+    log.close()
+    expected[3] = rel_tuples(pop)
+
+    for t, rels in expected.items():
+        assert read_relationships(path, t) == rels
+
+    graph = read_graph(path, 3)
+    assert graph.number_of_edges() == len(pop.relationships)
+    assert graph[rel.agent1.id].get(rel.agent2.id) is None
+
+    with pytest.raises(ValueError):
+        read_relationships(path, -1)
@@ -0,0 +1,35 @@
+import csv
+import os
+
+import pytest
+
+from titan.timing import PhaseTimer, write_timing_summary
+
+
+@pytest.mark.unit
+def test_phase_timer(tmpdir):
+    timer = PhaseTimer(False)
+    with timer.phase("a"):
+        pass
+    assert timer.seconds == {}
+
+    timer = PhaseTimer(True)
+    for _ in range(3):
+        with timer.phase("a"):
+            pass
+    timer.add("b", 2.0)
+    assert timer.calls == {"a": 3, "b": 1}
+    assert timer.seconds["b"] == 2.0
+
+    timer.write("run1", tmpdir)
+    timer.write("run2", tmpdir)
+    write_timing_summary(tmpdir)
+
+    with open(os.path.join(tmpdir, "timingSummary.txt"), newline="") as f:
+        rows = {row["phase"]: row for row in csv.DictReader(f, delimiter="\t")}
+
+    assert rows["b"]["runs"] == "2"
+    assert rows["b"]["calls"] == "2"
+    assert float(rows["b"]["seconds"]) == 4.0
+    assert float(rows["b"]["mean_seconds"]) == 2.0
+    assert rows["a"]["calls"] == "6"
@@ -1,6 +1,8 @@
 import pytest
 import os
 import random
+from copy import copy
+
 import numpy as np
 
 import titan.utils as utils
@@ -172,6 +174,32 @@ def test_override_param(params):
         utils.override_param(params, param_path_fake, 0)
 
 
+@pytest.mark.unit
+def test_copy_param_path(params):
+    new_params = copy(params)
+    owned = {id(new_params)}
+
+    param_path = "partnership|sex|frequency|Sex|bins|1|prob"
+    utils.copy_param_path(new_params, param_path, owned)
+
+    # containers along the path are copied, everything else is shared
+    assert new_params.partnership is not params.partnership
+    assert new_params.partnership.sex.frequency.Sex.bins[1] is not (
+        params.partnership.sex.frequency.Sex.bins[1]
+    )
+    assert new_params.partnership.injection is params.partnership.injection
+    assert new_params.demographics is params.demographics
+
+    utils.override_param(new_params, param_path, 0.0)
+    assert new_params.partnership.sex.frequency.Sex.bins[1].prob == 0.0
+    assert params.partnership.sex.frequency.Sex.bins[1].prob == 0.5
+
+    # copying an already owned path is a no-op
+    bins = new_params.partnership.sex.frequency.Sex.bins
+    utils.copy_param_path(new_params, param_path, owned)
+    assert new_params.partnership.sex.frequency.Sex.bins is bins
+
+
 @pytest.mark.unit
 def test_get_independent_bin(params):
     bin_def = params.partnership.sex.frequency.Sex.bins
@@ -192,3 +220,49 @@ def test_get_cumulative_bin(params):
 
     rand_gen = FakeRandom(1.1)
     assert utils.get_independent_bin(rand_gen, bin_def) == len(bin_def)
+
+
+@pytest.mark.unit
+def test_indexed_set():
+    rand_gen = random.Random(123)
+    s = utils.IndexedSet(range(5))
+    assert len(s) == 5
+    assert 3 in s
+
+    s.discard(3)
+    s.discard(3)
+    assert 3 not in s
+    assert sorted(s) == [0, 1, 2, 4]
+
+    item = s.pop_random(rand_gen)
+    assert item not in s
+    assert len(s) == 3
+
+    s.add(1)
+    assert len(s) == (3 if item != 1 else 4)
+
+    s.clear()
+    assert len(s) == 0
+
+
+@pytest.mark.unit
+def test_get_attrs(make_agent):
+    agent = make_agent()
+    assert utils.get_attrs(agent.hiv) == [
+        "active",
+        "agent",
+        "time",
+        "dx",
+        "dx_time",
+        "aids",
+    ]
+    assert utils.get_attrs(agent.syringe_services) == ["active", "agent"]
+
+    attrs = utils.get_attrs(agent)
+    assert attrs[:3] == ["id", "sex_type", "age"]
+    assert "hiv" in attrs and "prep" in attrs
+    assert "__dict__" not in attrs
+
+    # attributes not declared in slots are found in __dict__
+    agent.extra = 1
+    assert utils.get_attrs(agent)[-1] == "extra"
@@ -1,2 +1,10 @@
 # makes src a package
-from .run_titan import script_init
+
+
+def script_init():
+    """
+    Entry point for the `run_titan` script.  `run_titan` (and the model it pulls in) is only imported when the script is run so that `import titan` stays lightweight.
+    """
+    from .run_titan import script_init as run_script_init
+
+    run_script_init()
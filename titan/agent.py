@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # encoding: utf-8
 
-from typing import Dict, Set, Optional, Iterator, Iterable
+from typing import Dict, List, Set, Optional, Iterator, Iterable, Tuple
+
+import numpy as np  # type: ignore
 
 from .utils import (
     safe_divide,
@@ -23,6 +25,31 @@ class Agent:
     # class variable for agent creation
     next_agent_id = 0
 
+    # exposures and features are attributes named after the exposure/feature, an
+    # exposure or feature defined after this module is loaded is stored in __dict__
+    __slots__ = (
+        (
+            "id",
+            "sex_type",
+            "age",
+            "age_bin",
+            "race",
+            "drug_type",
+            "location",
+            "component",
+            "sex_role",
+            "relationships",
+            "partners",
+            "mean_num_partners",
+            "target_partners",
+            "risk_multipliers",
+            "risk_multipliers_time",
+        )
+        + tuple(exposure.name for exposure in exposures.BaseExposure.__subclasses__())
+        + tuple(feature.name for feature in features.BaseFeature.__subclasses__())
+        + ("__dict__",)
+    )
+
     @classmethod
     def update_id_counter(cls, last_id):
         cls.next_agent_id = last_id + 1
@@ -71,14 +98,23 @@ class Agent:
         self.mean_num_partners: Dict[str, int] = {}
         self.target_partners: Dict[str, int] = {}
 
-        # agent exposures params
-        # model features
+        # cache of combined feature risk multipliers, see get_risk_multiplier
+        self.risk_multipliers: Dict[Tuple[str, str, Optional[int]], float] = {}
+        self.risk_multipliers_time: Optional[int] = None
+
+        # agent exposures params, exposures which aren't enabled share an inactive instance
         for exposure in exposures.BaseExposure.__subclasses__():
-            setattr(self, exposure.name, exposure(self))
+            if location.exposures[exposure.name]:
+                setattr(self, exposure.name, exposure(self))
+            else:
+                setattr(self, exposure.name, exposure.get_inactive())
 
-        # model features
+        # model features, features which aren't enabled share an inactive instance
         for feature in features.BaseFeature.__subclasses__():
-            setattr(self, feature.name, feature(self))
+            if location.features[feature.name]:
+                setattr(self, feature.name, feature(self))
+            else:
+                setattr(self, feature.name, feature.get_inactive())
 
     def __str__(self) -> str:
         """
@@ -146,6 +182,55 @@ class Agent:
                 return True
         return False
 
+    def get_risk_multiplier(
+        self,
+        model_features: Iterable,
+        kind: str,
+        time: Optional[int],
+        interaction_type: str,
+        model_time: int,
+    ) -> float:
+        """
+        Get the product of the agent's transmission or acquisition risk multipliers across the model's features (e.g. haart, prep, vaccine).  The product is cached for the rest of the time step, or until `reset_risk_multipliers` is called when one of the features changes state.
+
+        args:
+            model_features: the features enabled in the model [model.features]
+            kind: `transmission` or `acquisition`
+            time: the time passed to the features' risk multiplier methods
+            interaction_type: The type of interaction where the agent could transmit/acquire HIV (e.g. 'sex', 'injection' - from [params.classes.interaction_types])
+            model_time: the current time step of the model
+
+        returns:
+            the combined risk multiplier
+        """
+        if self.risk_multipliers_time != model_time:
+            self.risk_multipliers.clear()
+            self.risk_multipliers_time = model_time
+
+        key = (kind, interaction_type, time)
+        multiplier = self.risk_multipliers.get(key)
+        if multiplier is None:
+            multiplier = 1.0
+            for feature in model_features:
+                agent_feature = getattr(self, feature.name)
+                if kind == "transmission":
+                    multiplier *= agent_feature.get_transmission_risk_multiplier(
+                        time, interaction_type
+                    )
+                else:
+                    multiplier *= agent_feature.get_acquisition_risk_multiplier(
+                        time, interaction_type
+                    )
+            self.risk_multipliers[key] = multiplier
+
+        return multiplier
+
+    def reset_risk_multipliers(self):
+        """
+        Clear the agent's cached risk multipliers (see `get_risk_multiplier`).  Must be called by features whenever a change to the agent's state changes its risk multipliers within a time step.
+        """
+        self.risk_multipliers.clear()
+
     def get_partners(self, bond_types: Optional[Iterable[str]] = None) -> Set["Agent"]:
         """
         Get all of an agents partners or those with specific bond types
@@ -184,6 +269,8 @@ class Relationship:
     # class variable for relationship creation
     next_rel_id = 0
 
+    __slots__ = ("agent1", "agent2", "id", "duration", "total_duration", "bond_type")
+
     @classmethod
     def update_id_counter(cls, last_id):
         cls.next_rel_id = last_id + 1
@@ -331,11 +418,286 @@ class Relationship:
         return str(self.id)
 
 
+# storage for a relationship's duration while it isn't in a table
+_rel_duration = Relationship.__dict__["duration"]
+_rel_total_duration = Relationship.__dict__["total_duration"]
+
+
+class RelationshipTable:
+    """
+    Array backed store of the population's relationships, used with `model.relationship_expiry` set to `table`.  Each relationship has a row (slot) in NumPy columns of the agents' ids, the bond type (as a code into `bond_types`), and the remaining and total duration, so the durations of all relationships can be counted down in one vectorized operation per time step (see `progress`).  Slots of removed relationships are reused through a free list.
+
+    The relationships themselves are `TableRelationship`s, whose `duration` and `total_duration` read from and write to the table while they are in it.
+    """
+
+    def __init__(self, bond_types: List[str], capacity: int = 1024):
+        """
+        args:
+            bond_types: the model's bond types [params.classes.bond_types]
+            capacity: the initial number of slots
+        """
+        self.bond_types = list(bond_types)
+        self.bond_codes: Dict[str, int] = {
+            bond_type: code for code, bond_type in enumerate(self.bond_types)
+        }
+
+        self.agent1 = np.zeros(capacity, dtype=np.int64)
+        self.agent2 = np.zeros(capacity, dtype=np.int64)
+        self.bond_type = np.zeros(capacity, dtype=np.int16)
+        self.duration = np.zeros(capacity, dtype=np.int64)
+        self.total_duration = np.zeros(capacity, dtype=np.int64)
+        self.used = np.zeros(capacity, dtype=bool)
+        self.rels: List[Optional["TableRelationship"]] = [None] * capacity
+
+        self.size = 0  # slots in use or on the free list
+        self.free: List[int] = []
+
+    def __len__(self) -> int:
+        return self.size - len(self.free)
+
+    def grow(self):
+        """
+        Double the number of slots in the table
+        """
+        capacity = 2 * len(self.used)
+        for column in (
+            "agent1",
+            "agent2",
+            "bond_type",
+            "duration",
+            "total_duration",
+            "used",
+        ):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, column, new)
+
+        self.rels.extend([None] * (capacity - len(self.rels)))
+
+    def add(self, rel: "TableRelationship"):
+        """
+        Add a relationship to the table, moving its duration and total duration into the table's columns
+
+        args:
+            rel: the relationship to add (created with `Population.create_relationship`)
+        """
+        assert isinstance(
+            rel, TableRelationship
+        ), "Relationships in a table must be created with Population.create_relationship"
+        assert rel.slot < 0, "Relationship is already in a table"
+
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == len(self.used):
+                self.grow()
+            slot = self.size
+            self.size += 1
+
+        self.agent1[slot] = rel.agent1.id
+        self.agent2[slot] = rel.agent2.id
+        self.bond_type[slot] = self.bond_codes[rel.bond_type]
+        self.duration[slot] = rel.duration
+        self.total_duration[slot] = rel.total_duration
+        self.used[slot] = True
+        self.rels[slot] = rel
+
+        rel.table = self
+        rel.slot = slot
+
+    def remove(self, rel: "TableRelationship"):
+        """
+        Remove a relationship from the table, moving its duration and total duration back to the relationship and freeing its slot for reuse
+
+        args:
+            rel: the relationship to remove
+        """
+        slot = rel.slot
+        assert rel.table is self and slot >= 0, "Relationship is not in this table"
+
+        _rel_duration.__set__(rel, int(self.duration[slot]))
+        _rel_total_duration.__set__(rel, int(self.total_duration[slot]))
+        rel.table = None
+        rel.slot = -1
+
+        self.used[slot] = False
+        self.rels[slot] = None
+        self.free.append(slot)
+
+    def progress(self) -> List["TableRelationship"]:
+        """
+        Progress all relationships to the next time step: decrement the remaining duration of relationships with duration left, and find the relationships which end (those with no remaining duration), as `Relationship.progress` does for one relationship.
+
+        The ending relationships are returned in slot order, and are still in the table, the caller should end them and remove them from the population.
+
+        returns:
+            the relationships which end this time step
+        """
+        used = self.used[: self.size]
+        duration = self.duration[: self.size]
+
+        ending = used & (duration <= 0)
+        np.subtract(duration, 1, out=duration, where=used & ~ending)
+
+        return [self.rels[slot] for slot in np.flatnonzero(ending)]  # type: ignore
+
+
+class TableRelationship(Relationship):
+    """
+    A relationship whose `duration` and `total_duration` are stored in a `RelationshipTable` while it is in one (see `Population.create_relationship`).  Otherwise it behaves the same as a `Relationship`.
+    """
+
+    __slots__ = ("table", "slot")
+
+    def __init__(self, *args, **kwargs):
+        self.table: Optional[RelationshipTable] = None
+        self.slot = -1
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def update_id_counter(cls, last_id):
+        # share the id counter with plain relationships
+        Relationship.update_id_counter(last_id)
+
+    @property  # type: ignore[override]
+    def duration(self) -> int:
+        if self.slot < 0:
+            return _rel_duration.__get__(self)
+        return int(self.table.duration[self.slot])  # type: ignore[union-attr]
+
+    @duration.setter
+    def duration(self, value: int):
+        if self.slot < 0:
+            _rel_duration.__set__(self, value)
+        else:
+            self.table.duration[self.slot] = value  # type: ignore[union-attr]
+
+    @property  # type: ignore[override]
+    def total_duration(self) -> int:
+        if self.slot < 0:
+            return _rel_total_duration.__get__(self)
+        return int(self.table.total_duration[self.slot])  # type: ignore[union-attr]
+
+    @total_duration.setter
+    def total_duration(self, value: int):
+        if self.slot < 0:
+            _rel_total_duration.__set__(self, value)
+        else:
+            self.table.total_duration[self.slot] = value  # type: ignore[union-attr]
+
+
+class RelationshipWheel:
+    """
+    Schedule of when the population's relationships end, used with `model.relationship_expiry` set to `wheel`.  Each relationship records the step of the wheel it ends at (`WheelRelationship.end`) and is put in that step's bucket, so each time step only the relationships in the bucket which comes due are touched (see `progress`), instead of counting down every relationship.
+
+    Changing a relationship's duration (e.g. high risk setting it to 0 to end it next step) reschedules it into another bucket, the entry in its old bucket is skipped when that bucket comes due.
+    """
+
+    def __init__(self):
+        self.step = 0  # number of times the wheel has progressed
+        self.buckets: Dict[int, List["WheelRelationship"]] = {}
+        self.num_rels = 0
+
+    def __len__(self) -> int:
+        return self.num_rels
+
+    def schedule(self, rel: "WheelRelationship"):
+        """
+        Put a relationship in the bucket of the step it ends at (or the next step to progress if that has passed)
+
+        args:
+            rel: the relationship to schedule
+        """
+        self.buckets.setdefault(max(rel.end, self.step), []).append(rel)
+
+    def add(self, rel: "WheelRelationship"):
+        """
+        Add a relationship to the wheel, scheduling it to end once its duration has counted down
+
+        args:
+            rel: the relationship to add (created with `Population.create_relationship`)
+        """
+        assert isinstance(
+            rel, WheelRelationship
+        ), "Relationships in a wheel must be created with Population.create_relationship"
+        assert rel.wheel is None, "Relationship is already in a wheel"
+
+        rel.end = self.step + _rel_duration.__get__(rel)
+        rel.wheel = self
+        self.schedule(rel)
+        self.num_rels += 1
+
+    def remove(self, rel: "WheelRelationship"):
+        """
+        Remove a relationship from the wheel, moving its remaining duration back to the relationship
+
+        args:
+            rel: the relationship to remove
+        """
+        assert rel.wheel is self, "Relationship is not in this wheel"
+
+        _rel_duration.__set__(rel, rel.duration)
+        rel.wheel = None
+        self.num_rels -= 1
+
+    def progress(self) -> List["WheelRelationship"]:
+        """
+        Progress all relationships to the next time step: find the relationships which end (those with no remaining duration), as `Relationship.progress` does for one relationship, and move the wheel on a step, which counts down the duration of all other relationships.
+
+        The ending relationships are returned in the order they were scheduled, and are still in the wheel, the caller should end them and remove them from the population.
+
+        returns:
+            the relationships which end this time step
+        """
+        due = self.buckets.pop(self.step, [])
+        # skip relationships removed or rescheduled since they were put in the bucket
+        ending = [rel for rel in due if rel.wheel is self and rel.end <= self.step]
+        self.step += 1
+
+        return list(dict.fromkeys(ending))
+
+
+class WheelRelationship(Relationship):
+    """
+    A relationship whose remaining duration is kept as the step of a `RelationshipWheel` it ends at while it is in one (see `Population.create_relationship`).  Otherwise it behaves the same as a `Relationship`.
+    """
+
+    __slots__ = ("wheel", "end")
+
+    def __init__(self, *args, **kwargs):
+        self.wheel: Optional[RelationshipWheel] = None
+        self.end = 0
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def update_id_counter(cls, last_id):
+        # share the id counter with plain relationships
+        Relationship.update_id_counter(last_id)
+
+    @property  # type: ignore[override]
+    def duration(self) -> int:
+        if self.wheel is None:
+            return _rel_duration.__get__(self)
+        # relationships due to end have no duration left until they are removed
+        return max(self.end - self.wheel.step, 0)
+
+    @duration.setter
+    def duration(self, value: int):
+        if self.wheel is None:
+            _rel_duration.__set__(self, value)
+        else:
+            self.end = self.wheel.step + value
+            self.wheel.schedule(self)
+
+
 class AgentSet:
     """
     Container for agents into heirarchical sets (e.g. all_agents > hiv_agents)
     """
 
+    __slots__ = ("id", "members", "subset", "parent_set")
+
     def __init__(
         self,
         id: str,
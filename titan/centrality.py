@@ -0,0 +1,445 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+from collections import deque
+import logging
+from typing import List, Dict, Optional
+
+import numpy as np  # type: ignore
+
+
+class Centrality:
+    """
+    Network measures (components, degree, closeness, eigenvector centrality, bridges) for a snapshot of the population's graph.  The graph is converted once to a compressed sparse row (CSR) adjacency, which all of the measures are then computed on with NumPy or simple iterative loops, for every component at once.
+
+    Measures are computed lazily and cached on the instance, use `Population.get_centrality` to get an instance which is shared until the graph changes.
+    """
+
+    def __init__(self, graph, version: int = 0):
+        """
+        Build the CSR adjacency for a graph
+
+        args:
+            graph: the networkx graph to compute measures on (e.g. `Population.graph`)
+            version: the version of the graph this snapshot represents (see `Population.graph_version`)
+        """
+        self.version = version
+        self.nodes: List = list(graph.nodes)
+        self.node_index: Dict = {node: i for i, node in enumerate(self.nodes)}
+        self.num_nodes = len(self.nodes)
+
+        adj = graph.adj
+        self.degree = np.fromiter(
+            (len(adj[node]) for node in self.nodes),
+            dtype=np.int64,
+            count=self.num_nodes,
+        )
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(self.degree, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (self.node_index[nbr] for node in self.nodes for nbr in adj[node]),
+            dtype=np.int64,
+            count=int(self.indptr[-1]),
+        )
+        # row of each entry in indices, used for sparse matrix-vector products
+        self.rows = np.repeat(np.arange(self.num_nodes), self.degree)
+
+        self.labels = np.full(self.num_nodes, -1, dtype=np.int64)
+        self.components: List[np.ndarray] = []
+        self.set_components()
+
+        self.eigenvector: Optional[np.ndarray] = None
+        self.bridge_edges: Optional[np.ndarray] = None
+        self.closeness: Dict[int, float] = {}
+        self.approximate: Optional[np.ndarray] = None
+        self.edge_keys: Optional[np.ndarray] = None
+        self.node_triangles: Optional[np.ndarray] = None
+
+    def set_components(self):
+        """
+        Find the connected components of the graph.  Components are ordered largest to smallest (ties in the order they are found), matching `utils.connected_components`, and `labels` holds the position of each node's component in that list.
+        """
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        found = []
+        labels = [-1] * self.num_nodes
+        for source in range(self.num_nodes):
+            if labels[source] != -1:
+                continue
+            label = len(found)
+            labels[source] = label
+            component = [source]
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                for nbr in indices[indptr[node] : indptr[node + 1]]:
+                    if labels[nbr] == -1:
+                        labels[nbr] = label
+                        component.append(nbr)
+                        queue.append(nbr)
+            found.append(component)
+
+        order = sorted(range(len(found)), key=lambda i: len(found[i]), reverse=True)
+        relabel = np.empty(len(found), dtype=np.int64)
+        relabel[order] = np.arange(len(found))
+        self.labels = relabel[np.array(labels, dtype=np.int64)]
+        self.components = [np.array(found[i], dtype=np.int64) for i in order]
+        self.component_sizes = np.array(
+            [len(comp) for comp in self.components], dtype=np.int64
+        )
+
+    def get_nodes(self, indices) -> List:
+        """
+        Get the nodes (agents) at the given indices
+
+        args:
+            indices: iterable of node indices
+
+        returns:
+            list of nodes
+        """
+        return [self.nodes[i] for i in indices]
+
+    def num_edges(self) -> int:
+        """
+        Number of edges in the graph
+
+        returns:
+            number of edges
+        """
+        return int(self.indptr[-1]) // 2
+
+    def degree_histogram(self) -> List[int]:
+        """
+        Number of nodes with each degree, as in `networkx.degree_histogram`
+
+        returns:
+            list of node counts indexed by degree
+        """
+        return np.bincount(self.degree).tolist()
+
+    def has_edges(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        Check whether there is an edge between each pair of nodes
+
+        args:
+            u: array of node indices
+            v: array of node indices, the same length as `u`
+
+        returns:
+            boolean array of whether each pair is connected
+        """
+        if self.edge_keys is None:
+            self.edge_keys = np.sort(self.rows * self.num_nodes + self.indices)
+        keys = u * self.num_nodes + v
+        if len(self.edge_keys) == 0:
+            return np.zeros(len(keys), dtype=bool)
+
+        pos = np.searchsorted(self.edge_keys, keys)
+        pos[pos == len(self.edge_keys)] = 0
+        return self.edge_keys[pos] == keys
+
+    def sample_clustering(self, num_samples: int, rand_gen, confidence: float = 0.95):
+        """
+        Estimate the average clustering coefficient of the graph by sampling wedges.  Each sample picks a node uniformly at random and, if the node has at least two neighbors, two of its neighbors at random - the fraction of samples where those neighbors are connected is an unbiased estimate of the average clustering (nodes with fewer than two neighbors count as 0, as in `networkx.average_clustering`).
+
+        args:
+            num_samples: number of wedges to sample
+            rand_gen: numpy random number generator
+            confidence: confidence level of the returned error bound
+
+        returns:
+            the estimate and the error bound (from Hoeffding's inequality) such that the true average clustering is within the bound of the estimate with probability `confidence`
+        """
+        if self.num_nodes == 0 or num_samples <= 0:
+            return 0.0, 0.0
+
+        nodes = rand_gen.integers(0, self.num_nodes, num_samples)
+        degree = self.degree[nodes]
+        nodes = nodes[degree >= 2]
+        degree = degree[degree >= 2]
+
+        first = rand_gen.integers(0, degree)
+        second = rand_gen.integers(0, degree - 1)
+        second += second >= first
+        start = self.indptr[nodes]
+        closed = self.has_edges(
+            self.indices[start + first], self.indices[start + second]
+        )
+
+        estimate = closed.sum() / num_samples
+        bound = np.sqrt(np.log(2 / (1 - confidence)) / (2 * num_samples))
+        return float(estimate), float(bound)
+
+    def triangles(self) -> np.ndarray:
+        """
+        Number of triangles each node is part of (equivalently, the number of edges between its neighbors), i.e. the diagonal of A³ / 2.  Edges are oriented from lower to higher degree and only wedges of two out-edges are checked, so each triangle is found exactly once.
+
+        returns:
+            array of triangle counts by node index
+        """
+        if self.node_triangles is not None:
+            return self.node_triangles
+
+        # rank nodes by degree (ties by index) and keep edges pointing up in rank
+        rank = np.empty(self.num_nodes, dtype=np.int64)
+        rank[np.argsort(self.degree, kind="stable")] = np.arange(self.num_nodes)
+        forward = rank[self.rows] < rank[self.indices]
+        src = self.rows[forward]
+        dst = self.indices[forward]
+
+        # pair each forward edge with the later forward edges from the same node
+        out_degree = np.bincount(src, minlength=self.num_nodes)
+        out_start = np.cumsum(out_degree) - out_degree
+        num_later = out_degree[src] - (np.arange(len(src)) - out_start[src]) - 1
+        first = np.repeat(np.arange(len(src)), num_later)
+        offset = np.arange(len(first)) - np.repeat(
+            np.cumsum(num_later) - num_later, num_later
+        )
+        second = first + 1 + offset
+
+        a = dst[first]
+        b = dst[second]
+        closed = self.has_edges(a, b)
+        self.node_triangles = (
+            np.bincount(src[first][closed], minlength=self.num_nodes)
+            + np.bincount(a[closed], minlength=self.num_nodes)
+            + np.bincount(b[closed], minlength=self.num_nodes)
+        )
+        return self.node_triangles
+
+    def component_stats(self):
+        """
+        Density, mean effective size and mean degree centrality of every component (as `networkx.density` and `networkx.degree_centrality` on each component's subgraph).  A node's effective size is its degree less the mean number of edges from each neighbor to its other neighbors: `degree - 2 * triangles / degree`.
+
+        returns:
+            arrays (indexed by component) of density, mean effective size, and mean degree centrality
+        """
+        num_comps = len(self.components)
+        sizes = self.component_sizes.astype(float)
+        edges = np.bincount(self.labels, weights=self.degree, minlength=num_comps) / 2
+
+        pairs = sizes * (sizes - 1)
+        has_pairs = pairs > 0
+        density = np.zeros(num_comps)
+        density[has_pairs] = 2 * edges[has_pairs] / pairs[has_pairs]
+
+        node_size = np.zeros(self.num_nodes)
+        has_nbrs = self.degree > 0
+        node_size[has_nbrs] = (
+            self.degree[has_nbrs]
+            - 2 * self.triangles()[has_nbrs] / self.degree[has_nbrs]
+        )
+        effective_size = (
+            np.bincount(self.labels, weights=node_size, minlength=num_comps) / sizes
+        )
+
+        # mean degree / (n - 1) is the same as density, single nodes have centrality 1
+        degree_centrality = np.where(has_pairs, density, 1.0)
+
+        return density, effective_size, degree_centrality
+
+    def degree_centrality(self) -> np.ndarray:
+        """
+        Degree centrality of every node (degree / (number of nodes - 1)), as in `networkx.degree_centrality`
+
+        returns:
+            array of degree centrality by node index
+        """
+        if self.num_nodes <= 1:
+            return np.ones(self.num_nodes)
+        return self.degree / (self.num_nodes - 1)
+
+    def eigenvector_centrality(
+        self, max_iter: int = 100, tol: float = 1.0e-6
+    ) -> np.ndarray:
+        """
+        Eigenvector centrality of every node, computed separately within each component (as if `networkx.eigenvector_centrality` were run on each component's subgraph).  Uses power iteration on A + I, with all components iterated together and each component frozen once it converges.
+
+        args:
+            max_iter: maximum number of power iterations
+            tol: error tolerance per node used to check convergence
+
+        returns:
+            array of eigenvector centrality by node index
+        """
+        if self.eigenvector is not None:
+            return self.eigenvector
+
+        sizes = self.component_sizes[self.labels]
+        x = 1.0 / sizes
+        active = np.ones(len(self.components), dtype=bool)
+        num_comps = len(self.components)
+        for _ in range(max_iter):
+            x_last = x
+            x = x_last + np.bincount(
+                self.rows, weights=x_last[self.indices], minlength=self.num_nodes
+            )
+            norm = np.sqrt(
+                np.bincount(self.labels, weights=x**2, minlength=num_comps)
+            )
+            norm[norm == 0] = 1.0
+            x = x / norm[self.labels]
+            # keep converged components as they were
+            x = np.where(active[self.labels], x, x_last)
+            err = np.bincount(
+                self.labels, weights=np.abs(x - x_last), minlength=num_comps
+            )
+            active &= err >= self.component_sizes * tol
+            if not active.any():
+                break
+        else:
+            logging.warning(
+                f"Eigenvector centrality did not converge in {max_iter} iterations"
+            )
+
+        self.eigenvector = x
+        return x
+
+    def bridges(self) -> np.ndarray:
+        """
+        Find all bridges in the graph (edges whose removal would disconnect a component) using an iterative version of Tarjan's algorithm.
+
+        returns:
+            array of shape (number of bridges, 2) of node indices for the ends of each bridge
+        """
+        if self.bridge_edges is not None:
+            return self.bridge_edges
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        disc = [-1] * self.num_nodes
+        low = [0] * self.num_nodes
+        found = []
+        counter = 0
+        for root in range(self.num_nodes):
+            if disc[root] != -1:
+                continue
+            disc[root] = low[root] = counter
+            counter += 1
+            # stack of (node, parent, position in neighbor list)
+            stack = [(root, -1, indptr[root])]
+            while stack:
+                node, parent, pos = stack[-1]
+                if pos < indptr[node + 1]:
+                    stack[-1] = (node, parent, pos + 1)
+                    nbr = indices[pos]
+                    if nbr == parent:
+                        continue
+                    if disc[nbr] == -1:
+                        disc[nbr] = low[nbr] = counter
+                        counter += 1
+                        stack.append((nbr, node, indptr[nbr]))
+                    elif disc[nbr] < low[node]:
+                        low[node] = disc[nbr]
+                else:
+                    stack.pop()
+                    if parent != -1:
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                        if low[node] > disc[parent]:
+                            found.append((parent, node))
+
+        self.bridge_edges = np.array(found, dtype=np.int64).reshape(-1, 2)
+        return self.bridge_edges
+
+    def node_closeness(self, i: int) -> float:
+        """
+        Closeness centrality of a node, as in `networkx.closeness_centrality` (with `wf_improved`, so closeness is scaled by the fraction of the graph reachable from the node).  Computed with a breadth first search from the node and cached.
+
+        args:
+            i: index of the node
+
+        returns:
+            closeness centrality of the node
+        """
+        if i in self.closeness:
+            return self.closeness[i]
+
+        indptr = self.indptr
+        indices = self.indices
+        dist = {i: 0}
+        total = 0
+        queue = deque([i])
+        while queue:
+            node = queue.popleft()
+            d = dist[node] + 1
+            for nbr in indices[indptr[node] : indptr[node + 1]].tolist():
+                if nbr not in dist:
+                    dist[nbr] = d
+                    total += d
+                    queue.append(nbr)
+
+        reached = len(dist) - 1
+        if total > 0 and self.num_nodes > 1:
+            closeness = (reached / total) * (reached / (self.num_nodes - 1))
+        else:
+            closeness = 0.0
+
+        self.closeness[i] = closeness
+        return closeness
+
+    def closeness_centrality(self) -> np.ndarray:
+        """
+        Closeness centrality of every node (see `node_closeness`)
+
+        returns:
+            array of closeness centrality by node index
+        """
+        return np.array([self.node_closeness(i) for i in range(self.num_nodes)])
+
+    def approximate_closeness(self, num_pivots: int, rand_gen) -> np.ndarray:
+        """
+        Estimate the closeness centrality of every node from breadth first searches started at a sample of pivot nodes in each component.  A node's mean distance to the other nodes in its component is estimated by its mean distance to the pivots, then scaled by the fraction of the graph reachable as in `node_closeness`.  Components with at most `num_pivots` nodes use every node as a pivot, so are exact.
+
+        args:
+            num_pivots: number of pivots to sample per component
+            rand_gen: numpy random number generator used to sample pivots
+
+        returns:
+            array of estimated closeness centrality by node index
+        """
+        if self.approximate is not None:
+            return self.approximate
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        dist_sum = [0] * self.num_nodes
+        num_reached = [0] * self.num_nodes
+        dist = [-1] * self.num_nodes
+        for comp in self.components:
+            if len(comp) <= 1:
+                continue
+            if len(comp) <= num_pivots:
+                pivots = comp.tolist()
+            else:
+                pivots = rand_gen.choice(comp, num_pivots, replace=False).tolist()
+
+            for pivot in pivots:
+                dist[pivot] = 0
+                visited = [pivot]
+                queue = deque(visited)
+                while queue:
+                    node = queue.popleft()
+                    d = dist[node] + 1
+                    for nbr in indices[indptr[node] : indptr[node + 1]]:
+                        if dist[nbr] == -1:
+                            dist[nbr] = d
+                            dist_sum[nbr] += d
+                            num_reached[nbr] += 1
+                            visited.append(nbr)
+                            queue.append(nbr)
+                for node in visited:
+                    dist[node] = -1
+
+        closeness = np.zeros(self.num_nodes)
+        total = np.array(dist_sum, dtype=float)
+        reached = np.array(num_reached)
+        mask = total > 0
+        if self.num_nodes > 1:
+            closeness[mask] = (reached[mask] / total[mask]) * (
+                (self.component_sizes[self.labels[mask]] - 1) / (self.num_nodes - 1)
+            )
+
+        self.approximate = closeness
+        return closeness
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import agent as ag
+from . import model
+
+
+class EventScheduler:
+    """
+    Calendar queue of timed events for agents' features, keyed by time step, used with `model.feature_events`.  Features with timers which are known in advance (e.g. an incarcerated agent's release time) schedule a callback for the time step the timer comes due, instead of checking the timer for every agent each time step in `update_agent`.
+
+    Callbacks are called with the model, and should check that the feature is still in the state the event was scheduled for (e.g. the agent hasn't been released some other way), as events aren't removed when that changes.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[
+            int, List[Tuple["ag.Agent", Callable[["model.TITAN"], None]]]
+        ] = {}
+        self.time: Optional[int] = None  # the last time step events were run
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def schedule(
+        self,
+        time: int,
+        agent: "ag.Agent",
+        callback: Callable[["model.TITAN"], None],
+    ):
+        """
+        Schedule a callback for a time step.  Events for time steps which have already been run are dropped.
+
+        args:
+            time: the time step to call the callback at
+            agent: the agent the event is for
+            callback: the function to call with the model
+        """
+        if self.time is not None and time <= self.time:
+            return
+
+        self.buckets.setdefault(time, []).append((agent, callback))
+
+    def run(self, model: "model.TITAN") -> int:
+        """
+        Call the callbacks of the events due at the model's current time step.  Events are run in agent id order, so the result doesn't depend on the order they were scheduled in, and events for agents no longer in the population are skipped.
+
+        args:
+            model: the instance of TITAN currently being run
+
+        returns:
+            number of events run
+        """
+        self.time = model.time
+        due = self.buckets.pop(model.time, [])
+        due.sort(key=lambda event: event[0].id)
+
+        num_run = 0
+        for agent, callback in due:
+            if agent in model.pop.all_agents:
+                callback(model)
+                num_run += 1
+
+        return num_run
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from . import location
+from . import utils
+
+
+class ExchangeRequest(NamedTuple):
+    """
+    An agent's request for a partner in another location
+    """
+
+    agent_id: int
+    location: str  # the requesting agent's location
+    bond_type: str
+
+
+class ExchangeResponse(NamedTuple):
+    """
+    A location's answer to an `ExchangeRequest`, `partner_id` is `None` if the location had no partner for the agent
+    """
+
+    agent_id: int
+    location: str  # the requesting agent's location
+    bond_type: str
+    partner_id: Optional[int]
+
+
+class Exchange:
+    """
+    The partner exchange between locations connected by `LocationEdge`s.  With `location.exchange.enable`, each location forms relationships among its own agents and submits a request to the exchange for each agent looking for a partner in another location.  Once per time step and bond type, the exchange routes each request to a neighbouring location, chosen with weight `1 / (1 + distance)` of the edge between the locations.  Each location answers the requests routed to it with a partner from its own agents (see `Population.answer_exchange`), and the answers are delivered back to form the relationships (see `Population.apply_exchange`).
+
+    Requests and responses only hold agent ids and names, so the exchange is the only point where locations need to be in sync and doesn't depend on where the agents are held.  The single process backend looks up the requesting agent's attributes when answering, a backend with locations in separate processes would send them with the request.
+    """
+
+    def __init__(self, geography: "location.Geography"):
+        """
+        args:
+            geography: the population's locations and the edges between them
+        """
+        self.neighbors: Dict[str, Tuple[List[str], List[float]]] = {}
+        for edge in sorted(geography.edges, key=lambda edge: edge.id):
+            loc1, loc2 = sorted(edge.edge, key=lambda loc: loc.name)
+            weight = 1.0 / (1.0 + edge.distance)
+            for loc, other in ((loc1, loc2), (loc2, loc1)):
+                names, weights = self.neighbors.setdefault(loc.name, ([], []))
+                names.append(other.name)
+                weights.append(weight)
+
+        self.requests: List[ExchangeRequest] = []
+        self.responses: List[ExchangeResponse] = []
+
+    def has_neighbors(self, location_name: str) -> bool:
+        """
+        Whether a location has an edge to any other location
+
+        args:
+            location_name: name of the location
+
+        returns:
+            whether agents in the location can partner through the exchange
+        """
+        return location_name in self.neighbors
+
+    def submit(self, requests: List[ExchangeRequest]):
+        """
+        Submit requests for partners in another location
+
+        args:
+            requests: the requests from a location's agents
+        """
+        self.requests.extend(requests)
+
+    def route(self, rand_gen) -> Dict[str, List[ExchangeRequest]]:
+        """
+        Send each of the submitted requests to a neighbouring location, and clear the submitted requests.  Requests are routed in agent id order, so the result doesn't depend on the order locations submitted them in.
+
+        args:
+            rand_gen: random number generator
+
+        returns:
+            the requests sent to each location, in agent id order
+        """
+        requests = sorted(self.requests, key=lambda request: request.agent_id)
+        self.requests = []
+
+        routed: Dict[str, List[ExchangeRequest]] = {}
+        for request in requests:
+            names, weights = self.neighbors[request.location]
+            other = utils.safe_random_choice(names, rand_gen, weights=weights)
+            routed.setdefault(other, []).append(request)
+
+        return routed
+
+    def respond(self, responses: List[ExchangeResponse]):
+        """
+        Submit a location's answers to the requests routed to it
+
+        args:
+            responses: the location's answers
+        """
+        self.responses.extend(responses)
+
+    def deliver(self) -> List[ExchangeResponse]:
+        """
+        Get the answered requests, and clear them.  Responses are delivered in agent id order, so the result doesn't depend on the order locations answered in.
+
+        returns:
+            the responses, in agent id order
+        """
+        responses = sorted(self.responses, key=lambda response: response.agent_id)
+        self.responses = []
+
+        return responses
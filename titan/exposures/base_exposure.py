@@ -1,8 +1,10 @@
 from typing import List, Dict
 
 from .. import agent
+from .. import hazards
 from .. import population
 from .. import model
+from .. import utils
 
 
 class BaseExposure:
@@ -13,10 +15,45 @@ class BaseExposure:
     stats: List[str] = []
     """List of names of stats that come from this exposure (e.g. hiv.dx)"""
 
+    location_local = True
+    """Whether `update_agent` only depends on the agent and agents in its location, and not on population-wide state (e.g. `counts` based caps) or partners that may be in other locations.  When the population is processed by location (`location.exchange.enable`), exposures that aren't location local are updated in a coordinator phase after every location's agents are updated."""
+
+    __slots__ = ("active", "agent")
+    """Names of the exposure's instance attributes, which are saved with the population (see `population_io.write`).  Subclasses declare only the attributes they add (e.g. `("time", "ever")`).  A subclass without `__slots__` still works, with its attributes stored in a `__dict__`."""
+
     def __init__(self, agent: "agent.Agent"):
         self.active = False
         self.agent = agent
 
+    @classmethod
+    def get_inactive(cls) -> "BaseExposure":
+        """
+        Get the exposure's shared inactive instance, which every agent has in place of its own instance when the exposure is not enabled (see `Agent.__init__`).  It has the exposure's initial attribute values and can't be changed, so references to the exposure from other features and exposures (e.g. `agent.incar.active`) still work.
+
+        returns:
+            the inactive instance, created on first use
+        """
+        inactive = cls.__dict__.get("_inactive")
+        if inactive is None:
+            inactive = utils.make_inactive(cls)
+            setattr(cls, "_inactive", inactive)
+        return inactive
+
+    @staticmethod
+    def is_transmissible(rel: "agent.Relationship") -> bool:
+        """
+        Whether the exposure can currently be transmitted in a relationship given the state of its agents.  When `model.interactions.transmissible_only` is enabled, the population indexes relationships by this and only relationships an exposure can be transmitted in interact, so `Population.update_transmissible` must be called whenever an agent's state changes this (e.g. in `convert`).
+
+        By default, returns True
+
+        args:
+            rel: the relationship to check
+
+        returns:
+            whether the exposure can be transmitted
+        """
+        return True
+
     @classmethod
     def init_class(cls, params):
         """
@@ -46,6 +83,18 @@ class BaseExposure:
         """
         pass
 
+    @classmethod
+    def add_hazards(cls, engine: "hazards.HazardEngine"):
+        """
+        Add the exposure's rare per time step hazards (e.g. incarceration) to the model's hazard engine, if `model.time_to_event` is enabled.  The exposure then only checks for the hazards in `update_agent` if the engine is `None`, and calls `TITAN.update_hazards` when the agent's state changes.  Called when the model is created.
+
+        By default, there are no hazards.
+
+        args:
+            engine: the model's hazard engine [TITAN.hazards]
+        """
+        pass
+
     @classmethod
     def add_agent(cls, agent: "agent.Agent"):
         """
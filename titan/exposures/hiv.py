@@ -24,9 +24,14 @@ class HIV(base_exposure.BaseExposure):
     dx_counts: Dict[str, Dict[str, int]] = {}
     """Counts of diagnosed agents by race and sex_type"""
 
+    counts: Dict[str, int] = {}
+    """Counts of agents with active hiv by race"""
+
     agents: Set["agent.Agent"] = set()
     """Agents with active hiv"""
 
+    __slots__ = ("time", "dx", "dx_time", "aids")
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
 
@@ -48,6 +53,7 @@ class HIV(base_exposure.BaseExposure):
             race: {so: 0 for so in params.classes.sex_types}
             for race in params.classes.races
         }
+        cls.counts = {race: 0 for race in params.classes.races}
         cls.agents = set()
 
     def init_agent(self, pop: "population.Population", time: int):
@@ -122,12 +128,14 @@ class HIV(base_exposure.BaseExposure):
         """
         Add an agent to the class (not instance).  This can be useful if tracking population level statistics or groups, such as counts or newly active agents.
 
-        Add the agent to the `agents` set and if the agent is diagnosed, updated the `dx_counts`
+        Add the agent to the `agents` set and `counts` (if not already present) and if the agent is diagnosed, updated the `dx_counts`
 
         args:
             agent: the agent to add to the class attributes
         """
-        cls.agents.add(agent)
+        if agent not in cls.agents:
+            cls.agents.add(agent)
+            cls.counts[agent.race] += 1
 
         if agent.hiv.dx:  # type: ignore[attr-defined]
             cls.dx_counts[agent.race][agent.sex_type] += 1
@@ -137,12 +145,13 @@ class HIV(base_exposure.BaseExposure):
         """
         Remove an agent from the class (not instance).  This can be useful if tracking population level statistics or groups, such as counts.
 
-        Remove the agent from the `agents` set and decrement the `dx_counts` if the agent was diagnosed.
+        Remove the agent from the `agents` set and `counts` and decrement the `dx_counts` if the agent was diagnosed.
 
         args:
             agent: the agent to remove from the class attributes
         """
         cls.agents.remove(agent)
+        cls.counts[agent.race] -= 1
 
         if agent.hiv.dx:  # type: ignore[attr-defined]
             cls.dx_counts[agent.race][agent.sex_type] -= 1
@@ -159,6 +168,19 @@ class HIV(base_exposure.BaseExposure):
                 if self.dx_time == time:
                     stats["hiv_dx_new"] += 1
 
+    @staticmethod
+    def is_transmissible(rel: "agent.Relationship") -> bool:
+        """
+        HIV can be transmitted in HIV discordant relationships.
+
+        args:
+            rel: the relationship to check
+
+        returns:
+            whether exactly one of the agents is HIV+
+        """
+        return rel.agent1.hiv.active != rel.agent2.hiv.active  # type: ignore[attr-defined]
+
     @staticmethod
     def expose(
         model: "model.TITAN",
@@ -249,12 +271,12 @@ class HIV(base_exposure.BaseExposure):
             ]
 
         # feature specific risk adjustment
-        for feature in model.features:
-            agent_feature = getattr(self.agent, feature.name)
-            p *= agent_feature.get_transmission_risk_multiplier(self.time, interaction)
-
-            partner_feature = getattr(partner, feature.name)
-            p *= partner_feature.get_acquisition_risk_multiplier(self.time, interaction)
+        p *= self.agent.get_risk_multiplier(
+            model.features, "transmission", self.time, interaction, model.time
+        )
+        p *= partner.get_risk_multiplier(
+            model.features, "acquisition", self.time, interaction, model.time
+        )
 
         # Scaling parameter for acute HIV infections
         if self.get_acute_status(model.time):
@@ -283,7 +305,10 @@ class HIV(base_exposure.BaseExposure):
             self.active = True
             self.time = model.time
             self.agent.vaccine.active = False  # type: ignore[attr-defined]
+            self.agent.reset_risk_multipliers()
             self.add_agent(self.agent)
+            model.pop.update_transmissible(self.agent)
+            model.update_hazards(self.agent)
 
         if self.agent.prep.active:  # type: ignore[attr-defined]
             self.agent.prep.progress(model, force=True)  # type: ignore[attr-defined]
@@ -298,6 +323,7 @@ class HIV(base_exposure.BaseExposure):
         self.dx = True
         self.dx_time = model.time
         self.add_agent(self.agent)
+        model.update_hazards(self.agent)
 
     # ============================ HELPER METHODS ==============================
 
@@ -331,3 +357,4 @@ class HIV(base_exposure.BaseExposure):
 
         if model.run_random.random() < p * aids_prob:
             self.aids = True
+            model.update_hazards(self.agent)
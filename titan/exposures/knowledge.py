@@ -1,13 +1,14 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 import numpy as np  # type: ignore
-import networkx as nx  # type: ignore
 
 from . import base_exposure
 from .. import agent as ag
+from .. import hazards
 from .. import population
 from .. import model
 from .. import utils
+from .. import centrality
 
 
 class Knowledge(base_exposure.BaseExposure):
@@ -20,12 +21,66 @@ class Knowledge(base_exposure.BaseExposure):
     * knowledge_aware - number of agents with active knowledge
     """
 
+    # class level cache of the network centrality used for influence
+    centrality: Optional["centrality.Centrality"] = None
+    centrality_time: Optional[int] = None
+
+    __slots__ = ("opinion",)
+
     def __init__(self, agent: "ag.Agent"):
         super().__init__(agent)
 
         self.active = False
         self.opinion = 0.0
 
+    @classmethod
+    def init_class(cls, params):
+        """
+        Clear the cached network centrality.
+
+        args:
+            params: the population params
+        """
+        cls.centrality = None
+        cls.centrality_time = None
+
+    @classmethod
+    def get_influence(cls, model: "model.TITAN", agent: "ag.Agent") -> float:
+        """
+        Get an agent's influence (closeness centrality in the network).  The centrality is cached until the network changes, or if `knowledge.influence.refresh` is more than 1, re-used for that many time steps.  Agents who joined the network since the centrality was calculated have no influence.
+
+        args:
+            model: the instance of TITAN currently being run
+            agent: the agent to get the influence of
+
+        returns:
+            the agent's closeness centrality
+        """
+        params = model.params.knowledge.influence
+        if (
+            cls.centrality is None
+            or cls.centrality_time is None
+            or (
+                cls.centrality.version != model.pop.graph_version
+                and (
+                    params.refresh == 1
+                    or model.time - cls.centrality_time >= params.refresh
+                )
+            )
+        ):
+            cls.centrality = model.pop.get_centrality()
+            cls.centrality_time = model.time
+
+        i = cls.centrality.node_index.get(agent)
+        if i is None:
+            return 0.0
+        elif params.centrality == "approximate":
+            return cls.centrality.approximate_closeness(
+                params.num_pivots, model.np_random
+            )[i]
+        else:
+            return cls.centrality.node_closeness(i)
+
     def init_agent(self, pop: "population.Population", time: int):
         """
         Initialize the agent for this exposure during population initialization (`Population.create_agent`).  Called only on exposures that are enabled per the params.
@@ -49,7 +104,7 @@ class Knowledge(base_exposure.BaseExposure):
         """
         Update the agent for this exposure for a time step.  Called once per time step in `TITAN.update_all_agents`.
 
-        If the knowledge start_time has happened, stochastically convert agents.
+        If the knowledge start_time has happened, stochastically convert agents (sampled by the hazard engine with `model.time_to_event`).
 
         args:
             model: the instance of TITAN currently being run
@@ -58,6 +113,7 @@ class Knowledge(base_exposure.BaseExposure):
         if (
             model.time >= knowledge_params.start_time
             and not self.active
+            and model.hazards is None
             and model.run_random.random() < knowledge_params.prob
         ):
             self.convert(model)
@@ -66,6 +122,46 @@ class Knowledge(base_exposure.BaseExposure):
         if self.active:
             stats["knowledge_aware"] += 1
 
+    @classmethod
+    def add_hazards(cls, engine: "hazards.HazardEngine"):
+        """
+        Add conversion to the model's hazard engine, from the knowledge start_time.
+
+        args:
+            engine: the model's hazard engine [TITAN.hazards]
+        """
+        engine.add_hazard(
+            "knowledge",
+            lambda model, agent: getattr(agent, cls.name).get_conversion_prob(),
+            lambda model, agent: getattr(agent, cls.name).convert(model),
+            lambda model, agent: agent.location.params.knowledge.start_time,
+        )
+
+    def get_conversion_prob(self) -> float:
+        """
+        Get the probability of the agent becoming aware this time step, once the knowledge start_time has happened.
+
+        returns:
+            the probability of conversion, 0 if already aware
+        """
+        if self.active:
+            return 0.0
+
+        return self.agent.location.params.knowledge.prob
+
+    @staticmethod
+    def is_transmissible(rel: "ag.Relationship") -> bool:
+        """
+        Knowledge can be transmitted (or opinions influenced) in relationships with at least one aware agent.
+
+        args:
+            rel: the relationship to check
+
+        returns:
+            whether either agent is aware
+        """
+        return rel.agent1.knowledge.active or rel.agent2.knowledge.active  # type: ignore[attr-defined]
+
     @staticmethod
     def expose(
         model: "model.TITAN",
@@ -142,6 +238,7 @@ class Knowledge(base_exposure.BaseExposure):
         """
         params = self.agent.location.params.knowledge
         self.active = True  # type: ignore[attr-defined]
+        model.pop.update_transmissible(self.agent)
         if (
             self.opinion > params.opinion.threshold  # type: ignore[attr-defined]
             and model.run_random.random() < params.feature.prob
@@ -149,6 +246,8 @@ class Knowledge(base_exposure.BaseExposure):
             agent_attr = getattr(self.agent, params.feature.name)
             agent_attr.initiate(model, force=True)
 
+        model.update_hazards(self.agent)
+
 
 # ===================== HELPER FUNCTIONS ===================
 def influence(model: "model.TITAN", rel: "ag.Relationship"):
@@ -160,10 +259,8 @@ def influence(model: "model.TITAN", rel: "ag.Relationship"):
         rel: a relationship where an agent is influencing their partner
     """
 
-    def get_influence(agent):
-        return nx.closeness_centrality(model.pop.graph, agent)
-
-    if get_influence(rel.agent1) > get_influence(rel.agent2):
+    get_influence = Knowledge.get_influence
+    if get_influence(model, rel.agent1) > get_influence(model, rel.agent2):
         agent = rel.agent1
         partner = rel.agent2
     else:
@@ -1,8 +1,11 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from .. import agent
+from .. import events
+from .. import hazards
 from .. import population
 from .. import model
+from .. import utils
 
 
 class BaseFeature:
@@ -25,11 +28,17 @@ class BaseFeature:
     stats: List[str] = []
     """List of names of stats that come from this feature (e.g. numFeat)"""
 
+    location_local = True
+    """Whether `update_agent` only depends on the agent and agents in its location, and not on population-wide state (e.g. `counts` based caps) or partners that may be in other locations.  When the population is processed by location (`location.exchange.enable`), features that aren't location local are updated in a coordinator phase after every location's agents are updated."""
+
+    __slots__ = ("active", "agent")
+    """Names of the feature's instance attributes, which are saved with the population (see `population_io.write`).  Subclasses declare only the attributes they add (e.g. `("time", "ever")`).  A subclass without `__slots__` still works, with its attributes stored in a `__dict__`."""
+
     def __init__(self, agent: "agent.Agent"):
         """
         Constructor for an instance of the feature.  This is called from within `Agent.__init__` and passes the agent to the feature to create a two way binding.  All features must have the attributes of `active` and `agent`.  By default `active` is false and `agent` is the passed agent.
 
-        Called on all features whether or not param is enabled to make sure that references to other features within a feature do not cause errors (e.g. incar referring to prep, but prep isn't on).
+        Only called for features that are enabled per the params, agents share the feature's inactive instance (see `get_inactive`) otherwise, to make sure that references to other features within a feature do not cause errors (e.g. incar referring to prep, but prep isn't on).
 
         args:
             agent: The agent this feature instance is attached to.
@@ -37,6 +46,20 @@ class BaseFeature:
         self.active = False
         self.agent = agent
 
+    @classmethod
+    def get_inactive(cls) -> "BaseFeature":
+        """
+        Get the feature's shared inactive instance, which every agent has in place of its own instance when the feature is not enabled (see `Agent.__init__`).  It has the feature's initial attribute values and can't be changed, so references to the feature from other features and exposures (e.g. `agent.incar.active`) still work.
+
+        returns:
+            the inactive instance, created on first use
+        """
+        inactive = cls.__dict__.get("_inactive")
+        if inactive is None:
+            inactive = utils.make_inactive(cls)
+            setattr(cls, "_inactive", inactive)
+        return inactive
+
     @classmethod
     def init_class(cls, params):
         """
@@ -66,6 +89,29 @@ class BaseFeature:
         """
         pass
 
+    def schedule_events(self, scheduler: Optional["events.EventScheduler"]):
+        """
+        Schedule events for the feature's timers which are known in advance (e.g. an incarcerated agent's release time) with the population's event scheduler, if `model.feature_events` is enabled.  Called by the feature when its state changes, and from `population_io.read` when a population is loaded.
+
+        By default, there are no timed events.
+
+        args:
+            scheduler: the population's event scheduler [Population.events], or `None` if not enabled
+        """
+        pass
+
+    @classmethod
+    def add_hazards(cls, engine: "hazards.HazardEngine"):
+        """
+        Add the feature's rare per time step hazards (e.g. incarceration) to the model's hazard engine, if `model.time_to_event` is enabled.  The feature then only checks for the hazards in `update_agent` if the engine is `None`, and calls `TITAN.update_hazards` when the agent's state changes.  Called when the model is created.
+
+        By default, there are no hazards.
+
+        args:
+            engine: the model's hazard engine [TITAN.hazards]
+        """
+        pass
+
     @classmethod
     def add_agent(cls, agent: "agent.Agent"):
         """
@@ -118,6 +164,8 @@ class BaseFeature:
         """
         Get a multiplier for how this feature affects acquisition of HIV for the given interaction_type.
 
+        The product of an agent's multipliers is cached for the rest of the time step (see `Agent.get_risk_multiplier`), so a feature must call `agent.reset_risk_multipliers()` when a change in its state changes this multiplier.
+
         By default, returns 1.0
 
         args:
@@ -130,6 +178,8 @@ class BaseFeature:
         """
         Get a multiplier for how this feature affects transmission of HIV for the given interaction_type.
 
+        The product of an agent's multipliers is cached for the rest of the time step (see `Agent.get_risk_multiplier`), so a feature must call `agent.reset_risk_multipliers()` when a change in its state changes this multiplier.
+
         By default, returns 1.0
 
         args:
@@ -8,6 +8,8 @@ class ExternalExposure(base_feature.BaseFeature):
 
     name = "external_exposure"
 
+    __slots__ = ()
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
 
@@ -2,6 +2,7 @@ from typing import Dict, ClassVar
 
 from . import base_feature
 from .. import agent
+from .. import hazards
 from .. import population
 from .. import model
 from ..parse_params import ObjMap
@@ -20,8 +21,13 @@ class HAART(base_feature.BaseFeature):
         * haart - number of agents with active haart
     """
 
+    # enrollment caps use population-wide counts
+    location_local = False
+
     counts: ClassVar[Dict] = {}
 
+    __slots__ = ("ever", "adherent")
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
 
@@ -87,26 +93,33 @@ class HAART(base_feature.BaseFeature):
             # Go on HAART
             if not self.active:
                 self.enroll(model, haart_params)
+                if self.active:
+                    model.update_hazards(self.agent)
 
             # Update agents on HAART
             else:
-                # Go off HAART
-                if model.run_random.random() < haart_params.discontinue:
-                    self.active = False
-                    self.adherent = False
-                    self.remove_agent(self.agent)
+                # Go off HAART, sampled by the hazard engine if enabled
+                if (
+                    model.hazards is None
+                    and model.run_random.random() < haart_params.discontinue
+                ):
+                    self.discontinue(model)
                 # Become non-adherent
                 elif (
                     self.adherent
                     and model.run_random.random() < haart_params.adherence.discontinue
                 ):
                     self.adherent = False
+                    self.agent.reset_risk_multipliers()
+                    model.update_hazards(self.agent)
                 # Become adherent
                 elif (
                     not self.adherent
                     and model.run_random.random() < haart_params.adherence.become
                 ):
                     self.adherent = True
+                    self.agent.reset_risk_multipliers()
+                    model.update_hazards(self.agent)
 
     @classmethod
     def add_agent(cls, agent: "agent.Agent"):
@@ -174,6 +187,51 @@ class HAART(base_feature.BaseFeature):
 
     # =========== HELPER METHODS ============
 
+    @classmethod
+    def add_hazards(cls, engine: "hazards.HazardEngine"):
+        """
+        Add going off HAART to the model's hazard engine.  Agents can only go off HAART once HIV has started.
+
+        args:
+            engine: the model's hazard engine [TITAN.hazards]
+        """
+        engine.add_hazard(
+            "haart_discontinue",
+            lambda model, agent: getattr(agent, cls.name).get_discontinue_prob(),
+            lambda model, agent: getattr(agent, cls.name).discontinue(model),
+            lambda model, agent: model.params.hiv.start_time,
+        )
+
+    def get_discontinue_prob(self) -> float:
+        """
+        Get the probability of the agent going off HAART this time step.
+
+        returns:
+            the probability of going off HAART, 0 if not on HAART or not diagnosed
+        """
+        if not self.active or not self.agent.hiv.dx:  # type: ignore[attr-defined]
+            return 0.0
+
+        return (
+            self.agent.location.params.demographics[self.agent.race]
+            .sex_type[self.agent.sex_type]
+            .drug_type[self.agent.drug_type]
+            .haart.discontinue
+        )
+
+    def discontinue(self, model: "model.TITAN"):
+        """
+        Take the agent off HAART.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        self.active = False
+        self.adherent = False
+        self.remove_agent(self.agent)
+        self.agent.reset_risk_multipliers()
+        model.update_hazards(self.agent)
+
     def enroll(self, model: "model.TITAN", haart_params: ObjMap):
         """
         Determine whether to enroll an agent in HAART.
@@ -242,3 +300,4 @@ class HAART(base_feature.BaseFeature):
         self.active = True
         self.ever = True
         self.add_agent(self.agent)
+        self.agent.reset_risk_multipliers()
@@ -1,12 +1,14 @@
 # mypy: always-true=HighRisk
 
-from typing import Dict, Optional
+from typing import Dict, Optional, ClassVar
 
 from . import base_feature
 from .. import utils
 from .. import agent
+from .. import events
 from .. import population
 from .. import model
+from ..parse_params import ObjMap
 
 
 class HighRisk(base_feature.BaseFeature):
@@ -33,6 +35,13 @@ class HighRisk(base_feature.BaseFeature):
         * hiv_new_high_risk_ever - number of agents that became active with HIV this time step were ever high risk
     """
 
+    counts: ClassVar[Dict[str, int]] = {}
+
+    # makes partners, who may be in other locations, high risk
+    location_local = False
+
+    __slots__ = ("time", "duration", "ever", "end_time")
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
 
@@ -40,6 +49,18 @@ class HighRisk(base_feature.BaseFeature):
         self.time: Optional[int] = None
         self.duration = 0
         self.ever = False
+        # time step the high risk period ends, with `model.feature_events`
+        self.end_time: Optional[int] = None
+
+    @classmethod
+    def init_class(cls, params: "ObjMap"):
+        """
+        Initialize the counts dictionary for the races in the model.
+
+        args:
+            params: the population params
+        """
+        cls.counts = {race: 0 for race in params.classes.races}
 
     def init_agent(self, pop: "population.Population", time: int):
         """
@@ -86,26 +107,46 @@ class HighRisk(base_feature.BaseFeature):
                         < partner.location.params.high_risk.prob
                     ):
                         partner.high_risk.become_high_risk(model.pop, model.time)  # type: ignore[attr-defined]
+        elif model.pop.events is not None:
+            pass  # the end of the high risk period is a scheduled event
         elif self.duration > 0:
             self.duration -= 1
         else:
-            self.active = False
+            self.end(model)
 
-            self.update_partner_numbers(
-                model.pop, -1 * self.agent.location.params.high_risk.partner_scale
-            )
+    def schedule_events(self, scheduler: Optional["events.EventScheduler"]):
+        """
+        Schedule the end of the agent's high risk period.
 
-            for bond in self.agent.location.params.high_risk.partnership_types:
-                num_ended = 0
-                while (
-                    len(self.agent.partners[bond]) - num_ended
-                ) > self.agent.target_partners[bond]:
-                    rel = utils.safe_random_choice(
-                        self.agent.relationships, model.run_random
-                    )
-                    if rel is not None:
-                        num_ended += 1
-                        rel.duration = 0  # will end on next step
+        args:
+            scheduler: the population's event scheduler [Population.events], or `None` if not enabled
+        """
+        if scheduler is not None and self.active and self.end_time is not None:
+            scheduler.schedule(self.end_time, self.agent, self.end_event)
+
+    @classmethod
+    def add_agent(cls, agent: "agent.Agent"):
+        """
+        Add an agent to the class (not instance).
+
+        Increments `counts` of high risk agents by race for the given agent.
+
+        args:
+            agent: the agent to add to the class attributes
+        """
+        cls.counts[agent.race] += 1
+
+    @classmethod
+    def remove_agent(cls, agent: "agent.Agent"):
+        """
+        Remove an agent from the class (not instance).
+
+        Decrements `counts` of high risk agents by race for the given agent.
+
+        args:
+            agent: the agent to remove from the class attributes
+        """
+        cls.counts[agent.race] -= 1
 
     def set_stats(self, stats: Dict[str, int], time: int):
         if self.time == time:
@@ -146,6 +187,9 @@ class HighRisk(base_feature.BaseFeature):
         if not self.ever:
             self.time = time
 
+        if not self.active:
+            self.add_agent(self.agent)
+
         self.active = True
         self.ever = True
 
@@ -160,6 +204,47 @@ class HighRisk(base_feature.BaseFeature):
             pop, self.agent.location.params.high_risk.partner_scale
         )
 
+        if pop.events is not None:
+            # the duration is counted down from the next time step
+            self.end_time = time + self.duration + 1
+            self.schedule_events(pop.events)
+
+    def end(self, model: "model.TITAN"):
+        """
+        End the agent's high risk period, and end relationships until the agent has no more than their target number of partners.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        self.active = False
+        self.remove_agent(self.agent)
+
+        self.update_partner_numbers(
+            model.pop, -1 * self.agent.location.params.high_risk.partner_scale
+        )
+
+        for bond in self.agent.location.params.high_risk.partnership_types:
+            num_ended = 0
+            while (
+                len(self.agent.partners[bond]) - num_ended
+            ) > self.agent.target_partners[bond]:
+                rel = utils.safe_random_choice(
+                    self.agent.relationships, model.run_random
+                )
+                if rel is not None:
+                    num_ended += 1
+                    rel.duration = 0  # will end on next step
+
+    def end_event(self, model: "model.TITAN"):
+        """
+        Scheduled event (see `schedule_events`), end the agent's high risk period if it is still due to end.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        if self.active and self.end_time == model.time:
+            self.end(model)
+
     def update_partner_numbers(self, pop: "population.Population", amount: int):
         """
         Update the agent's mean and target partner numbers by the amount passed.  Update partnerability for the population.
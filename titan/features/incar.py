@@ -1,10 +1,13 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, ClassVar
 
 from . import base_feature
 from .. import agent
+from .. import events
+from .. import hazards
 from .. import population
 from .. import model
 from .. import utils
+from ..parse_params import ObjMap
 
 
 class Incar(base_feature.BaseFeature):
@@ -20,6 +23,10 @@ class Incar(base_feature.BaseFeature):
         * new_release_hiv - number of agents releasted this timestep with HIV
     """
 
+    counts: ClassVar[Dict[str, int]] = {}
+
+    __slots__ = ("time", "release_time")
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
 
@@ -27,6 +34,16 @@ class Incar(base_feature.BaseFeature):
         self.time: Optional[int] = None
         self.release_time: Optional[int] = None
 
+    @classmethod
+    def init_class(cls, params: "ObjMap"):
+        """
+        Initialize the counts dictionary for the races in the model.
+
+        args:
+            params: the population params
+        """
+        cls.counts = {race: 0 for race in params.classes.races}
+
     def init_agent(self, pop: "population.Population", time: int):
         """
         Initialize the agent for this feature during population initialization (`Population.create_agent`).  Called on only features that are enabled per the params.
@@ -59,6 +76,8 @@ class Incar(base_feature.BaseFeature):
             self.release_time = time + pop.pop_random.randrange(
                 jail_duration[bin].min, jail_duration[bin].max
             )
+            self.add_agent(self.agent)
+            self.schedule_events(pop.events)
 
     def update_agent(self, model: "model.TITAN"):
         """
@@ -69,66 +88,51 @@ class Incar(base_feature.BaseFeature):
         args:
             model: the instance of TITAN currently being run
         """
-        hiv_bool = self.agent.hiv.active  # type: ignore[attr-defined]
-
-        if hiv_bool:
-            hiv_multiplier = self.agent.location.params.incar.hiv.multiplier
-        else:
-            hiv_multiplier = 1.0
-
-        # agent is incarcerated
+        # agent is incarcerated, release is a scheduled event if enabled
         if self.active:
-            # Release agent
-            if self.release_time == model.time:
-                self.active = False
-
-                # does agent stay on haart
-                if hiv_bool:
-                    if self.agent.haart.active:  # type: ignore[attr-defined]
-                        if (
-                            model.run_random.random()
-                            <= self.agent.location.params.incar.haart.discontinue
-                        ):
-                            self.agent.haart.active = False  # type: ignore[attr-defined]
-                            self.agent.haart.adherent = False  # type: ignore[attr-defined]
-
-        # should the agent become incarcerated?
-        elif model.run_random.random() < (
-            self.agent.location.params.demographics[self.agent.race]
-            .sex_type[self.agent.sex_type]
-            .incar.prob
-            * hiv_multiplier
-            * model.calibration.incarceration
+            if model.pop.events is None and self.release_time == model.time:
+                self.release(model)
+
+        # should the agent become incarcerated? sampled by the hazard engine if enabled
+        elif (
+            model.hazards is None
+            and model.run_random.random() < self.get_incarceration_prob(model)
         ):
-            incar_duration = (
-                self.agent.location.params.demographics[self.agent.race]
-                .sex_type[self.agent.sex_type]
-                .incar.duration.prob
-            )
+            self.incarcerate(model)
 
-            bin = utils.get_cumulative_bin(model.run_random, incar_duration)
+    def schedule_events(self, scheduler: Optional["events.EventScheduler"]):
+        """
+        Schedule the agent's release, if incarcerated.
 
-            self.time = model.time
-            self.release_time = model.time + utils.safe_random_int(
-                incar_duration[bin].min, incar_duration[bin].max, model.run_random
-            )
-            self.active = True
+        args:
+            scheduler: the population's event scheduler [Population.events], or `None` if not enabled
+        """
+        if scheduler is not None and self.active and self.release_time is not None:
+            scheduler.schedule(self.release_time, self.agent, self.release_event)
 
-            if hiv_bool:
-                if not self.agent.hiv.dx:  # type: ignore[attr-defined]
-                    if (
-                        model.run_random.random()
-                        < self.agent.location.params.incar.hiv.dx
-                    ):
-                        self.agent.hiv.diagnose(model)  # type: ignore[attr-defined]
-                else:  # Then tested and HIV, check to enroll in ART
-                    if (
-                        model.run_random.random()
-                        < self.agent.location.params.incar.haart.prob
-                    ):
-                        self.agent.haart.adherent = model.run_random.random() < self.agent.location.params.incar.haart.adherence  # type: ignore[attr-defined]
-                        # Add agent to HAART class set, update agent params
-                        self.agent.haart.active = True  # type: ignore[attr-defined]
+    @classmethod
+    def add_agent(cls, agent: "agent.Agent"):
+        """
+        Add an agent to the class (not instance).
+
+        Increments `counts` of incarcerated agents by race for the given agent.
+
+        args:
+            agent: the agent to add to the class attributes
+        """
+        cls.counts[agent.race] += 1
+
+    @classmethod
+    def remove_agent(cls, agent: "agent.Agent"):
+        """
+        Remove an agent from the class (not instance).
+
+        Decrements `counts` of incarcerated agents by race for the given agent.
+
+        args:
+            agent: the agent to remove from the class attributes
+        """
+        cls.counts[agent.race] -= 1
 
     def set_stats(self, stats: Dict[str, int], time: int):
         if self.release_time == time:
@@ -142,3 +146,122 @@ class Incar(base_feature.BaseFeature):
                 stats["incar_hiv"] += 1
 
     # ============== HELPER METHODS ================
+
+    @classmethod
+    def add_hazards(cls, engine: "hazards.HazardEngine"):
+        """
+        Add incarceration to the model's hazard engine.
+
+        args:
+            engine: the model's hazard engine [TITAN.hazards]
+        """
+        engine.add_hazard(
+            "incarceration",
+            lambda model, agent: agent.incar.get_incarceration_prob(model),  # type: ignore[attr-defined]
+            lambda model, agent: agent.incar.incarcerate(model),  # type: ignore[attr-defined]
+        )
+
+    def get_incarceration_prob(self, model: "model.TITAN") -> float:
+        """
+        Get the probability of the agent becoming incarcerated this time step.
+
+        args:
+            model: the instance of TITAN currently being run
+
+        returns:
+            the probability of incarceration, 0 if already incarcerated
+        """
+        if self.active:
+            return 0.0
+
+        if self.agent.hiv.active:  # type: ignore[attr-defined]
+            hiv_multiplier = self.agent.location.params.incar.hiv.multiplier
+        else:
+            hiv_multiplier = 1.0
+
+        return (
+            self.agent.location.params.demographics[self.agent.race]
+            .sex_type[self.agent.sex_type]
+            .incar.prob
+            * hiv_multiplier
+            * model.calibration.incarceration
+        )
+
+    def incarcerate(self, model: "model.TITAN"):
+        """
+        Incarcerate the agent for a random duration, and stochastically diagnose them with HIV or enroll them in HAART.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        hiv_bool = self.agent.hiv.active  # type: ignore[attr-defined]
+        incar_duration = (
+            self.agent.location.params.demographics[self.agent.race]
+            .sex_type[self.agent.sex_type]
+            .incar.duration.prob
+        )
+
+        bin = utils.get_cumulative_bin(model.run_random, incar_duration)
+
+        self.time = model.time
+        self.release_time = model.time + utils.safe_random_int(
+            incar_duration[bin].min, incar_duration[bin].max, model.run_random
+        )
+        self.active = True
+        self.add_agent(self.agent)
+        self.schedule_events(model.pop.events)
+
+        if hiv_bool:
+            if not self.agent.hiv.dx:  # type: ignore[attr-defined]
+                if model.run_random.random() < self.agent.location.params.incar.hiv.dx:
+                    self.agent.hiv.diagnose(model)  # type: ignore[attr-defined]
+            else:  # Then tested and HIV, check to enroll in ART
+                if (
+                    model.run_random.random()
+                    < self.agent.location.params.incar.haart.prob
+                ):
+                    adherent = model.run_random.random() < self.agent.location.params.incar.haart.adherence  # type: ignore[attr-defined]
+                    # agents can only be put on haart if it is enabled
+                    if model.params.features.haart:
+                        self.agent.haart.adherent = adherent  # type: ignore[attr-defined]
+                        # Add agent to HAART class set, update agent params
+                        if not self.agent.haart.active:  # type: ignore[attr-defined]
+                            self.agent.haart.add_agent(self.agent)  # type: ignore[attr-defined]
+                        self.agent.haart.active = True  # type: ignore[attr-defined]
+                        self.agent.reset_risk_multipliers()
+
+        model.update_hazards(self.agent)
+
+    def release(self, model: "model.TITAN"):
+        """
+        Release the agent from incarceration, and stochastically discontinue HAART.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        self.active = False
+        self.remove_agent(self.agent)
+
+        # does agent stay on haart
+        if self.agent.hiv.active:  # type: ignore[attr-defined]
+            if self.agent.haart.active:  # type: ignore[attr-defined]
+                if (
+                    model.run_random.random()
+                    <= self.agent.location.params.incar.haart.discontinue
+                ):
+                    self.agent.haart.active = False  # type: ignore[attr-defined]
+                    self.agent.haart.adherent = False  # type: ignore[attr-defined]
+                    self.agent.haart.remove_agent(self.agent)  # type: ignore[attr-defined]
+                    self.agent.reset_risk_multipliers()
+
+        model.update_hazards(self.agent)
+
+    def release_event(self, model: "model.TITAN"):
+        """
+        Scheduled event (see `schedule_events`), release the agent if they are still due to be released.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        if self.active and self.release_time == model.time:
+            self.release(model)
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from . import base_feature
 from .. import agent
+from .. import events
 from .. import model
 
 
@@ -7,6 +10,11 @@ class PartnerTracing(base_feature.BaseFeature):
 
     name = "partner_tracing"
 
+    # traces partners, who may be in other locations
+    location_local = False
+
+    __slots__ = ("time",)
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
 
@@ -40,6 +48,7 @@ class PartnerTracing(base_feature.BaseFeature):
                     ):
                         ptnr.partner_tracing.active = True  # type: ignore[attr-defined]
                         ptnr.partner_tracing.time = model.time  # type: ignore[attr-defined]
+                        ptnr.partner_tracing.schedule_events(model.pop.events)  # type: ignore[attr-defined]
 
             # second chance at diagnosis if traced
             if (
@@ -50,7 +59,41 @@ class PartnerTracing(base_feature.BaseFeature):
             ):
                 agent_exposure.diagnose(model)
 
-        # stop tracing of this agent if time
+        # stop tracing of this agent if time, a scheduled event if enabled
+        if (
+            model.pop.events is None
+            and self.active
+            and model.time >= self.time + params.trace_duration
+        ):
+            self.active = False
+            self.time = None
+
+    def schedule_events(self, scheduler: Optional["events.EventScheduler"]):
+        """
+        Schedule the end of tracing the agent.
+
+        args:
+            scheduler: the population's event scheduler [Population.events], or `None` if not enabled
+        """
+        if scheduler is not None and self.active and self.time is not None:
+            scheduler.schedule(
+                self.time + self.agent.location.params.partner_tracing.trace_duration,
+                self.agent,
+                self.end_trace_event,
+            )
+
+    def end_trace_event(self, model: "model.TITAN"):
+        """
+        Scheduled event (see `schedule_events`), stop tracing the agent if it is still due to stop and partner tracing is running.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        params = self.agent.location.params.partner_tracing
+
+        if model.time < params.start_time or model.time > params.stop_time:
+            return
+
         if self.active and model.time >= self.time + params.trace_duration:
             self.active = False
             self.time = None
@@ -4,6 +4,7 @@ import numpy as np  # type: ignore
 
 from . import base_feature
 from .. import agent
+from .. import events
 from .. import population
 from .. import model
 from ..parse_params import ObjMap
@@ -23,9 +24,14 @@ class Prep(base_feature.BaseFeature):
         * prep_oral - number of agents on oral PrEP
     """
 
+    # enrollment caps use population-wide counts
+    location_local = False
+
     # class level attributes to track all Prep agents
     counts: ClassVar[Dict[str, int]] = {}
 
+    __slots__ = ("adherent", "type", "time", "last_dose_time")
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
         # agent level attributes
@@ -68,6 +74,8 @@ class Prep(base_feature.BaseFeature):
             elif pop.pop_random.random() < params.prep.init:
                 self.enroll(pop.pop_random, time)
 
+            self.schedule_events(pop.events)
+
     def update_agent(self, model: "model.TITAN"):
         """
         Update the agent for this feature for a time step.  Called once per time step in `TITAN.update_all_agents`. Agent level updates are done after population level updates.   Called on only features that are enabled per the params.
@@ -111,6 +119,26 @@ class Prep(base_feature.BaseFeature):
         """
         cls.counts[agent.race] -= 1
 
+    def schedule_events(self, scheduler: Optional["events.EventScheduler"]):
+        """
+        Schedule the end of the agent's injectable PrEP, a year after their last dose.
+
+        args:
+            scheduler: the population's event scheduler [Population.events], or `None` if not enabled
+        """
+        if (
+            scheduler is not None
+            and self.active
+            and self.type == "Inj"
+            and self.last_dose_time is not None
+        ):
+            scheduler.schedule(
+                self.last_dose_time
+                + self.agent.location.params.model.time.steps_per_year,
+                self.agent,
+                self.end_injectable_event,
+            )
+
     def set_stats(self, stats: Dict[str, int], time: int):
         if self.active:
             stats["prep"] += 1
@@ -183,13 +211,10 @@ class Prep(base_feature.BaseFeature):
         else:
             if "Racial" in params.prep.target_model:
                 num_prep_agents = self.counts[self.agent.race]
-                all_hiv_agents = exposures.HIV.agents
-                all_race = {
-                    a for a in model.pop.all_agents if a.race == self.agent.race
-                }
+                num_race_agents = model.pop.counts["race"][self.agent.race]
+                num_hiv_agents = exposures.HIV.counts[self.agent.race]
 
-                num_hiv_agents = len(all_hiv_agents & all_race)
-                target_prep = (len(all_race) - num_hiv_agents) * params.demographics[
+                target_prep = (num_race_agents - num_hiv_agents) * params.demographics[
                     self.agent.race
                 ].sex_type[self.agent.sex_type].prep.cap
             else:
@@ -202,6 +227,8 @@ class Prep(base_feature.BaseFeature):
             if num_prep_agents < target_prep:
                 self.enroll(model.run_random, model.time)
 
+        self.schedule_events(model.pop.events)
+
     def enroll(self, rand_gen, time):
         """
         Enroll an agent in PrEP
@@ -232,6 +259,7 @@ class Prep(base_feature.BaseFeature):
             self.type = params.prep.type[0]
 
         self.add_agent(self.agent)
+        self.agent.reset_risk_multipliers()
 
     def progress(self, model: "model.TITAN", force: bool = False):
         """
@@ -255,16 +283,38 @@ class Prep(base_feature.BaseFeature):
                 self.discontinue()
             else:
                 self.last_dose_time = model.time
+                self.agent.reset_risk_multipliers()
 
         # TO_REVIEW should inj prep have a way to continue at the year mark (besides maybe getting prep again through the normal channels of enrollment)?
+        # the end of injectable prep is a scheduled event if enabled
         if (
             self.type == "Inj"
+            and model.pop.events is None
             and self.last_dose_time
             + self.agent.location.params.model.time.steps_per_year
             == model.time
         ):
             self.discontinue()
 
+    def end_injectable_event(self, model: "model.TITAN"):
+        """
+        Scheduled event (see `schedule_events`), discontinue the agent's injectable PrEP if it is still due to end, and the agent would have been updated (doesn't have HIV, and it is at least the prep start time).
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        if (
+            self.active
+            and self.type == "Inj"
+            and self.last_dose_time is not None
+            and self.last_dose_time
+            + self.agent.location.params.model.time.steps_per_year
+            == model.time
+            and not self.agent.hiv.active  # type: ignore[attr-defined]
+            and model.time >= self.agent.location.params.prep.start_time
+        ):
+            self.discontinue()
+
     def discontinue(self):
         """
         Discontinue PrEP usage
@@ -275,6 +325,7 @@ class Prep(base_feature.BaseFeature):
         self.last_dose_time = None
 
         self.remove_agent(self.agent)
+        self.agent.reset_risk_multipliers()
 
     def eligible(self, time) -> bool:
         """
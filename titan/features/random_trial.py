@@ -1,12 +1,12 @@
-from typing import Dict
+from typing import Dict, List
 import logging
 
+import numpy as np  # type: ignore
+
 from . import base_feature
 from .. import utils
 from .. import model
 
-import networkx as nx  # type: ignore
-
 
 class RandomTrial(base_feature.BaseFeature):
 
@@ -26,6 +26,8 @@ class RandomTrial(base_feature.BaseFeature):
         * random_trial_suitable - number of active agents suitable
     """
 
+    __slots__ = ("treated", "suitable")
+
     def __init__(self, agent):
         super().__init__(agent)
 
@@ -53,7 +55,7 @@ class RandomTrial(base_feature.BaseFeature):
         ), "Network must be enabled for random trial"
 
         logging.info(f"Starting random trial ({rt_params.choice})")
-        components = model.pop.connected_components()
+        centrality = model.pop.get_centrality()
 
         # set up helper methods based on params
         if rt_params.treatment == "prep":
@@ -69,20 +71,29 @@ class RandomTrial(base_feature.BaseFeature):
             treat = treat_knowledge
             suitable = suitable_knowledge
 
+        if rt_params.choice == "eigenvector":
+            eigenvector = centrality.eigenvector_centrality()
+        elif rt_params.choice == "bridge":
+            # bridge agents grouped by component, an agent is listed once per bridge
+            bridge_agents: Dict[int, List] = {}
+            for edge in centrality.bridges().tolist():
+                bridge_agents.setdefault(centrality.labels[edge[0]], []).extend(
+                    centrality.get_nodes(edge)
+                )
+
         total_nodes = 0
-        logging.info(
-            f"Number of components {len([1 for comp in components if comp.number_of_nodes()])}",
-        )
-        for comp in components:
-            total_nodes += comp.number_of_nodes()
+        logging.info(f"Number of components {len(centrality.components)}")
+        for label, comp_indices in enumerate(centrality.components):
+            comp = centrality.get_nodes(comp_indices)
+            total_nodes += len(comp)
             if model.run_random.random() < rt_params.prob:
                 # Component selected as treatment pod!
-                for agent in comp.nodes:
+                for agent in comp:
                     agent.random_trial.active = True
 
                 # treat all agents
                 if rt_params.choice == "all":
-                    for agent in comp.nodes():
+                    for agent in comp:
                         if suitable(agent, model):
                             treat(agent, model)
                             agent.random_trial.suitable = True
@@ -90,9 +101,12 @@ class RandomTrial(base_feature.BaseFeature):
 
                 # chose an agent central to the component
                 elif rt_params.choice == "eigenvector":
-                    centrality = nx.algorithms.centrality.eigenvector_centrality(comp)
-                    assert len(centrality) >= 1, "Empty centrality"
-                    ordered_centrality = sorted(centrality, key=centrality.get)
+                    assert len(comp) >= 1, "Empty centrality"
+                    ordered_centrality = centrality.get_nodes(
+                        comp_indices[
+                            np.argsort(eigenvector[comp_indices], kind="stable")
+                        ]
+                    )
 
                     # find the most central suitable agent, or if none, use most central
                     intervention_agent = ordered_centrality[0]
@@ -107,12 +121,9 @@ class RandomTrial(base_feature.BaseFeature):
 
                 # chose an agent that is a bridge in the network
                 elif rt_params.choice == "bridge":
-                    # list all edges that are bridges
-                    all_bridges = list(nx.bridges(comp))
                     suitable_agents = [
                         agent
-                        for agents in all_bridges
-                        for agent in agents
+                        for agent in bridge_agents.get(label, [])
                         if suitable(agent, model)
                     ]  # all suitable agents in bridges
 
@@ -123,9 +134,7 @@ class RandomTrial(base_feature.BaseFeature):
                         chosen_agent.random_trial.suitable = True  # type: ignore[attr-defined]
 
                     else:  # if no suitable agents, mark a non-suitable agent
-                        chosen_agent = utils.safe_random_choice(
-                            list(comp.nodes), model.run_random
-                        )
+                        chosen_agent = utils.safe_random_choice(comp, model.run_random)
 
                     chosen_agent.random_trial.treated = True  # type: ignore[attr-defined]
                     treat(chosen_agent, model)
@@ -133,7 +142,7 @@ class RandomTrial(base_feature.BaseFeature):
                 # chose an agent from the component at random
                 elif rt_params.choice == "random":
                     suitable_agents = [
-                        agent for agent in comp.nodes if suitable(agent, model)
+                        agent for agent in comp if suitable(agent, model)
                     ]
 
                     # if there are agents who meet eligibility criteria,
@@ -145,9 +154,7 @@ class RandomTrial(base_feature.BaseFeature):
                     if chosen_agent is not None:
                         chosen_agent.random_trial.suitable = True
                     else:  # if no suitable agents, mark a non-suitable agent
-                        chosen_agent = utils.safe_random_choice(
-                            list(comp.nodes), model.run_random
-                        )
+                        chosen_agent = utils.safe_random_choice(comp, model.run_random)
 
                     chosen_agent.random_trial.treated = True  # type: ignore[attr-defined]
                     treat(chosen_agent, model)
@@ -172,6 +179,7 @@ class RandomTrial(base_feature.BaseFeature):
 
 def treat_prep(agent, model):
     agent.prep.enroll(model.run_random, model.time)
+    agent.prep.schedule_events(model.pop.events)
 
 
 def suitable_prep(agent, model) -> bool:
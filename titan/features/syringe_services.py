@@ -11,6 +11,12 @@ class SyringeServices(base_feature.BaseFeature):
 
     enrolled_risk = 0.0
 
+    # class level pools of PWID agents, maintained incrementally
+    enrolled: utils.IndexedSet = utils.IndexedSet()
+    unenrolled: utils.IndexedSet = utils.IndexedSet()
+
+    __slots__ = ()
+
     def __init__(self, agent):
         super().__init__(agent)
 
@@ -19,12 +25,52 @@ class SyringeServices(base_feature.BaseFeature):
     @classmethod
     def init_class(cls, params):
         """
-        Initialize enrolled risk to 0.
+        Initialize enrolled risk to 0 and empty the enrollment pools.
 
         args:
             params: the population params
         """
         cls.enrolled_risk = 0.0
+        cls.enrolled = utils.IndexedSet()
+        cls.unenrolled = utils.IndexedSet()
+
+    def init_agent(self, pop, time: int):
+        """
+        Initialize the agent for this feature during population initialization (`Population.create_agent`).  Called on only features that are enabled per the params.
+
+        PWID agents are added to the pool of agents available for enrollment.
+
+        args:
+            pop: the population this agent is a part of
+            time: the current time step
+        """
+        if self.agent.drug_type == "Inj":
+            self.unenrolled.add(self.agent)
+
+    @classmethod
+    def add_agent(cls, agent):
+        """
+        Add an agent to the class (not instance).
+
+        Moves the agent from the unenrolled pool to the enrolled pool.
+
+        args:
+            agent: the agent to add to the class attributes
+        """
+        cls.unenrolled.discard(agent)
+        cls.enrolled.add(agent)
+
+    @classmethod
+    def remove_agent(cls, agent):
+        """
+        Remove an agent from the class (not instance).
+
+        Removes the agent from the enrolled pool.
+
+        args:
+            agent: the agent to remove from the class attributes
+        """
+        cls.enrolled.discard(agent)
 
     @classmethod
     def update_pop(cls, model: "hiv_model.TITAN"):
@@ -37,11 +83,16 @@ class SyringeServices(base_feature.BaseFeature):
             model: the instance of TITAN currently being run
         """
         logging.info(("\n\n!!!!Engaging syringe services program"))
-        ssp_num_slots = 0
-        ssp_agents = {
-            agent for agent in model.pop.pwid_agents if agent.syringe_services.active  # type: ignore[attr-defined]
-        }
+        # agents who died this time step leave the pools (enrolled agents are
+        # removed via `remove_agent`)
+        for agent in model.deaths:
+            cls.unenrolled.discard(agent)
 
+        num_pwid_agents = model.pop.pwid_agents.num_members()
+        if len(cls.enrolled) + len(cls.unenrolled) != num_pwid_agents:
+            cls.rebuild_pools(model)
+
+        ssp_num_slots = 0
         for item in model.params.syringe_services.timeline.values():
             if item.start_time <= model.time < item.stop_time:
                 cls.enrolled_risk = item.risk
@@ -53,7 +104,6 @@ class SyringeServices(base_feature.BaseFeature):
 
                 # If cap indicates all or no agents, do not change
                 # otherwise, find true number of slots through distribution
-                num_pwid_agents = model.pop.pwid_agents.num_members()
                 if 0 < ssp_num_slots < num_pwid_agents:
                     ssp_num_slots = round(
                         model.run_random.betavariate(
@@ -64,27 +114,35 @@ class SyringeServices(base_feature.BaseFeature):
                     )
                 break
 
-        target_set = utils.safe_shuffle(
-            (model.pop.pwid_agents.members - ssp_agents), model.run_random
-        )
+        # unenroll random agents if above cap
+        while len(cls.enrolled) > ssp_num_slots:
+            agent = cls.enrolled.pop_random(model.run_random)
+            agent.syringe_services.active = False  # type: ignore[attr-defined]
+            cls.unenrolled.add(agent)
 
-        # unenroll agents if above cap
-        for agent in ssp_agents.copy():
-            if len(ssp_agents) > ssp_num_slots:
-                agent.syringe_services.active = False  # type: ignore[attr-defined]
-                ssp_agents.remove(agent)
-            else:
-                break
-
-        # enroll agents if below cap
-        for agent in target_set:
-            if len(ssp_agents) < ssp_num_slots:
-                agent.syringe_services.active = True  # type: ignore[attr-defined]
-                ssp_agents.add(agent)
-            else:
-                break
+        # enroll random agents if below cap
+        while len(cls.enrolled) < ssp_num_slots and cls.unenrolled:
+            agent = cls.unenrolled.pop_random(model.run_random)
+            agent.syringe_services.active = True  # type: ignore[attr-defined]
+            cls.enrolled.add(agent)
 
         logging.info(
             f"SSP has {ssp_num_slots} target slots with "
-            f"{len(ssp_agents)} slots filled"
+            f"{len(cls.enrolled)} slots filled"
         )
+
+    @classmethod
+    def rebuild_pools(cls, model: "hiv_model.TITAN"):
+        """
+        Rebuild the enrolled and unenrolled pools from the population's PWID agents.  Only needed if the pools have drifted from the population (e.g. a population read from file, or agents' drug types changed outside of the model).
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        cls.enrolled.clear()
+        cls.unenrolled.clear()
+        for agent in model.pop.pwid_agents:
+            if agent.syringe_services.active:  # type: ignore[attr-defined]
+                cls.enrolled.add(agent)
+            else:
+                cls.unenrolled.add(agent)
@@ -4,6 +4,7 @@ import numpy as np  # type: ignore
 
 from . import base_feature
 from .. import agent
+from .. import events
 from .. import population
 from .. import model
 
@@ -18,6 +19,8 @@ class Vaccine(base_feature.BaseFeature):
         * vaccine - number of agents with active vaccine
     """
 
+    __slots__ = ("time", "type")
+
     def __init__(self, agent: "agent.Agent"):
         super().__init__(agent)
         self.active = False
@@ -43,6 +46,7 @@ class Vaccine(base_feature.BaseFeature):
             .vaccine.init
         ):
             self.vaccinate(time)
+            self.schedule_events(pop.events)
 
     def update_agent(self, model: "model.TITAN"):
         """
@@ -64,16 +68,34 @@ class Vaccine(base_feature.BaseFeature):
                 .vaccine
             )
 
+            # boosters are scheduled events if enabled
             if self.active:
-                if (
-                    vaccine_params.booster
-                    and (model.time - self.time) == agent_params.booster.interval
-                    and model.run_random.random() < agent_params.booster.prob
-                ):
-                    self.vaccinate(model.time)
+                if model.pop.events is None:
+                    self.booster(model)
             elif model.time == vaccine_params.start_time:
                 if model.run_random.random() < agent_params.prob:
                     self.vaccinate(model.time)
+                    self.schedule_events(model.pop.events)
+
+    def schedule_events(self, scheduler: Optional["events.EventScheduler"]):
+        """
+        Schedule the agent's next booster, if boosters are enabled.
+
+        args:
+            scheduler: the population's event scheduler [Population.events], or `None` if not enabled
+        """
+        if (
+            scheduler is not None
+            and self.active
+            and self.time is not None
+            and self.agent.location.params.vaccine.booster
+        ):
+            interval = (
+                self.agent.location.params.demographics[self.agent.race]
+                .sex_type[self.agent.sex_type]
+                .vaccine.booster.interval
+            )
+            scheduler.schedule(self.time + interval, self.agent, self.booster_event)
 
     def set_stats(self, stats: Dict[str, int], time: int):
         if self.active:
@@ -107,6 +129,40 @@ class Vaccine(base_feature.BaseFeature):
 
     # ============= HELPER METHODS =============
 
+    def booster(self, model: "model.TITAN"):
+        """
+        If the agent is due a booster, stochastically revaccinate them.
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        agent_params = (
+            self.agent.location.params.demographics[self.agent.race]
+            .sex_type[self.agent.sex_type]
+            .vaccine
+        )
+        if (
+            self.agent.location.params.vaccine.booster
+            and (model.time - self.time) == agent_params.booster.interval
+            and model.run_random.random() < agent_params.booster.prob
+        ):
+            self.vaccinate(model.time)
+            self.schedule_events(model.pop.events)
+
+    def booster_event(self, model: "model.TITAN"):
+        """
+        Scheduled event (see `schedule_events`), give the agent a booster if they would have been updated (not on PrEP and doesn't have HIV).
+
+        args:
+            model: the instance of TITAN currently being run
+        """
+        if (
+            self.active
+            and not self.agent.prep.active  # type: ignore[attr-defined]
+            and not self.agent.hiv.active  # type: ignore[attr-defined]
+        ):
+            self.booster(model)
+
     def vaccinate(self, time):
         """
         Vaccinate an agent and update relevant fields.
@@ -114,3 +170,4 @@ class Vaccine(base_feature.BaseFeature):
         self.active = True
         self.type = self.agent.location.params.vaccine.type
         self.time = time
+        self.agent.reset_risk_multipliers()
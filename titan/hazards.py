@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+from functools import partial
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from . import agent as ag
+from . import events
+from . import model
+
+
+class Hazard(NamedTuple):
+    """
+    A rare per time step hazard (e.g. mortality) sampled by the `HazardEngine`
+    """
+
+    # the probability of the hazard occuring for an agent each time step
+    prob: Callable[["model.TITAN", "ag.Agent"], float]
+    # make the hazard happen to an agent
+    occur: Callable[["model.TITAN", "ag.Agent"], None]
+    # the first time step the hazard can occur for an agent, if limited
+    start_time: Optional[Callable[["model.TITAN", "ag.Agent"], int]] = None
+
+
+class HazardEngine:
+    """
+    Time-to-event sampling of rare per time step hazards (e.g. mortality), used with `model.time_to_event`.  Instead of drawing a random number for every agent each time step and checking it against the hazard's probability, the engine draws a geometric waiting time to the time step the hazard next occurs for each agent, and schedules the occurrence on an `EventScheduler` for the hazard.  The model then only runs the occurrences due each time step.
+
+    Waiting times are redrawn from the next time step (see `update`) when an agent's state changes (e.g. they convert, go on or off HAART, or are incarcerated or released) and when params are scaled by `timeline_scaling`, if the hazard's probability changed.  As the geometric distribution is memoryless, this is statistically equivalent to drawing each time step.  Occurrences which were redrawn aren't removed from the scheduler, they are skipped when they come due.
+    """
+
+    def __init__(self):
+        self.hazards: Dict[str, Hazard] = {}
+        # hazard -> agent -> (probability, time step the hazard occurs)
+        self.draws: Dict[str, Dict["ag.Agent", Tuple[float, int]]] = {}
+        self.events: Dict[str, events.EventScheduler] = {}
+
+    def add_hazard(
+        self,
+        name: str,
+        prob: Callable[["model.TITAN", "ag.Agent"], float],
+        occur: Callable[["model.TITAN", "ag.Agent"], None],
+        start_time: Optional[Callable[["model.TITAN", "ag.Agent"], int]] = None,
+    ):
+        """
+        Add a hazard to sample.
+
+        args:
+            name: name of the hazard (e.g. "mortality")
+            prob: function of the model and an agent, returning the probability of the hazard occuring for the agent each time step
+            occur: function of the model and an agent, making the hazard happen to the agent
+            start_time: function of the model and an agent, returning the first time step the hazard can occur [default: no limit]
+        """
+        self.hazards[name] = Hazard(prob, occur, start_time)
+        self.draws[name] = {}
+        self.events[name] = events.EventScheduler()
+
+    def update(
+        self, model: "model.TITAN", agent: "ag.Agent", time: Optional[int] = None
+    ):
+        """
+        Redraw the time step each hazard next occurs for an agent, if the hazard's probability changed since it was drawn.
+
+        args:
+            model: the instance of TITAN currently being run
+            agent: the agent whose state changed
+            time: the first time step the hazards can occur [default: the next time step]
+        """
+        if time is None:
+            time = model.time + 1
+
+        for name, hazard in self.hazards.items():
+            draws = self.draws[name]
+            p = hazard.prob(model, agent)
+            draw = draws.get(agent)
+            if draw is not None and draw[0] == p:
+                continue
+            if p <= 0:
+                draws.pop(agent, None)
+                continue
+
+            start = time
+            if hazard.start_time is not None:
+                start = max(time, hazard.start_time(model, agent))
+            draw = (p, self.draw_time(p, start, model.np_random))
+            draws[agent] = draw
+            self.events[name].schedule(
+                draw[1], agent, partial(self.occur, name, agent, draw)
+            )
+
+    def occur(
+        self,
+        name: str,
+        agent: "ag.Agent",
+        draw: Tuple[float, int],
+        model: "model.TITAN",
+    ):
+        """
+        Scheduled event (see `update`), make the hazard happen to the agent if the occurrence wasn't redrawn, and draw the next one.
+
+        args:
+            name: name of the hazard
+            agent: the agent the hazard occurs for
+            draw: the probability and time step the occurrence was drawn with
+            model: the instance of TITAN currently being run
+        """
+        draws = self.draws[name]
+        if draws.get(agent) is not draw:
+            return
+
+        del draws[agent]
+        self.hazards[name].occur(model, agent)
+        self.update(model, agent)
+
+    def run(self, model: "model.TITAN", name: str) -> int:
+        """
+        Make a hazard happen to the agents it occurs for at the model's current time step, in agent id order.
+
+        args:
+            model: the instance of TITAN currently being run
+            name: name of the hazard
+
+        returns:
+            number of scheduled occurrences run, including redrawn ones
+        """
+        return self.events[name].run(model)
+
+    @staticmethod
+    def draw_time(p: float, time: int, rand_gen) -> int:
+        """
+        Draw the time step a hazard next occurs, counting from `time`.
+
+        args:
+            p: the probability of the hazard occuring each time step, greater than 0
+            time: the first time step the hazard can occur
+            rand_gen: np random number generator
+
+        returns:
+            the time step the hazard occurs
+        """
+        if p >= 1:
+            return time
+
+        return time + int(rand_gen.geometric(p)) - 1
+
+    def remove_agent(self, agent: "ag.Agent"):
+        """
+        Remove an agent's occurrences (e.g. when they die)
+
+        args:
+            agent: the agent to remove
+        """
+        for draws in self.draws.values():
+            draws.pop(agent, None)
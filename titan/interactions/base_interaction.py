@@ -21,8 +21,11 @@ class BaseInteraction:
         if num_acts < 1:
             return
 
+        transmissible = model.pop.transmissible
         for exposure in model.exposures:
-            if model.time >= model.params[exposure.name].start_time:
+            if model.time >= model.params[exposure.name].start_time and (
+                transmissible is None or rel in transmissible[exposure.name]
+            ):
                 exposure.expose(model, cls.name, rel, num_acts)
 
     @classmethod
@@ -1,5 +1,5 @@
 from typing import Optional, Set, Dict, List, Any
-from copy import deepcopy
+from copy import copy
 import math
 
 from .parse_params import ObjMap
@@ -20,6 +20,10 @@ class Location:
         # location properties
         self.name = name
         self.params = self.create_params(params)
+        # features and exposures are enabled for the whole model, agents get the
+        # same set in every location regardless of any location scaling
+        self.features = params.features
+        self.exposures = params.exposures
         self.ppl = defn.ppl  # percent of overall population assigned to this location
 
         # value/weight maps needed for creating new agents in this location
@@ -49,17 +53,21 @@ class Location:
         """
         Scale or override the generic parameters with any location based scaling from params.location.scaling
 
+        The location's params share all of their structure with `params` except for the containers along each scaled/overridden path, which are copied on write.  Changes to a shared (un-scaled) part of `params` are therefore seen by the location as well.
+
         args:
             params: model parameters
 
         returns:
             new parameter object with scaled values for this location
         """
-        new_params = deepcopy(params)
+        new_params = copy(params)
+        owned = {id(new_params)}
 
-        defns = new_params.location.scaling[self.name]
+        defns = params.location.scaling[self.name]
         for param_path, defn in defns.items():
             if param_path != "ls_default":
+                utils.copy_param_path(new_params, param_path, owned)
                 if defn.field == "scalar":
                     utils.scale_param(new_params, param_path, defn.scalar)
                 elif defn.field == "override":
@@ -117,7 +125,8 @@ class Location:
         ), f"ppl of {self.name}'s' races must add to 1"
 
 
-# LocationEdges are very much a WIP and not actually used anywhere yet
+# LocationEdges are very much a WIP, they are only used by the partner exchange
+# between locations (see `exchange.Exchange`)
 # outstanding questions:
 # * should edges be directed? bi-drectional? uni-drectional, but both directions housed in the same edge?
 # * what attributes do edges need?
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+import itertools
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+from . import agent as ag
+from . import utils
+
+# number of objects of each type measured to estimate the total size
+NUM_SAMPLES = 100
+
+TRACEMALLOC_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process in bytes, if it can be read from `/proc` (i.e. on linux)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident set size of this process in bytes, if available
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def shallow_size(obj: Any) -> int:
+    """
+    Size of an object (including its slots) and its attribute dictionary (if it has one), but not the attribute values
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def deep_size(obj: Any) -> int:
+    """
+    Size of an object including the contents of any (nested) dictionaries, lists, tuples and sets it contains
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k) + deep_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item) for item in obj)
+    return size
+
+
+def instance_size(obj: Any) -> int:
+    """
+    Size of an object, its attribute dictionary, and any containers (dictionaries, lists, tuples and sets) in its attributes, but not other objects it refers to
+    """
+    size = shallow_size(obj)
+    for attr in utils.get_attrs(obj):
+        value = getattr(obj, attr)
+        if isinstance(value, (dict, list, tuple, set, frozenset)):
+            size += deep_size(value)
+    return size
+
+
+def agent_size(agent: "ag.Agent") -> int:
+    """
+    Estimated size of an agent, including its relationship and partner containers but not its features and exposures (which are measured separately) or the partners themselves
+    """
+    size = shallow_size(agent)
+    size += sys.getsizeof(agent.relationships)
+    size += sys.getsizeof(agent.partners)
+    size += sum(sys.getsizeof(partners) for partners in agent.partners.values())
+    size += sys.getsizeof(agent.mean_num_partners)
+    size += sys.getsizeof(agent.target_partners)
+    return size
+
+
+def graph_size(graph) -> int:
+    """
+    Estimated size of a networkx graph's node and adjacency dictionaries and edge attribute dictionaries, not including the nodes (agents) themselves
+    """
+    size = sys.getsizeof(graph._node) + sys.getsizeof(graph._adj)
+    size += sum(sys.getsizeof(attrs) for attrs in graph._node.values())
+    size += sum(sys.getsizeof(nbrs) for nbrs in graph._adj.values())
+    size += sum(sys.getsizeof(attrs) for _, _, attrs in graph.edges(data=True))
+    return size
+
+
+def estimate(objs: Iterable, count: int, size_func) -> int:
+    """
+    Estimate the total size of `count` objects by measuring the first `NUM_SAMPLES` of them
+    """
+    sample = list(itertools.islice(objs, NUM_SAMPLES))
+    if not sample:
+        return 0
+    return round(sum(size_func(obj) for obj in sample) / len(sample) * count)
+
+
+def get_object_sizes(model) -> List[Tuple[str, int, int]]:
+    """
+    Get the number and estimated total size of the model's major objects: agents, relationships, each enabled feature and exposure class, the population's graph and the stats dictionary
+
+    args:
+        model: the running model
+
+    returns:
+        list of (name, count, bytes)
+    """
+    pop = model.pop
+    agents = pop.all_agents.members
+    num_agents = len(agents)
+
+    sizes = [
+        ("Agent", num_agents, estimate(agents, num_agents, agent_size)),
+        (
+            "Relationship",
+            len(pop.relationships),
+            estimate(pop.relationships, len(pop.relationships), shallow_size),
+        ),
+    ]
+
+    # agents share one inactive instance of the exposures/features not enabled
+    for cls in model.exposures + model.features:
+        attrs = (getattr(agent, cls.name) for agent in agents)
+        sizes.append(
+            (cls.__name__, num_agents, estimate(attrs, num_agents, instance_size))
+        )
+
+    if pop.enable_graph:
+        sizes.append(
+            ("Population.graph", pop.graph.number_of_edges(), graph_size(pop.graph))
+        )
+
+    return sizes
+
+
+def write_memory_report(model, stats: Dict, outdir: str, num_sites: int = 10):
+    """
+    Append a snapshot of the model's memory use to `memoryReport.txt` in outdir.  Each row has a `kind`:
+
+    * `rss` - the current and peak resident set size of the process
+    * `object` - the number and estimated size of agents, relationships, each feature and exposure, the population graph, and the stats dictionary
+    * `site` - the `num_sites` source lines with the most memory allocated (by size, with the number of allocated blocks as the count), if `tracemalloc` is tracing
+
+    args:
+        model: the running model
+        stats: the stats dictionary for this time step
+        outdir: path where the file should be saved
+        num_sites: number of top allocation sites to write
+    """
+    rows: List[Tuple[str, str, Any, Any]] = [
+        ("rss", "current", "", rss_bytes()),
+        ("rss", "peak", "", peak_rss_bytes()),
+    ]
+
+    # snapshot allocations before measuring the objects allocates anything
+    if num_sites > 0 and tracemalloc.is_tracing():
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+        for stat in snapshot.statistics("lineno")[:num_sites]:
+            frame = stat.traceback[0]
+            rows.append(
+                ("site", f"{frame.filename}:{frame.lineno}", stat.count, stat.size)
+            )
+
+    for obj_name, obj_count, obj_size in get_object_sizes(model):
+        rows.append(("object", obj_name, obj_count, obj_size))
+    rows.append(("object", "stats", len(stats), deep_size(stats)))
+
+    with open(os.path.join(outdir, "memoryReport.txt"), "a") as f:
+        if f.tell() == 0:
+            f.write("run_id\tt\tkind\tname\tcount\tbytes\n")
+        for kind, row_name, count, size in rows:
+            size = "" if size is None else size
+            f.write(f"{model.id}\t{model.time}\t{kind}\t{row_name}\t{count}\t{size}\n")
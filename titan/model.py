@@ -1,14 +1,25 @@
 import random
-from typing import Dict, List, Optional
+import heapq
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Set
 from copy import copy
 import os
 import logging
+import tracemalloc
 
 import numpy as np  # type: ignore
 import nanoid  # type: ignore
 
 from . import agent as ag
+from . import exchange
+from . import hazards
 from . import output as ao
+from . import memory
+from . import temporal_network
+from . import random_streams
+from . import report_writer
+from . import timing
 from . import probabilities as prob
 from .parse_params import ObjMap
 from . import exposures, features, interactions, population, utils
@@ -81,24 +92,83 @@ class TITAN:
         random.seed(self.run_seed)
         logging.info(("  FIRST RANDOM CALL {}".format(random.randint(0, 100))))
 
+        # subsystems drawing from their own random number streams - with
+        # transmissible_only, interactions always do so that the rest of the
+        # model's draws don't depend on which relationships interact
+        self.streams = random_streams.RandomStreams(self.run_seed)
+        self.stream_subsystems = set()
+        # partnering by location needs the population processed by location
+        partitioned = params.location.exchange.enable
+        if params.model.seed.streams or partitioned:
+            self.stream_subsystems = {
+                "mortality",
+                "partnering",
+                "agent_zero",
+                "interaction",
+                "exchange",
+                "update_pop",
+                "update_agent",
+                "events",
+                "hazards",
+            }
+        elif self.pop.transmissible is not None:
+            self.stream_subsystems = {"interaction"}
+
+        # the order locations are processed in, if the population is processed
+        # location by location followed by a coordinator phase
+        self.location_order: Optional[List[str]] = None
+        if partitioned:
+            self.location_order = list(self.pop.geography.locations)
+
+        # partnering by location, with a partner exchange between locations
+        self.exchange: Optional[exchange.Exchange] = None
+        if params.location.exchange.enable:
+            self.exchange = exchange.Exchange(self.pop.geography)
+
+        # time-to-event sampling of rare hazards, if enabled
+        self.hazards: Optional[hazards.HazardEngine] = None
+        if params.model.time_to_event:
+            self.hazards = hazards.HazardEngine()
+            self.hazards.add_hazard("mortality", TITAN.get_mortality_prob, TITAN.die)
+            for item in self.exposures + self.features:
+                item.add_hazards(self.hazards)
+            for agent in self.pop.all_agents:
+                self.hazards.update(self, agent)
+
         logging.info("  Resetting death count")
         self.deaths: List["ag.Agent"] = []  # Number of death
 
+        self.timer = timing.PhaseTimer(params.outputs.timing)
+
+        writer_params = params.outputs.background_writer
+        self.report_writer = report_writer.ReportWriter(
+            writer_params.enable, writer_params.queue_size
+        )
+
         logging.info("\n=== Initialization Protocol Finished ===")
 
     def print_stats(self, stat: Dict[str, Dict[str, int]], outdir: str):
         """
         Create/update all of the reports defined in the params
         """
+        # the classes reported on (e.g. components) can change while reports
+        # are written in the background
+        if self.report_writer.background:
+            params = copy(self.params)
+            params.classes = copy(self.params.classes)
+        else:
+            params = self.params
+
         for report in self.params.outputs.reports:
             printer = getattr(ao, report)
-            printer(
+            self.report_writer.submit(
+                printer,
                 self.id,
                 self.time,
                 self.run_seed,
                 self.pop.pop_seed,
                 stat,
-                self.params,
+                params,
                 outdir,
             )
 
@@ -108,24 +178,47 @@ class TITAN:
             and self.params.model.network.enable
         ):
             network_outdir = os.path.join(outdir, "network")
+            # the graph keeps changing while reports are written in the background
+            if self.report_writer.background:
+                graph = self.pop.graph.copy()
+            else:
+                graph = self.pop.graph
+
             if self.params.outputs.network.calc_component_stats:
-                ao.print_components(
+                self.report_writer.submit(
+                    ao.print_components,
                     self.id,
                     self.time,
                     self.run_seed,
                     self.pop.pop_seed,
-                    self.pop.connected_components(),
+                    self.pop.get_centrality(),
                     network_outdir,
                 )
 
             if self.params.outputs.network.calc_network_stats:
-                ao.write_network_stats(
-                    self.pop.graph, network_outdir, self.id, self.time
+                stats_params = self.params.outputs.network.stats
+                # sampling has its own generator, seeded by the number of steps
+                # run (time is negative during burn in)
+                stats_random = None
+                if stats_params.mode == "sampled":
+                    stats_random = np.random.default_rng(
+                        [self.run_seed, self.time + self.params.model.time.burn_steps]
+                    )
+                self.report_writer.submit(
+                    ao.write_network_stats,
+                    graph,
+                    network_outdir,
+                    self.id,
+                    self.time,
+                    centrality=self.pop.get_centrality(),
+                    mode=stats_params.mode,
+                    num_samples=stats_params.num_samples,
+                    rand_gen=stats_random,
                 )
 
             if self.params.outputs.network.edge_list:
-                ao.write_graph_edgelist(
-                    self.pop.graph, network_outdir, self.id, self.time
+                self.report_writer.submit(
+                    ao.write_graph_edgelist, graph, network_outdir, self.id, self.time
                 )
 
     def reset_trackers(self):
@@ -142,6 +235,24 @@ class TITAN:
         args:
             outdir: path to directory where results should be saved
         """
+        log_params = self.params.outputs.network.temporal_log
+        if log_params.enable:
+            self.pop.network_log = temporal_network.TemporalNetworkLog(
+                os.path.join(outdir, "network", f"{self.id}_TemporalNetwork.bin"),
+                self.params.classes.bond_types.keys(),
+                self.time,
+            )
+            self.pop.network_log.write_keyframe(self.pop.relationships)
+
+        memory_params = self.params.outputs.memory
+        start_tracing = (
+            memory_params.enable
+            and memory_params.num_sites > 0
+            and not tracemalloc.is_tracing()
+        )
+        if start_tracing:
+            tracemalloc.start()
+
         # make sure initial state of things get printed
         stats = ao.get_stats(
             self.pop.all_agents,
@@ -152,6 +263,7 @@ class TITAN:
             self.time,
         )
         self.print_stats(stats, outdir)
+        self.print_memory(stats, outdir)
 
         if self.params.model.time.burn_steps > 0:
             logging.info("  ===! Start Burn Loop !===")
@@ -167,6 +279,18 @@ class TITAN:
             self.step(outdir)
             self.reset_trackers()
 
+        if self.pop.network_log is not None:
+            self.pop.network_log.close()
+            self.pop.network_log = None
+
+        self.report_writer.close()
+
+        if start_tracing:
+            tracemalloc.stop()
+
+        if self.timer.enabled:
+            self.timer.write(self.id, outdir)
+
         logging.info("  ===! Main Loop Complete !===")
 
     def step(self, outdir: str):
@@ -187,29 +311,72 @@ class TITAN:
             "  STARTING HIV count:{}  Total Incarcerated:{}  HR+:{}  "
             "PrEP:{}".format(
                 len(exposures.HIV.agents),
-                sum([1 for a in self.pop.all_agents if a.incar.active]),  # type: ignore[attr-defined]
-                sum([1 for a in self.pop.all_agents if a.high_risk.active]),  # type: ignore[attr-defined]
-                sum([1 for a in self.pop.all_agents if a.prep.active]),  # type: ignore[attr-defined]
+                self.get_num_active(features.Incar),
+                self.get_num_active(features.HighRisk),
+                self.get_num_active(features.Prep),
             )
         )
 
-        self.timeline_scaling()
+        with self.timer.phase("timeline_scaling"):
+            self.timeline_scaling()
 
-        self.update_all_agents()
+        network_log = self.pop.network_log
+        if network_log is not None:
+            network_log.time = self.time
 
-        stats = ao.get_stats(
-            self.pop.all_agents,
-            self.deaths,
-            self.params,
-            self.exposures,
-            self.features,
-            self.time,
-        )
-        self.print_stats(stats, outdir)
+        with self.timer.phase("update_all_agents"):
+            self.update_all_agents()
+
+        if network_log is not None:
+            if self.time % self.params.outputs.network.temporal_log.keyframe_frequency:
+                network_log.flush()
+            else:
+                network_log.write_keyframe(self.pop.relationships)
+
+        with self.timer.phase("get_stats"):
+            stats = ao.get_stats(
+                self.pop.all_agents,
+                self.deaths,
+                self.params,
+                self.exposures,
+                self.features,
+                self.time,
+            )
+        with self.timer.phase("print_stats"):
+            self.print_stats(stats, outdir)
+        with self.timer.phase("print_memory"):
+            self.print_memory(stats, outdir)
 
         logging.info(f"Number of relationships: {len(self.pop.relationships)}")
         self.pop.all_agents.print_subsets(logging.info)
 
+    def print_memory(self, stats: Dict, outdir: str):
+        """
+        Write the memory report if enabled and it is a reporting time step
+
+        args:
+            stats: the stats dictionary for this time step
+            outdir: path to directory where the report should be saved
+        """
+        memory_params = self.params.outputs.memory
+        if memory_params.enable and self.time % memory_params.frequency == 0:
+            memory.write_memory_report(self, stats, outdir, memory_params.num_sites)
+
+    def get_num_active(self, feature) -> int:
+        """
+        Get the number of agents in the population with a feature active, based on the feature's class level `counts` by race.
+
+        args:
+            feature: the feature class to count
+
+        returns:
+            number of agents with the feature active (0 if the feature is not enabled)
+        """
+        if feature not in self.features:
+            return 0
+
+        return sum(feature.counts.values())
+
     def update_all_agents(self):
         """
         The core of the model.  For a time step, update all of the agents and relationships:
@@ -225,36 +392,89 @@ class TITAN:
             * age
             * all exposures
             * all features (agent level)
+        8. Run features' scheduled events (if enabled)
+        9. Make rare hazards happen to the agents they occur for (if `model.time_to_event`)
         """
+        timer = self.timer
+
         # If static network, ignore relationship progression
         if not self.params.features.static_network:
-            for rel in copy(self.pop.relationships):
-                if rel.progress():
-                    self.pop.remove_relationship(rel)
+            with timer.phase("relationship_progression"):
+                expiry = (
+                    self.pop.rel_table
+                    if self.pop.rel_table is not None
+                    else self.pop.rel_wheel
+                )
+                if expiry is None:
+                    for rel in copy(self.pop.relationships):
+                        if rel.progress():
+                            self.pop.remove_relationship(rel)
+                else:
+                    for rel in expiry.progress():
+                        rel.progress(force=True)
+                        self.pop.remove_relationship(rel)
 
         if self.params.features.die_and_replace:
-            self.die_and_replace()
+            with timer.phase("die_and_replace"):
+                self.die_and_replace()
+
+        # agents by location, for partnering and updating agents this time step
+        partitions = None
+        if self.location_order is not None:
+            partitions = self.get_partitions()
 
         if not self.params.features.static_network:
-            self.pop.update_partner_assignments(t=self.time)
+            with timer.phase("update_partner_assignments"):
+                if self.exchange is None:
+                    with self.random_stream("partnering"):
+                        self.pop.update_partner_assignments(t=self.time)
+                else:
+                    self.partner_partitions(partitions)
 
         # If agent zero enabled, create agent zero at the beginning of main loop.
         if (
             self.time == self.params.agent_zero.start_time
             and self.params.features.agent_zero
         ):
-            self.make_agent_zero()
-
-        for rel in self.pop.relationships:
-            self.agents_interact(rel)
+            with timer.phase("agent_zero"), self.random_stream("agent_zero"):
+                self.make_agent_zero()
+
+        with timer.phase("interactions"):
+            if self.pop.transmissible is None:
+                relationships = self.pop.relationships
+            else:
+                relationships = self.pop.get_transmissible_relationships()
+            if self.location_order is None:
+                self.interact_in_order(relationships)
+            else:
+                self.interact_partitions(relationships)
 
         for feature in self.features:
-            feature.update_pop(self)
-
-        for agent in self.pop.all_agents:
-            self.update_agent(agent)
-
-    def update_agent(self, agent):
+            with timer.phase(f"update_pop.{feature.name}"), self.random_stream(
+                "update_pop", feature.name
+            ):
+                feature.update_pop(self)
+
+        with timer.phase("update_agents"):
+            if self.location_order is None:
+                for agent in self.pop.all_agents:
+                    self.update_agent(agent)
+            else:
+                self.update_partitions(partitions)
+
+        if self.pop.events is not None:
+            with timer.phase("events"), self.random_stream("events"):
+                self.pop.events.run(self)
+
+        if self.hazards is not None:
+            with timer.phase("hazards"), self.random_stream("hazards"):
+                for name in self.hazards.hazards:
+                    if name != "mortality":
+                        self.hazards.run(self, name)
+
+    def update_agent(
+        self, agent: "ag.Agent", items: Optional[List] = None, age: bool = True
+    ):
         """
         Update an agent at the given model timestep.
 
@@ -262,11 +482,53 @@ class TITAN:
             * age
             * all exposures
             * all features (agent level)
+
+        args:
+            agent: the agent to update
+            items: the exposures and features to update [default: all enabled]
+            age: whether to update the agent's age
         """
         # happy birthday agents!
-        if self.time > 0 and (self.time % self.params.model.time.steps_per_year) == 0:
+        if (
+            age
+            and self.time > 0
+            and (self.time % self.params.model.time.steps_per_year) == 0
+        ):
             agent.age += 1
 
+        if (
+            items is not None
+            or self.timer.enabled
+            or "update_agent" in self.stream_subsystems
+        ):
+            location = agent.location.name
+            if items is None:
+                items = self.exposures + self.features
+            use_streams = "update_agent" in self.stream_subsystems
+            pop = self.pop
+            # switch streams directly, this runs for every agent and item
+            saved = (self.run_random, self.np_random, pop.pop_random, pop.np_random)
+            try:
+                for item in items:
+                    start = perf_counter()
+                    if use_streams:
+                        stream = self.streams.get("update_agent", item.name, location)
+                        self.run_random = pop.pop_random = stream.random
+                        self.np_random = pop.np_random = stream.np_random
+                    getattr(agent, item.name).update_agent(self)
+                    if self.timer.enabled:
+                        self.timer.add(
+                            f"update_agent.{item.name}", perf_counter() - start
+                        )
+            finally:
+                (
+                    self.run_random,
+                    self.np_random,
+                    pop.pop_random,
+                    pop.np_random,
+                ) = saved
+            return
+
         for exposure in self.exposures:
             agent_feature = getattr(agent, exposure.name)
             agent_feature.update_agent(self)
@@ -315,22 +577,44 @@ class TITAN:
         if not self.params.features.timeline_scaling:
             return None
 
-        # gather all of the param objectss to be scaled
-        params_set = {self.params}
+        # gather all of the param objects to be scaled, location params share
+        # un-scaled parts of the tree with the main params, so track which
+        # containers have already been updated to avoid scaling a value twice
+        params_list = [self.params]
         for location in self.pop.geography.locations.values():
-            params_set.add(location.params)
+            if all(location.params is not p for p in params_list):
+                params_list.append(location.params)
 
+        scaled = set()
         # iterate over each param and update the values if the time is right
-        for params in params_set:
-            for defn in params.timeline_scaling.timeline.values():
+        for params in params_list:
+            for name, defn in params.timeline_scaling.timeline.items():
                 param = defn.parameter
-                if param != "ts_default":
-                    if defn.start_time == self.time:
-                        logging.info(f"timeline scaling - {param}")
-                        utils.scale_param(params, param, defn.scalar)
-                    elif defn.stop_time == self.time:
-                        logging.info(f"timeline un-scaling - {param}")
-                        utils.scale_param(params, param, 1 / defn.scalar)
+                if param == "ts_default":
+                    continue
+
+                if defn.start_time == self.time:
+                    msg = "timeline scaling"
+                    scalar = defn.scalar
+                elif defn.stop_time == self.time:
+                    msg = "timeline un-scaling"
+                    scalar = 1 / defn.scalar
+                else:
+                    continue
+
+                item, key = utils.get_param_from_path(params, param, "|")
+                if (id(item), key, name) in scaled:
+                    continue
+                scaled.add((id(item), key, name))
+
+                logging.info(f"{msg} - {param}")
+                utils.scale_param(params, param, scalar)
+
+        # the scaled params can change hazards from this time step on
+        if scaled and self.hazards is not None:
+            with self.random_stream("hazards"):
+                for agent in self.pop.all_agents:
+                    self.hazards.update(self, agent, self.time)
 
     def agents_interact(self, rel: "ag.Relationship"):
         """
@@ -352,40 +636,277 @@ class TITAN:
 
         for interaction_type in interaction_types:
             interaction = self.interactions[interaction_type]
-            interaction.interact(self, rel)
+            if self.timer.enabled or "interaction" in self.stream_subsystems:
+                start = perf_counter()
+                with self.random_stream(
+                    "interaction", interaction_type, rel.agent1.location.name
+                ):
+                    interaction.interact(self, rel)
+                if self.timer.enabled:
+                    self.timer.add(
+                        f"interact.{interaction_type}", perf_counter() - start
+                    )
+            else:
+                interaction.interact(self, rel)
+
+    def get_partitions(self) -> Dict[str, List["ag.Agent"]]:
+        """
+        Get the population's agents partitioned by location, in the order locations are processed in (`location_order`), if the population is processed by location (see `location_order`).
+
+        returns:
+            dictionary of location name to the location's agents
+        """
+        assert self.location_order is not None, "Locations are not partitioned"
+        partitions: Dict[str, List["ag.Agent"]] = {
+            location: [] for location in self.location_order
+        }
+        for agent in self.pop.all_agents:
+            partitions[agent.location.name].append(agent)
+
+        return partitions
+
+    def interact_partitions(self, relationships: Iterable["ag.Relationship"]):
+        """
+        Let agents interact location by location in relationships within a location, and then in relationships between locations.
+
+        args:
+            relationships: the relationships to interact in
+        """
+        assert self.location_order is not None, "Locations are not partitioned"
+        local: Dict[str, List["ag.Relationship"]] = {
+            location: [] for location in self.location_order
+        }
+        between = []
+        # relationships within a location are formed in the same order, but their
+        # ids depend on the order locations formed them in
+        def is_local(rel, location=None):
+            return rel.agent1.location == rel.agent2.location and (
+                location is None or rel.agent1.location.name == location
+            )
+
+        for rel in sorted(relationships, key=lambda rel: rel.id):
+            if is_local(rel):
+                local[rel.agent1.location.name].append(rel)
+            else:
+                between.append(rel)
+
+        between_ids = {rel.id for rel in between}
+        for location, location_rels in local.items():
+            # agents converting can make relationships with other locations transmissible
+            for rel in self.interact_in_order(
+                location_rels, lambda rel: is_local(rel, location)
+            ):
+                if not is_local(rel) and rel.id not in between_ids:
+                    between.append(rel)
+                    between_ids.add(rel.id)
+
+        # coordinator phase
+        self.interact_in_order(between, lambda rel: not is_local(rel))
+
+    def interact_in_order(
+        self,
+        relationships: Iterable["ag.Relationship"],
+        accept: Callable[["ag.Relationship"], bool] = lambda rel: True,
+    ) -> List["ag.Relationship"]:
+        """
+        Let agents interact in relationships.  With `model.interactions.transmissible_only`, agents interact in id order, and relationships which become transmissible part way through (an agent in them converted) also interact if they are accepted and come later in the order, as they would if agents interacted in every relationship.
+
+        args:
+            relationships: the relationships to interact in
+            accept: whether a newly transmissible relationship belongs with `relationships`
+
+        returns:
+            newly transmissible relationships which weren't accepted
+        """
+        if self.pop.transmissible is None:
+            for rel in relationships:
+                self.agents_interact(rel)
+            return []
+
+        queue = [(rel.id, rel) for rel in relationships]
+        heapq.heapify(queue)
+        queued = {rel_id for rel_id, _ in queue}
+        rejected: List["ag.Relationship"] = []
+        added: List["ag.Relationship"] = []
+        self.pop.transmissible_added = added
+        try:
+            while queue:
+                rel_id, rel = heapq.heappop(queue)
+                self.agents_interact(rel)
+                for new_rel in added:
+                    if not accept(new_rel):
+                        rejected.append(new_rel)
+                    elif new_rel.id > rel_id and new_rel.id not in queued:
+                        heapq.heappush(queue, (new_rel.id, new_rel))
+                        queued.add(new_rel.id)
+                added.clear()
+        finally:
+            self.pop.transmissible_added = None
+
+        return rejected
+
+    def partner_partitions(self, partitions: Dict[str, List["ag.Agent"]]):
+        """
+        Form relationships location by location between agents in the same location, and then between agents in neighbouring locations through the partner exchange (`location.exchange.enable`).
+
+        args:
+            partitions: the agents in each location (see `get_partitions`)
+        """
+        assert self.exchange is not None, "Partner exchange is not enabled"
+        pop = self.pop
+        exchange_prob = self.params.location.exchange.prob
+
+        # update agent targets annually
+        if self.time % self.params.model.time.steps_per_year == 0:
+            with self.random_stream("partnering"):
+                pop.update_partner_targets()
+
+        components = pop.get_network_components()
+        agents_by_id = {
+            agent.id: agent for agents in partitions.values() for agent in agents
+        }
+        for bond in self.params.classes.bond_types:
+            partnerable: Dict[str, Set["ag.Agent"]] = {
+                location: set() for location in partitions
+            }
+            # build the sets in a fixed order so they iterate in the same order
+            # whatever order locations were processed in before
+            for agent in sorted(pop.partnerable_agents[bond], key=lambda a: a.id):
+                partnerable[agent.location.name].add(agent)
+
+            # reserve a block of relationship ids for each location, in a fixed
+            # order, so ids don't depend on the order locations are processed in
+            rel_ids = {}
+            next_rel_id = ag.Relationship.next_rel_id
+            for location in sorted(partitions):
+                num_wanted = sum(
+                    max(agent.target_partners[bond] - len(agent.partners[bond]), 0)
+                    for agent in partitions[location]
+                )
+                rel_ids[location] = iter(range(next_rel_id, next_rel_id + num_wanted))
+                next_rel_id += num_wanted
+
+            for location, agents in partitions.items():
+                prob = exchange_prob if self.exchange.has_neighbors(location) else 0.0
+                pop.rel_ids = rel_ids[location]
+                with self.random_stream("partnering", bond, location):
+                    exchanged = pop.update_bond_partners(
+                        bond, agents, components, partnerable[location], prob
+                    )
+                self.exchange.submit(
+                    [
+                        exchange.ExchangeRequest(agent.id, location, bond)
+                        for agent in exchanged
+                    ]
+                )
+
+            pop.rel_ids = None
+            ag.Relationship.next_rel_id = next_rel_id
+
+            # coordinator phase - requests are routed to neighbouring locations,
+            # answered there, and the answers delivered back
+            with self.random_stream("exchange", bond):
+                routed = self.exchange.route(pop.pop_random)
+            for location, requests in routed.items():
+                with self.random_stream("exchange", bond, location):
+                    self.exchange.respond(
+                        pop.answer_exchange(
+                            requests, partnerable[location], agents_by_id
+                        )
+                    )
+            with self.random_stream("exchange", bond):
+                pop.apply_exchange(self.exchange.deliver(), partnerable, agents_by_id)
+
+        with self.random_stream("partnering"):
+            pop.finish_partner_assignments()
+
+    def update_partitions(self, partitions: Dict[str, List["ag.Agent"]]):
+        """
+        Update agents location by location for the exposures and features which are `location_local`, and then update all agents for the rest of the features.
+
+        args:
+            partitions: the agents in each location (see `get_partitions`)
+        """
+        items = self.exposures + self.features
+        local = [item for item in items if item.location_local]
+        coordinated = [item for item in items if not item.location_local]
+
+        for agents in partitions.values():
+            for agent in agents:
+                self.update_agent(agent, local)
+
+        # coordinator phase
+        if coordinated:
+            for agent in self.pop.all_agents:
+                self.update_agent(agent, coordinated, age=False)
+
+    def update_hazards(self, agent: "ag.Agent"):
+        """
+        Redraw when rare hazards next occur for an agent after their state changed, if `model.time_to_event` is enabled (see `HazardEngine.update`).
+
+        args:
+            agent: the agent whose state changed
+        """
+        if self.hazards is not None:
+            self.hazards.update(self, agent)
+
+    @contextmanager
+    def random_stream(self, subsystem: str, *key: str):
+        """
+        Context manager which, if the subsystem uses its own random number stream (see `model.seed.streams`), draws the model's and population's random numbers (`run_random`, `np_random`, `pop.pop_random`, `pop.np_random`) from the stream for the subsystem and key inside it.
+
+        example:
+            ```py
+            with model.random_stream("update_pop", "prep"):
+                Prep.update_pop(model)
+            ```
+
+        args:
+            subsystem: the part of the model drawing random numbers (e.g. "mortality")
+            key: further parts of the stream's key (e.g. a location name)
+        """
+        if subsystem not in self.stream_subsystems:
+            yield
+            return
+
+        stream = self.streams.get(subsystem, *key)
+        pop = self.pop
+        saved = (self.run_random, self.np_random, pop.pop_random, pop.np_random)
+        self.run_random = pop.pop_random = stream.random
+        self.np_random = pop.np_random = stream.np_random
+        try:
+            yield
+        finally:
+            self.run_random, self.np_random, pop.pop_random, pop.np_random = saved
 
     def die_and_replace(self):
         """
         Let agents die and replace the dead agent with a new agent randomly.
         """
-        # die stage
-        for agent in self.pop.all_agents:
-            # agent incarcerated, don't evaluate for death
-            if agent.incar.active:
-                continue
-
-            # death rate per 1 person-month
-            p = (
-                prob.get_death_rate(
-                    agent.hiv.active,
-                    agent.hiv.aids,
-                    agent.drug_type,
-                    agent.sex_type,
-                    agent.haart.adherent,
-                    agent.race,
-                    agent.location,
-                    self.params.model.time.steps_per_year,
-                )
-                * self.calibration.mortality
-            )
+        if self.hazards is not None:
+            with self.random_stream("mortality"):
+                self.hazards.run(self, "mortality")
+        else:
+            use_streams = "mortality" in self.stream_subsystems
+
+            # die stage - with streams, each location's deaths don't depend on the
+            # order agents in different locations are evaluated in
+            for agent in self.pop.all_agents:
+                # agent incarcerated, don't evaluate for death
+                if agent.incar.active:
+                    continue
+
+                if use_streams:
+                    rand_gen = self.streams.get("mortality", agent.location.name).random
+                else:
+                    rand_gen = self.run_random
 
-            if self.run_random.random() < p:
-                self.deaths.append(agent)
+                if rand_gen.random() < self.get_mortality_prob(agent):
+                    self.die(agent)
 
-                # End all existing relationships
-                for rel in copy(agent.relationships):
-                    rel.progress(force=True)
-                    self.pop.remove_relationship(rel)
+        # replace agents in the same order whatever order locations are processed in
+        if self.location_order is not None:
+            self.deaths.sort(key=lambda agent: agent.id)
 
         # replace stage
         for agent in self.deaths:
@@ -394,8 +915,57 @@ class TITAN:
 
             # Remove agent from agent class and sub-sets
             self.pop.remove_agent(agent)
+            if self.hazards is not None:
+                self.hazards.remove_agent(agent)
 
-            new_agent = self.pop.create_agent(
-                agent.location, agent.race, self.time, agent.sex_type, agent.drug_type
-            )
+            with self.random_stream("mortality", agent.location.name):
+                new_agent = self.pop.create_agent(
+                    agent.location,
+                    agent.race,
+                    self.time,
+                    agent.sex_type,
+                    agent.drug_type,
+                )
+                self.update_hazards(new_agent)
             self.pop.add_agent(new_agent)
+
+    def get_mortality_prob(self, agent: "ag.Agent") -> float:
+        """
+        Get the probability of an agent dying this time step, from their death rate per 1 person-month.
+
+        args:
+            agent: the agent to get the probability for
+
+        returns:
+            the probability of the agent dying, 0 if incarcerated
+        """
+        if agent.incar.active:  # type: ignore[attr-defined]
+            return 0.0
+
+        return (
+            prob.get_death_rate(
+                agent.hiv.active,  # type: ignore[attr-defined]
+                agent.hiv.aids,  # type: ignore[attr-defined]
+                agent.drug_type,
+                agent.sex_type,
+                agent.haart.adherent,  # type: ignore[attr-defined]
+                agent.race,
+                agent.location,
+                self.params.model.time.steps_per_year,
+            )
+            * self.calibration.mortality
+        )
+
+    def die(self, agent: "ag.Agent"):
+        """
+        Let an agent die, ending all of their relationships.  The agent is replaced in the replace stage of `die_and_replace`.
+
+        args:
+            agent: the agent who dies
+        """
+        self.deaths.append(agent)
+
+        # End all existing relationships
+        for rel in copy(agent.relationships):
+            rel.progress(force=True)
+            self.pop.remove_relationship(rel)
@@ -1,16 +1,15 @@
 #!/usr/bin/env python
 # encoding: utf-8
 
-from typing import Dict, Any, List, Iterator
+from typing import Dict, Any, List, Iterator, Optional
 import itertools
 import os
 
-import networkx as nx  # type: ignore
-from numpy import mean  # type: ignore
 
 from .parse_params import ObjMap
 from . import utils
 from . import agent as ag
+from .centrality import Centrality
 
 
 def setup_aggregates(params: ObjMap, reportables, classes: List[str]) -> Dict:
@@ -254,25 +253,12 @@ def basicReport(
 # ========================== Other Print Functions =============================
 
 
-def effective_size(comp):
-    total_size = 0
-    for node in comp.nodes():
-        num_neighbors = len(comp[node])
-        if num_neighbors == 0:
-            continue
-
-        E = comp.subgraph(comp.neighbors(node))
-        total_size += num_neighbors - (2 * E.size()) / num_neighbors
-
-    return total_size
-
-
 def print_components(
     run_id: str,
     t: int,
     runseed: int,
     popseed: int,
-    components: List,
+    centrality: Centrality,
     outdir: str,
 ):
     """
@@ -283,9 +269,8 @@ def print_components(
         t: current timestep
         runseed: integer used to seed the model's random number generator
         popseed: integer used to seed the population's random number generator
-        components: a list of graph components
+        centrality: network measures for the graph (see `Population.get_centrality`)
         outdir: path where the file should be saved
-        races: the races in the population
     """
     f = open(os.path.join(outdir, f"{run_id}_componentReport_ALL.txt"), "a")
 
@@ -296,18 +281,12 @@ def print_components(
             "\tdensity\tEffectiveSize\tdeg_cent\n"
         )
 
-    for (id, comp) in enumerate(components):
-        num_nodes = comp.number_of_nodes()
-
-        average_size = effective_size(comp) / num_nodes
-        comp_density = nx.density(comp)
-
-        deg_cent = mean(list(nx.degree_centrality(comp).values()))
-
+    density, effective_size, deg_cent = centrality.component_stats()
+    for id in range(len(centrality.components)):
         f.write(
             f"{run_id}\t{runseed}\t{popseed}\t{t}\t{id}\t"
-            f"\t{comp_density:.4f}"
-            f"\t{average_size:.4f}\t{deg_cent}\n"
+            f"\t{density[id]:.4f}"
+            f"\t{effective_size[id]:.4f}\t{deg_cent[id]}\n"
         )
 
     f.close()
@@ -322,54 +301,80 @@ def write_graph_edgelist(graph, path: str, id, time):
         id: identifier for the network, typically the model's `id`
         time: timestep the edgelist is being written at
     """
+    import networkx as nx  # type: ignore
+
     file_path = os.path.join(path, f"{id}_Edgelist_t{time}.txt")
     # Write edgelist with bond type
     nx.write_edgelist(graph, file_path, delimiter="|", data=["type"])
 
 
-def write_network_stats(graph, path: str, id, time):
+def write_network_stats(
+    graph,
+    path: str,
+    id,
+    time,
+    centrality: Optional[Centrality] = None,
+    mode: str = "exact",
+    num_samples: int = 10000,
+    rand_gen=None,
+):
     """
     Writes network statistics to the file `<id>_NetworkStats_t<time>.txt`
 
+    Component sizes, the degree histogram, density and degree centrality are always exact and computed from `centrality`.  The average clustering is exact if `mode` is `exact`, if `mode` is `sampled` it is estimated from `num_samples` wedges and written with a 95% error bound.
+
     args:
+        graph: the network graph
         path: directory where the file should be saved
         id: identifier for the network, typically the model's `id`
         time: timestep the edgelist is being written at
+        centrality: network measures for the graph (built from `graph` if not passed)
+        mode: `exact` or `sampled`
+        num_samples: number of wedges sampled to estimate clustering in `sampled` mode
+        rand_gen: numpy random number generator used in `sampled` mode
     """
-    file_path = os.path.join(path, f"{id}_NetworkStats_t{time}.txt")
-
-    components = utils.connected_components(graph)
-
-    outfile = open(file_path, "w")
-    outfile.write(nx.info(graph))
+    if centrality is None:
+        centrality = Centrality(graph)
 
-    cent_dict = nx.degree_centrality(graph)
+    file_path = os.path.join(path, f"{id}_NetworkStats_t{time}.txt")
 
-    outfile.write(
-        "\nNumber of connected components: {}\n".format(
-            nx.number_connected_components(graph)
+    num_nodes = centrality.num_nodes
+    num_edges = centrality.num_edges()
+    sizes = centrality.component_sizes
+
+    with open(file_path, "w") as outfile:
+        outfile.write(
+            f"Name: {graph.name}\n"
+            f"Type: {type(graph).__name__}\n"
+            f"Number of nodes: {num_nodes}\n"
+            f"Number of edges: {num_edges}\n"
+            f"Average degree: {utils.safe_divide(2 * num_edges, num_nodes):8.4f}"
         )
-    )
-
-    tot_nodes = 0
-    for c in components:
-        tot_nodes += c.number_of_nodes()
-
-    outfile.write(
-        "Average component size: {}\n".format(
-            tot_nodes * 1.0 / nx.number_connected_components(graph)
+        outfile.write(f"\nNumber of connected components: {len(sizes)}\n")
+        outfile.write(f"Average component size: {num_nodes / len(sizes)}\n")
+        outfile.write(f"Maximum component size: {sizes[0]}\n")
+        outfile.write(f"Degree Histogram: {centrality.degree_histogram()}\n")
+        outfile.write(
+            "Graph density: {}\n".format(
+                utils.safe_divide(2 * num_edges, num_nodes * (num_nodes - 1))
+            )
         )
-    )
-    outfile.write(
-        "Maximum component size: {}\n".format(nx.number_of_nodes(components[0]))
-    )
-    outfile.write("Degree Histogram: {}\n".format(nx.degree_histogram(graph)))
-    outfile.write("Graph density: {}\n".format(nx.density(graph)))
-    outfile.write(
-        "Average node degree centrality: {}\n".format(
-            sum(cent_dict.values()) / len(list(cent_dict.values()))
+        outfile.write(
+            "Average node degree centrality: {}\n".format(
+                centrality.degree_centrality().mean()
+            )
         )
-    )
 
-    outfile.write("Average node clustering: {}\n".format(nx.average_clustering(graph)))
-    outfile.close()
+        if mode == "sampled":
+            clustering, bound = centrality.sample_clustering(num_samples, rand_gen)
+            outfile.write(f"Average node clustering: {clustering}\n")
+            outfile.write(
+                f"Average node clustering error bound (95%, {num_samples} "
+                f"sampled wedges): {bound}\n"
+            )
+        else:
+            import networkx as nx  # type: ignore
+
+            outfile.write(
+                "Average node clustering: {}\n".format(nx.average_clustering(graph))
+            )
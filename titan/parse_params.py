@@ -4,7 +4,10 @@ import os
 from inspect import getsourcefile
 from pathlib import Path
 import math
-from typing import Optional, Dict
+import hashlib
+import pickle
+from tempfile import mkstemp
+from typing import Optional, Dict, List
 from copy import deepcopy
 
 
@@ -38,6 +41,12 @@ class ObjMap(dict):
     def __setstate__(self, state):
         self.__dict__.update(state)
 
+    def __copy__(self):
+        cls = self.__class__
+        result = cls.__new__(cls)
+        result.update(self)
+        return result
+
     def __deepcopy__(self, memo):
         cls = self.__class__
         result = cls.__new__(cls)
@@ -93,21 +102,57 @@ def check_params(params: ObjMap):
         ), f"assort values must add to 1, not {assort_value} in {param}"
 
 
+def get_params_hash(paths: List[str], error_on_unused: bool) -> str:
+    """
+    Hash the contents of the yaml files that make up the params, with the files in each
+    directory in sorted order so the hash doesn't depend on the file system.
+
+    args:
+        paths: paths to the param definitions and param files or directories
+        error_on_unused: whether unused parameters are an error
+
+    returns:
+        hex digest identifying this combination of params
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{getattr(paraml, '__version__', '')}|{error_on_unused}".encode())
+    for path in paths:
+        if os.path.isdir(path):
+            files = [
+                os.path.join(path, file)
+                for file in sorted(os.listdir(path))
+                if ".yml" in file or ".yaml" in file
+            ]
+        else:
+            files = [path]
+
+        for file in files:
+            digest.update(os.path.basename(file).encode())
+            with open(file, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+
+    return digest.hexdigest()
+
+
 def create_params(
     setting_name: Optional[str],
     param_path: str,
     outdir: str,
     error_on_unused: bool = False,
+    cache_dir: Optional[str] = None,
 ) -> ObjMap:
     """
     Entry function - given the path to the setting, params, output directory and whether
     or not to use the base setting. Parse and create a params (ObjMap) object.
 
+    If `cache_dir` is passed, the parsed and validated params are saved there keyed by a hash of the contents of all of the yaml files used, and re-used on subsequent calls with the same inputs instead of re-parsing.
+
     args:
         setting_name: path to a settings file or directory or `None`
         param_path: path to parameter file or directory
         outdir: path to directory where computed params will be saved
         error_on_unused: throw a hard error if there are unused parameters, otherwise warnings are only printed
+        cache_dir: path to a directory where parsed params can be cached
 
     returns:
         computed/validated model paramters with defaults filled in where needed
@@ -132,15 +177,45 @@ def create_params(
             param_paths.append(setting_name)
 
     param_paths.append(param_path)
+    out_path = os.path.join(outdir, "params.yml")
+
+    cache_file = None
+    if cache_dir is not None:
+        params_hash = get_params_hash([param_defs, *param_paths], error_on_unused)
+        cache_file = os.path.join(cache_dir, f"params_{params_hash}.pkl")
+        if os.path.isfile(cache_file):
+            with open(cache_file, "rb") as f:
+                parsed, params_yml = pickle.load(f)
+
+            with open(out_path, "w") as f:
+                f.write(params_yml)
+
+            return ObjMap(parsed)
 
     parsed = paraml.create_params(
         param_defs,
         *param_paths,
-        out_path=os.path.join(outdir, "params.yml"),
+        out_path=out_path,
         error_on_unused=error_on_unused,
     )
 
-    parsed = ObjMap(parsed)
-    check_params(parsed)
+    params = ObjMap(parsed)
+    check_params(params)
 
-    return parsed
+    if cache_file is not None:
+        with open(out_path) as f:
+            params_yml = f.read()
+
+        # write to a temporary file then move so concurrent runs never see a partial file
+        os.makedirs(cache_dir, exist_ok=True)  # type: ignore[arg-type]
+        fd, tmp_path = mkstemp(dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((parsed, params_yml), f)
+            os.replace(tmp_path, cache_file)
+        finally:
+            # only left behind if writing the cache failed
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    return params
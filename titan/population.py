@@ -5,11 +5,10 @@ import random
 from collections import deque
 from copy import copy
 from math import ceil
-from typing import List, Dict, Set, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Set, Optional, Tuple
 import logging
 
 import numpy as np  # type: ignore
-import networkx as nx  # type: ignore
 import nanoid  # type: ignore
 
 from . import parse_params
@@ -17,6 +16,10 @@ from . import agent as ag
 from . import location
 from . import partnering
 from . import utils
+from . import centrality
+from . import events
+from . import exchange
+from . import temporal_network
 from . import features
 from . import exposures
 
@@ -47,8 +50,15 @@ class Population:
 
         self.enable_graph = params.model.network.enable
         self.components: List = []
+        # incremented whenever the graph changes, used to invalidate caches
+        self.graph_version = 0
+        self.centrality_cache: Optional[centrality.Centrality] = None
+        # set by the model if relationship changes are being logged
+        self.network_log: Optional[temporal_network.TemporalNetworkLog] = None
 
         if self.enable_graph:
+            import networkx as nx  # type: ignore
+
             self.graph = nx.Graph()
         else:
             self.graph = None
@@ -65,6 +75,13 @@ class Population:
         for exposure in self.exposures:
             exposure.init_class(params)
 
+        # relationships each exposure can be transmitted in, if only those interact
+        self.transmissible: Optional[Dict[str, Set["ag.Relationship"]]] = None
+        if params.model.interactions.transmissible_only:
+            self.transmissible = {exposure.name: set() for exposure in self.exposures}
+        # relationships newly added to the index, collected while agents interact
+        self.transmissible_added: Optional[List["ag.Relationship"]] = None
+
         # set up the in-scope features
         self.features = [
             feature
@@ -95,6 +112,27 @@ class Population:
             self.sex_partners[sex_type] = set()
 
         self.relationships: Set["ag.Relationship"] = set()
+        # durations counted down in arrays, if enabled
+        self.rel_table: Optional[ag.RelationshipTable] = None
+        if params.model.relationship_expiry == "table":
+            self.rel_table = ag.RelationshipTable(list(params.classes.bond_types))
+        # relationships scheduled to end by step, if enabled
+        self.rel_wheel: Optional[ag.RelationshipWheel] = None
+        if params.model.relationship_expiry == "wheel":
+            self.rel_wheel = ag.RelationshipWheel()
+        # ids reserved for new relationships, if any (see `TITAN.partner_partitions`)
+        self.rel_ids: Optional[Iterator[int]] = None
+        # features' timers scheduled by time step, if enabled
+        self.events: Optional[events.EventScheduler] = None
+        if params.model.feature_events:
+            self.events = events.EventScheduler()
+
+        # number of agents by class (performance for caps and logging)
+        self.counts: Dict[str, Dict[str, int]] = {
+            "race": {race: 0 for race in self.params.classes.races},
+            "sex_type": {st: 0 for st in self.params.classes.sex_types},
+            "location": {loc: 0 for loc in self.params.classes.locations},
+        }
 
         # find average partnership durations
         self.mean_rel_duration: Dict[str, Dict] = partnering.get_mean_rel_duration(
@@ -225,6 +263,7 @@ class Population:
         """
         # Add to all agent set
         self.all_agents.add_agent(agent)
+        self.update_counts(agent, 1)
 
         if agent.drug_type == "Inj":
             self.pwid_agents.add_agent(agent)
@@ -235,6 +274,35 @@ class Population:
 
         if self.enable_graph:
             self.graph.add_node(agent)
+            self.graph_version += 1
+
+    def create_relationship(
+        self,
+        agent1: "ag.Agent",
+        agent2: "ag.Agent",
+        duration: int,
+        bond_type: str,
+        id: Optional[int] = None,
+    ) -> "ag.Relationship":
+        """
+        Create a new relationship between two agents, of the type this population stores (a `TableRelationship` if `model.relationship_expiry` is `table`, or a `WheelRelationship` if it is `wheel`).
+
+        args:
+            agent1: first agent
+            agent2: second agent
+            duration: target duration of the relationship
+            bond_type: type of bond for the relationship [params.classes.bond_types]
+            id: unique identifier
+
+        returns:
+            a new relationship
+        """
+        if self.rel_table is not None:
+            return ag.TableRelationship(agent1, agent2, duration, bond_type, id=id)
+        if self.rel_wheel is not None:
+            return ag.WheelRelationship(agent1, agent2, duration, bond_type, id=id)
+
+        return ag.Relationship(agent1, agent2, duration, bond_type, id=id)
 
     def add_relationship(self, rel: "ag.Relationship"):
         """
@@ -244,9 +312,18 @@ class Population:
             rel : The Relationship to be added
         """
         self.relationships.add(rel)
+        if self.rel_table is not None:
+            self.rel_table.add(rel)  # type: ignore[arg-type]
+        if self.rel_wheel is not None:
+            self.rel_wheel.add(rel)  # type: ignore[arg-type]
+        if self.network_log is not None:
+            self.network_log.add_relationship(rel)
 
         if self.enable_graph:
             self.graph.add_edge(rel.agent1, rel.agent2, type=rel.bond_type)
+            self.graph_version += 1
+
+        self.index_transmissible(rel)
 
     def remove_agent(self, agent: "ag.Agent"):
         """
@@ -255,6 +332,9 @@ class Population:
         args:
             agent : Agent to remove
         """
+        if agent in self.all_agents:
+            self.update_counts(agent, -1)
+
         self.all_agents.remove_agent(agent)
 
         for partner_type in self.sex_partners:
@@ -273,11 +353,24 @@ class Population:
 
         if self.enable_graph:
             self.graph.remove_node(agent)
+            self.graph_version += 1
 
         for bond in self.partnerable_agents.values():
             if agent in bond:
                 bond.remove(agent)
 
+    def update_counts(self, agent: "ag.Agent", amount: int):
+        """
+        Update the counts of agents by race, sex_type and location.
+
+        args:
+            agent: the agent being added or removed
+            amount: 1 if the agent is being added, -1 if removed
+        """
+        self.counts["race"][agent.race] += amount
+        self.counts["sex_type"][agent.sex_type] += amount
+        self.counts["location"][agent.location.name] += amount
+
     def remove_relationship(self, rel: "ag.Relationship"):
         """
         Remove a relationship from the population.
@@ -286,6 +379,12 @@ class Population:
             rel : Relationship to remove
         """
         self.relationships.remove(rel)
+        if self.rel_table is not None:
+            self.rel_table.remove(rel)  # type: ignore[arg-type]
+        if self.rel_wheel is not None:
+            self.rel_wheel.remove(rel)  # type: ignore[arg-type]
+        if self.network_log is not None:
+            self.network_log.remove_relationship(rel)
 
         # without this relationship, are agents partnerable again?
         self.update_partnerability(rel.agent1)
@@ -293,6 +392,52 @@ class Population:
 
         if self.enable_graph:
             self.graph.remove_edge(rel.agent1, rel.agent2)
+            self.graph_version += 1
+
+        if self.transmissible is not None:
+            for transmissible in self.transmissible.values():
+                transmissible.discard(rel)
+
+    def index_transmissible(self, rel: "ag.Relationship"):
+        """
+        Update whether a relationship is in each exposure's index of relationships the exposure can be transmitted in (see `BaseExposure.is_transmissible`), if `model.interactions.transmissible_only` is enabled.  Relationships newly added to an index are also collected in `transmissible_added` while it is set (see `TITAN.interact_in_order`).
+
+        args:
+            rel: the relationship to index
+        """
+        if self.transmissible is None:
+            return
+
+        for exposure in self.exposures:
+            transmissible = self.transmissible[exposure.name]
+            if exposure.is_transmissible(rel):
+                if rel not in transmissible:
+                    transmissible.add(rel)
+                    if self.transmissible_added is not None:
+                        self.transmissible_added.append(rel)
+            else:
+                transmissible.discard(rel)
+
+    def update_transmissible(self, agent: "ag.Agent"):
+        """
+        Re-index an agent's relationships after a change to the agent's exposure state (e.g. converting), see `index_transmissible`.
+
+        args:
+            agent: the agent whose state changed
+        """
+        if self.transmissible is not None:
+            for rel in agent.relationships:
+                self.index_transmissible(rel)
+
+    def get_transmissible_relationships(self) -> List["ag.Relationship"]:
+        """
+        Get the relationships any exposure can be transmitted in, ordered by id.
+
+        returns:
+            list of relationships
+        """
+        assert self.transmissible is not None, "Transmissible relationships not indexed"
+        return sorted(set().union(*self.transmissible.values()), key=lambda rel: rel.id)
 
     def get_age(self, loc: "location.Location", race: str) -> Tuple[int, int]:
         """
@@ -310,7 +455,11 @@ class Population:
         return age, i
 
     def update_agent_partners(
-        self, agent: "ag.Agent", bond_type: str, components: List
+        self,
+        agent: "ag.Agent",
+        bond_type: str,
+        components: List,
+        partnerable_agents: Optional[Set["ag.Agent"]] = None,
     ) -> bool:
         """
         Finds and bonds new partner. Creates relationship object for partnership,
@@ -320,11 +469,15 @@ class Population:
         args:
             agent: Agent that is seeking a new partner
             bond_type: What type of bond the agent is seeking to make
+            components: the network's components (as sets of agents), if the graph is enabled
+            partnerable_agents: the agents the partner can be selected from [default: all partnerable agents for the bond type]
 
         returns:
             True if no match was found for agent (used for retries)
         """
-        partnerable_agents = self.partnerable_agents[bond_type]
+        candidates = partnerable_agents
+        if candidates is None:
+            candidates = self.partnerable_agents[bond_type]
         if (
             self.pop_random.random()
             < self.params.partnership.network.same_component.prob
@@ -337,36 +490,154 @@ class Population:
                     agent_component = comp
                     break
 
-            partnerable_agents = partnerable_agents & agent_component
+            candidates = candidates & agent_component
 
         partner = partnering.select_partner(
             agent,
-            partnerable_agents,
+            candidates,
             self.sex_partners,
             self.pwid_agents,
             self.params,
             self.pop_random,
             bond_type,
         )
-        no_match = True
 
         if partner:
-            race = utils.safe_random_choice([agent.race, partner.race], self.pop_random)
-            duration = partnering.get_partnership_duration(
-                agent.location.params, self.np_random, bond_type, race
-            )
-            relationship = ag.Relationship(
-                agent, partner, duration, bond_type=bond_type
+            self.bond(agent, partner, bond_type, partnerable_agents)
+            return False
+
+        return True
+
+    def bond(
+        self,
+        agent: "ag.Agent",
+        partner: "ag.Agent",
+        bond_type: str,
+        partnerable_agents: Optional[Set["ag.Agent"]] = None,
+    ):
+        """
+        Create a relationship between an agent and their new partner with a random duration and add it to the population.  The partner is removed from the partnerable agents if they now have enough partners.
+
+        args:
+            agent: the agent who sought a partner
+            partner: the agent's new partner
+            bond_type: the type of relationship
+            partnerable_agents: a subset of the partnerable agents the partner was selected from, which the partner is also removed from
+        """
+        race = utils.safe_random_choice([agent.race, partner.race], self.pop_random)
+        duration = partnering.get_partnership_duration(
+            agent.location.params, self.np_random, bond_type, race
+        )
+        rel_id = None if self.rel_ids is None else next(self.rel_ids)
+        relationship = self.create_relationship(
+            agent, partner, duration, bond_type, id=rel_id
+        )
+        self.add_relationship(relationship)
+        # can partner still partner?
+        if len(partner.partners[bond_type]) > (
+            partner.target_partners[bond_type]
+            * self.params.calibration.partnership.buffer
+        ):
+            self.partnerable_agents[bond_type].remove(partner)
+            if partnerable_agents is not None:
+                partnerable_agents.discard(partner)
+
+    def answer_exchange(
+        self,
+        requests: List["exchange.ExchangeRequest"],
+        partnerable_agents: Set["ag.Agent"],
+        agents: Dict[int, "ag.Agent"],
+    ) -> List["exchange.ExchangeResponse"]:
+        """
+        Answer the partner exchange requests routed to a location by selecting a partner for each requesting agent from the location's partnerable agents (see `exchange.Exchange`).  No relationships are formed, but a partner is only selected for as many requests as they can take partners.
+
+        args:
+            requests: the requests routed to the location, in agent id order
+            partnerable_agents: the location's agents partners can be selected from
+            agents: the agents by id
+
+        returns:
+            a response to each request
+        """
+        partnerable = copy(partnerable_agents)
+        selected: Dict["ag.Agent", int] = {}
+        responses = []
+        for request in requests:
+            agent = agents[request.agent_id]
+            bond_type = request.bond_type
+            partner = None
+            if len(agent.partners[bond_type]) < agent.target_partners[bond_type]:
+                partner = partnering.select_partner(
+                    agent,
+                    partnerable,
+                    self.sex_partners,
+                    self.pwid_agents,
+                    self.params,
+                    self.pop_random,
+                    bond_type,
+                )
+
+            if partner is not None:
+                selected[partner] = selected.get(partner, 0) + 1
+                # same check as bond, counting the partners selected so far
+                if len(partner.partners[bond_type]) + selected[partner] > (
+                    partner.target_partners[bond_type]
+                    * self.params.calibration.partnership.buffer
+                ):
+                    partnerable.discard(partner)
+
+            responses.append(
+                exchange.ExchangeResponse(
+                    request.agent_id,
+                    request.location,
+                    bond_type,
+                    None if partner is None else partner.id,
+                )
             )
-            self.add_relationship(relationship)
-            # can partner still partner?
-            if len(partner.partners[bond_type]) > (
-                partner.target_partners[bond_type]
-                * self.params.calibration.partnership.buffer
+
+        return responses
+
+    def apply_exchange(
+        self,
+        responses: List["exchange.ExchangeResponse"],
+        partnerable_agents: Dict[str, Set["ag.Agent"]],
+        agents: Dict[int, "ag.Agent"],
+    ) -> int:
+        """
+        Form the relationships answered by the partner exchange (see `exchange.Exchange`).  Answers without a partner are skipped, as are answers where the agent already has their target number of partners, the partner can no longer partner, or the agents were partnered with each other in the meantime.
+
+        args:
+            responses: the responses, in agent id order
+            partnerable_agents: the agents in each location partners were selected from
+            agents: the agents by id
+
+        returns:
+            number of relationships formed
+        """
+        num_formed = 0
+        for response in responses:
+            if response.partner_id is None:
+                continue
+
+            agent = agents[response.agent_id]
+            partner = agents[response.partner_id]
+            bond_type = response.bond_type
+            if (
+                len(agent.partners[bond_type]) >= agent.target_partners[bond_type]
+                or partner not in self.partnerable_agents[bond_type]
+                or partner in agent.get_partners()
             ):
-                self.partnerable_agents[bond_type].remove(partner)
-            no_match = False
-        return no_match
+                continue
+
+            self.bond(
+                agent,
+                partner,
+                bond_type,
+                partnerable_agents[partner.location.name],
+            )
+            num_formed += 1
+
+        return num_formed
 
     def update_partner_assignments(self, t: int):
         """
@@ -380,38 +651,82 @@ class Population:
         if t % self.params.model.time.steps_per_year == 0:
             self.update_partner_targets()
 
-        if self.enable_graph:
-            network_components = [set(g.nodes()) for g in self.components]
-        else:
-            network_components = []
+        network_components = self.get_network_components()
 
         # Now create partnerships until available partnerships are out
         for bond in self.params.classes.bond_types:
-            eligible_agents = deque(
-                [
-                    a
-                    for a in self.all_agents
-                    if len(a.partners[bond]) < a.target_partners[bond]
-                ]
-            )
-            attempts = {a: 0 for a in eligible_agents}
+            self.update_bond_partners(bond, self.all_agents, network_components)
 
-            while eligible_agents:
-                agent = eligible_agents.popleft()
-                if len(agent.partners[bond]) < agent.target_partners[bond]:
+        self.finish_partner_assignments()
 
-                    # no match
-                    if self.update_agent_partners(agent, bond, network_components):
-                        attempts[agent] += 1
+    def get_network_components(self) -> List[Set["ag.Agent"]]:
+        """
+        Get the network's components as sets of agents for partnering, if the graph is enabled
 
-                    # add agent back to eligible pool
-                    if (
-                        len(agent.partners[bond]) < agent.target_partners[bond]
-                        and attempts[agent]
-                        < self.params.calibration.partnership.break_point
-                    ):
-                        eligible_agents.append(agent)
+        returns:
+            list of components (empty if the graph is not enabled)
+        """
+        if self.enable_graph:
+            return [set(g.nodes()) for g in self.components]
+        else:
+            return []
 
+    def update_bond_partners(
+        self,
+        bond: str,
+        agents: Iterable["ag.Agent"],
+        components: List,
+        partnerable_agents: Optional[Set["ag.Agent"]] = None,
+        exchange_prob: float = 0.0,
+    ) -> List["ag.Agent"]:
+        """
+        Create relationships of a bond type for the given agents who want more partners, trying again for agents without a match until they have their target number of partners or reach the partnership `break_point`.
+
+        If `exchange_prob` is set, each time an agent seeks a partner it is instead sent to the partner exchange between locations with that probability (see `exchange.Exchange`), and not tried again.
+
+        args:
+            bond: the type of relationship to create
+            agents: the agents to find partners for
+            components: the network's components (see `get_network_components`)
+            partnerable_agents: the agents partners can be selected from [default: all partnerable agents for the bond type]
+            exchange_prob: probability an attempt is sent to the exchange
+
+        returns:
+            the agents sent to the exchange
+        """
+        eligible_agents = deque(
+            [a for a in agents if len(a.partners[bond]) < a.target_partners[bond]]
+        )
+        attempts = {a: 0 for a in eligible_agents}
+        exchanged = []
+
+        while eligible_agents:
+            agent = eligible_agents.popleft()
+            if len(agent.partners[bond]) < agent.target_partners[bond]:
+                if exchange_prob and self.pop_random.random() < exchange_prob:
+                    exchanged.append(agent)
+                    continue
+
+                # no match
+                if self.update_agent_partners(
+                    agent, bond, components, partnerable_agents
+                ):
+                    attempts[agent] += 1
+
+                # add agent back to eligible pool
+                if (
+                    len(agent.partners[bond]) < agent.target_partners[bond]
+                    and attempts[agent]
+                    < self.params.calibration.partnership.break_point
+                ):
+                    eligible_agents.append(agent)
+
+        return exchanged
+
+    def finish_partner_assignments(self):
+        """
+        Trim the graph (if enabled) and update agents' components after partner assignments
+        """
         if self.enable_graph:
             self.trim_graph()
 
@@ -509,3 +824,25 @@ class Population:
             raise ValueError(
                 "Can't get connected_components, population doesn't have graph enabled."
             )
+
+    def get_centrality(self) -> "centrality.Centrality":
+        """
+        Get the network centrality measures for the current state of the graph (if enabled).  The measures are cached until the graph next changes, so features computing them in the same time step share the work.
+
+        returns:
+            centrality measures for the graph
+        """
+        if not self.enable_graph:
+            raise ValueError(
+                "Can't get centrality, population doesn't have graph enabled."
+            )
+
+        if (
+            self.centrality_cache is None
+            or self.centrality_cache.version != self.graph_version
+        ):
+            self.centrality_cache = centrality.Centrality(
+                self.graph, self.graph_version
+            )
+
+        return self.centrality_cache
@@ -22,11 +22,16 @@ agent_exposure_attrs = [
     exposure.name for exposure in exposures.BaseExposure.__subclasses__()
 ]
 
-# these are functionally saved in the relationships or other files and complicate the agent file
+# these are functionally saved in the relationships or other files (or are caches) and complicate the agent file
 agent_exclude_attrs = (
-    {"partners", "relationships"}.union(agent_feature_attrs).union(agent_exposure_attrs)
+    {"partners", "relationships", "risk_multipliers", "risk_multipliers_time"}
+    .union(agent_feature_attrs)
+    .union(agent_exposure_attrs)
 )
 
+# where a relationship is stored in the population's relationship table or wheel, if any
+rel_exclude_attrs = {"table", "slot", "wheel", "end"}
+
 
 def write(pop: Population, dir: str, compress: bool = True) -> str:
     """
@@ -48,30 +53,33 @@ def write(pop: Population, dir: str, compress: bool = True) -> str:
     agent_file = os.path.join(dir, f"{pop.id}_agents.csv")
 
     a = next(iter(pop.all_agents))
-    # get all attributes
-    agent_attrs = [k for k in a.__dict__.keys() if k not in agent_exclude_attrs]
+    # get all attributes, as declared in __slots__
+    agent_attrs = [k for k in utils.get_attrs(a) if k not in agent_exclude_attrs]
 
     write_class_file(agent_file, pop.all_agents, agent_attrs)
 
     extra_files = []
 
     # write agent extras (features, exposures) to their own files
-    def write_extra_class(extra_attrs, extra_type):
+    def write_extra_class(extra_attrs, extra_type, enabled):
         for extra in extra_attrs:
+            # agents share an inactive instance of extras that aren't enabled
+            if not enabled[extra]:
+                continue
             extra_obj = getattr(a, extra)
-            extra_attrs = list(extra_obj.__dict__.keys())
+            extra_attrs = utils.get_attrs(extra_obj)
             extra_file = os.path.join(dir, f"{pop.id}_{extra_type}_{extra}.csv")
             extra_files.append(extra_file)
             write_extra_class_file(extra_file, pop.all_agents, extra, extra_attrs)
 
-    write_extra_class(agent_feature_attrs, "feat")
-    write_extra_class(agent_exposure_attrs, "exposure")
+    write_extra_class(agent_feature_attrs, "feat", pop.params.features)
+    write_extra_class(agent_exposure_attrs, "exposure", pop.params.exposures)
 
     # open relationship file
     rel_file = os.path.join(dir, f"{pop.id}_relationships.csv")
 
     r = next(iter(pop.relationships))
-    rel_attrs = list(r.__dict__.keys())
+    rel_attrs = [k for k in utils.get_attrs(r) if k not in rel_exclude_attrs]
 
     write_class_file(rel_file, pop.relationships, rel_attrs)
 
@@ -137,11 +145,11 @@ def read(params: ObjMap, path: str) -> Population:
     # create feature dict
     agent_extras: Dict[str, Dict] = {}
 
-    def update_agent_extras(files, extra_type):
+    def update_agent_extras(files, extra_type, enabled):
         pattern = re.compile(f"^.*_{extra_type}_(.*)\\.csv$")
         for file in files:
             m = pattern.match(file)
-            if m is not None:
+            if m is not None and enabled.get(m.group(1), True):
                 extra = m.group(1)
                 agent_extras[extra] = {}
                 with open(file, newline="") as f:
@@ -149,8 +157,8 @@ def read(params: ObjMap, path: str) -> Population:
                     for row in reader:
                         agent_extras[extra][int(row["agent"])] = row
 
-    update_agent_extras(feat_files, "feat")
-    update_agent_extras(exposure_files, "exposure")
+    update_agent_extras(feat_files, "feat", params.features)
+    update_agent_extras(exposure_files, "exposure", params.exposures)
 
     # don't create any agents on init
     params.model.num_pop = 0
@@ -167,6 +175,8 @@ def read(params: ObjMap, path: str) -> Population:
                 agent_extras,
             )
             pop.add_agent(a)
+            for feature in pop.features:
+                getattr(a, feature.name).schedule_events(pop.events)
 
     # update num_pop to actual population
     params.model.num_pop = pop.all_agents.num_members()
@@ -229,7 +239,7 @@ def create_relationship(row: Dict[str, str], pop: Population) -> Relationship:
     init_attrs = ["agent1", "agent2", "duration", "bond_type", "id"]
     agent1 = find_agent(pop, row["agent1"])
     agent2 = find_agent(pop, row["agent2"])
-    rel = Relationship(
+    rel = pop.create_relationship(
         agent1,
         agent2,
         eval(row["duration"]),
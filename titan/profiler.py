@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+import os
+import signal
+from typing import Dict, Iterable, Tuple
+
+DEFAULT_INTERVAL = 0.005  # seconds of cpu time between samples
+
+
+class StackSampler:
+    """
+    A low overhead sampling profiler.  A cpu time interval timer (`SIGPROF`) interrupts the process every `interval` seconds and the handler counts the current call stack of the main thread.  The counts are written as collapsed stacks (one `frame;frame;frame count` line per distinct stack, outermost frame first), the format used by flamegraph tools.
+
+    Only works on platforms with `signal.setitimer` (i.e. not Windows) and must be started from the main thread.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        """
+        args:
+            interval: cpu time between samples in seconds
+        """
+        self.interval = interval
+        self.counts: Dict[Tuple, int] = {}
+        self.labels: Dict[object, str] = {}
+        self.running = False
+
+    def sample(self, signum, frame):
+        """
+        Signal handler, counts the interrupted stack (keyed by code objects, labels are only made when writing)
+        """
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        key = tuple(stack)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def start(self):
+        """
+        Start sampling
+        """
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError(
+                "Profiling requires signal.setitimer (not available on Windows)"
+            )
+
+        self.previous_handler = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.running = True
+
+    def stop(self):
+        """
+        Stop sampling and restore the previous signal handler
+        """
+        if self.running:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler)
+            self.running = False
+
+    def label(self, code) -> str:
+        """
+        Label for a frame, `function (path:line)` with the path shortened to start at the package/script directory
+        """
+        label = self.labels.get(code)
+        if label is None:
+            path = code.co_filename
+            for marker in ("site-packages" + os.sep, "titan" + os.sep):
+                if marker in path:
+                    path = path[path.rindex(marker) :]
+                    break
+            # `;` separates frames in the collapsed format
+            label = f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+            self.labels[code] = label
+        return label
+
+    def collapsed(self) -> Dict[str, int]:
+        """
+        The sampled stacks in collapsed format
+
+        returns:
+            dictionary of collapsed stack (`;` separated frames, outermost first) to number of samples
+        """
+        stacks: Dict[str, int] = {}
+        for codes, count in self.counts.items():
+            stack = ";".join(self.label(code) for code in reversed(codes))
+            stacks[stack] = stacks.get(stack, 0) + count
+        return stacks
+
+    def write(self, path: str):
+        """
+        Write the sampled stacks to a collapsed stack file
+
+        args:
+            path: path of the file to write
+        """
+        write_collapsed(self.collapsed(), path)
+
+
+def write_collapsed(stacks: Dict[str, int], path: str):
+    """
+    Write collapsed stacks to a file, most sampled first
+
+    args:
+        stacks: dictionary of collapsed stack to number of samples
+        path: path of the file to write
+    """
+    with open(path, "w") as f:
+        for stack in sorted(stacks, key=lambda stack: stacks[stack], reverse=True):
+            f.write(f"{stack} {stacks[stack]}\n")
+
+
+def read_collapsed(path: str) -> Dict[str, int]:
+    """
+    Read a collapsed stack file
+
+    args:
+        path: path of the file to read
+
+    returns:
+        dictionary of collapsed stack to number of samples
+    """
+    stacks: Dict[str, int] = {}
+    with open(path) as f:
+        for line in f:
+            stack, count = line.rstrip("\n").rsplit(" ", 1)
+            stacks[stack] = stacks.get(stack, 0) + int(count)
+    return stacks
+
+
+def merge_collapsed(paths: Iterable[str], path: str):
+    """
+    Merge collapsed stack files (e.g. from every run in a sweep) into one file, summing the samples of matching stacks
+
+    args:
+        paths: paths of the files to merge
+        path: path of the merged file to write
+    """
+    merged: Dict[str, int] = {}
+    for in_path in paths:
+        for stack, count in read_collapsed(in_path).items():
+            merged[stack] = merged.get(stack, 0) + count
+    write_collapsed(merged, path)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+import random
+import zlib
+from typing import Dict, Tuple
+
+import numpy as np  # type: ignore
+
+
+class Stream:
+    """
+    An independent source of random numbers, with both a `random.Random` (`random`) and a numpy generator (`np_random`) seeded from the same `numpy.random.SeedSequence`.
+    """
+
+    __slots__ = ("key", "random", "np_random")
+
+    def __init__(self, key: Tuple[str, ...], seed_seq: np.random.SeedSequence):
+        """
+        args:
+            key: the subsystem key the stream was created for
+            seed_seq: the seed sequence for the stream
+        """
+        self.key = key
+        self.random = random.Random(int(seed_seq.generate_state(1, np.uint64)[0]))
+        self.np_random = np.random.default_rng(seed_seq)
+
+    def uniform(self, size: int) -> np.ndarray:
+        """
+        Draw a batch of uniform random numbers in [0, 1) from the stream's numpy generator
+
+        args:
+            size: number of draws
+
+        returns:
+            array of draws
+        """
+        return self.np_random.random(size)
+
+
+class RandomStreams:
+    """
+    Registry of independent random number streams keyed by subsystem, e.g. `("mortality", "north")` or `("interaction", "sex", "north")`.
+
+    A stream's seed depends only on the registry's seed and the stream's key (not on the order in which streams are first used), so work using different streams can be reordered, batched or split between processes without changing any draws.
+    """
+
+    def __init__(self, seed: int):
+        """
+        args:
+            seed: the seed all streams are derived from
+        """
+        self.seed = seed
+        self.streams: Dict[Tuple[str, ...], Stream] = {}
+
+    def get(self, *key: str) -> Stream:
+        """
+        Get the stream for a subsystem, creating it the first time it is requested
+
+        args:
+            key: the parts of the subsystem's key
+
+        returns:
+            the subsystem's stream
+        """
+        stream = self.streams.get(key)
+        if stream is None:
+            spawn_key = tuple(zlib.crc32(part.encode()) for part in key)
+            seed_seq = np.random.SeedSequence(self.seed, spawn_key=spawn_key)
+            stream = Stream(key, seed_seq)
+            self.streams[key] = stream
+
+        return stream
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class ReportWriter:
+    """
+    Runs report writing functions, either immediately or on a background thread so the model can continue to the next time step while reports are written.
+
+    In the background, tasks are run in the order they were submitted from a bounded queue - if the queue is full, `submit` blocks until the writer catches up.  Anything passed to a task must not be changed by the model afterwards (e.g. a fresh stats dictionary, a copy of the graph).  An exception raised by a task is re-raised by the next call to `submit` or `close`.
+    """
+
+    def __init__(self, background: bool = False, queue_size: int = 16):
+        """
+        Create the writer (and start the background thread if used)
+
+        args:
+            background: whether to write reports on a background thread
+            queue_size: maximum number of tasks waiting to be written in the background
+        """
+        self.background = background
+        self.error: Optional[BaseException] = None
+        self.thread: Optional[threading.Thread] = None
+
+        if background:
+            self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+
+    def submit(self, func: Callable, *args, **kwargs):
+        """
+        Write a report by calling `func(*args, **kwargs)`, in the background if enabled
+
+        args:
+            func: the report writing function
+            *args: positional args to call `func` with
+            **kwargs: keyword args to call `func` with
+        """
+        self.check_error()
+        if self.thread is None:
+            func(*args, **kwargs)
+        else:
+            self.queue.put((func, args, kwargs))
+
+    def work(self):
+        """
+        Background thread loop, runs tasks until the `None` sentinel is received
+        """
+        while True:
+            task = self.queue.get()
+            if task is None:
+                break
+
+            if self.error is None:
+                func, args, kwargs = task
+                try:
+                    func(*args, **kwargs)
+                except BaseException as e:
+                    self.error = e
+
+    def check_error(self):
+        """
+        Re-raise an exception from a background task, if there was one
+        """
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def close(self):
+        """
+        Wait for all submitted reports to be written and stop the background thread.  The writer runs reports immediately after it is closed.
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.check_error()
@@ -25,6 +25,8 @@ from titan.population import Population
 import titan.population_io as pop_io
 from titan.parse_params import create_params
 from titan import utils
+from titan.timing import write_timing_summary
+from titan import profiler
 
 # how many cores can we use, environment variable returns string
 NCORES = int(os.environ.get("SLURM_CPUS_PER_TASK", cpu_count()))
@@ -69,6 +71,19 @@ parser.add_argument(
     help="Path to saved population (directory or .tar.gz file)",
 )
 
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="Profile each run with a sampling profiler, saving collapsed stacks for flamegraphs to `profile/`.",
+)
+
+parser.add_argument(
+    "--paramcache",
+    type=str,
+    default=None,
+    help="Optional. Directory to cache parsed params in, re-used if the param files are unchanged.",
+)
+
 
 def sweep_range(string):
     """
@@ -204,20 +219,14 @@ def consolidate_files(outdir):
     """
     for item in os.listdir(outdir):
         subdir = os.path.join(outdir, item)
-        if os.path.isdir(subdir) and item not in ("network", "pop"):
+        if os.path.isdir(subdir) and item not in ("network", "pop", "profile"):
             for report in os.listdir(subdir):
-                # network folder
-                if report == "network":
+                # network, pop, and profile folders
+                if report in ("network", "pop", "profile"):
                     for file in os.listdir(os.path.join(subdir, report)):
                         shutil.move(
                             os.path.join(subdir, report, file),
-                            os.path.join(outdir, "network"),
-                        )
-                elif report == "pop":
-                    for file in os.listdir(os.path.join(subdir, report)):
-                        shutil.move(
-                            os.path.join(subdir, report, file),
-                            os.path.join(outdir, "pop"),
+                            os.path.join(outdir, report),
                         )
                 else:
                     # copy data to existing file
@@ -255,12 +264,16 @@ def update_sweep_file(run_id, pop_id, defn, outdir):
     f.close()
 
 
-def single_run(sweep, outfile_dir, params, save_pop, pop_path):
+def single_run(sweep, outfile_dir, params, save_pop, pop_path, profile=False):
     """
     A single run of titan.  Dispatched from main using parallel processes.
     """
     utils.set_up_logging(params)
 
+    if profile:
+        sampler = profiler.StackSampler()
+        sampler.start()
+
     pid = str(os.getpid())
     pid_outfile_dir = os.path.join(outfile_dir, pid)
     save_pop_dir = (
@@ -273,6 +286,8 @@ def single_run(sweep, outfile_dir, params, save_pop, pop_path):
             os.mkdir(save_pop_dir)
         else:
             save_pop_dir = None
+    if profile and not os.path.isdir(os.path.join(pid_outfile_dir, "profile")):
+        os.mkdir(os.path.join(pid_outfile_dir, "profile"))
 
     # apply params from sweep for this run
     for param, val in sweep.items():
@@ -302,10 +317,14 @@ def single_run(sweep, outfile_dir, params, save_pop, pop_path):
 
     update_sweep_file(model.id, model.pop.id, sweep, pid_outfile_dir)
 
+    if profile:
+        sampler.stop()
+        sampler.write(os.path.join(pid_outfile_dir, "profile", f"{model.id}.folded"))
+
     return time_mod.time() - tic
 
 
-def setup_outdir(outdir, save_pop):
+def setup_outdir(outdir, save_pop, profile=False):
     """
     Set up the results folder - will delete any files already present.
     """
@@ -317,6 +336,8 @@ def setup_outdir(outdir, save_pop):
     os.mkdir(os.path.join(outfile_dir, "network"))
     if save_pop:
         os.mkdir(os.path.join(outfile_dir, "pop"))
+    if profile:
+        os.mkdir(os.path.join(outfile_dir, "profile"))
 
     return outfile_dir
 
@@ -354,6 +375,8 @@ def main(
     error_on_unused: bool = False,
     save_pop: bool = False,
     pop_path: Optional[str] = None,
+    param_cache: Optional[str] = None,
+    profile: bool = False,
 ):
     """
     Run TITAN!
@@ -370,8 +393,10 @@ def main(
         error_on_unused: error if there are parameters that are unused by the model
         save_pop: if true, will save the population to file after creation
         pop_path: path to a population to load instead of creating a new population for each run
+        param_cache: path to a directory where parsed params are cached between runs
+        profile: if true, will profile each run, saving collapsed stacks per run to `profile/` and merged across runs to `profile.folded`
     """
-    outfile_dir = setup_outdir(outdir, save_pop)
+    outfile_dir = setup_outdir(outdir, save_pop, profile)
 
     # generate params - if no setting, set to none
     setting = setting.lower()
@@ -382,6 +407,7 @@ def main(
         params_path,
         outfile_dir,
         error_on_unused=error_on_unused,
+        cache_dir=param_cache,
     )
 
     # set up sweeps
@@ -395,7 +421,8 @@ def main(
     ) as pool:  # set max tasks/child to prevent processor drift
         results = [
             pool.apply_async(
-                single_run, (sweep_def, outfile_dir, params, save_pop, pop_path)
+                single_run,
+                (sweep_def, outfile_dir, params, save_pop, pop_path, profile),
             )
             for sweep_def in sweep_defs
         ]
@@ -416,6 +443,16 @@ def main(
 
     consolidate_files(outfile_dir)
 
+    if params.outputs.timing:
+        write_timing_summary(outfile_dir)
+
+    if profile:
+        profile_dir = os.path.join(outfile_dir, "profile")
+        profiler.merge_collapsed(
+            [os.path.join(profile_dir, file) for file in os.listdir(profile_dir)],
+            os.path.join(outfile_dir, "profile.folded"),
+        )
+
     for task, time_t in enumerate(wct):
         print(("wall clock time on for simulation %d: %8.4f seconds" % (task, time_t)))
 
@@ -434,6 +471,7 @@ def script_init():
     rows = args.rows.strip() if args.rows is not None else None
     sweepfile = args.sweepfile.strip() if args.sweepfile is not None else None
     poppath = args.poppath.strip() if args.poppath is not None else None
+    paramcache = args.paramcache.strip() if args.paramcache is not None else None
     main(
         args.setting.strip(),
         args.params.strip(),
@@ -446,6 +484,8 @@ def script_init():
         error_on_unused=args.error,
         save_pop=args.savepop,
         pop_path=poppath,
+        param_cache=paramcache,
+        profile=args.profile,
     )
 
 
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+import json
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np  # type: ignore
+
+from . import agent as ag
+
+MAGIC = b"TITANNET"
+VERSION = 1
+
+# event types
+ADD = 0
+REMOVE = 1
+KEYFRAME = 2  # start of a keyframe, `rel_id` holds the number of relationships
+KEYFRAME_REL = 3  # a relationship in the preceding keyframe
+
+RECORD = struct.Struct("<iBBqqq")
+RECORD_DTYPE = np.dtype(
+    [
+        ("t", "<i4"),
+        ("event", "u1"),
+        ("bond_type", "u1"),
+        ("rel_id", "<i8"),
+        ("agent1", "<i8"),
+        ("agent2", "<i8"),
+    ]
+)
+
+
+class TemporalNetworkLog:
+    """
+    A binary log of the relationships in a population over time.  Relationship additions and removals are appended as fixed size records (time, event, bond type, relationship id, agent ids) as they happen in `Population.add_relationship` and `Population.remove_relationship`, with periodic keyframes holding every current relationship so the network at a time can be rebuilt without replaying the whole run (see `read_relationships`).
+
+    The file starts with a header giving the bond type names the records' bond type indices refer to.
+    """
+
+    def __init__(self, path: str, bond_types: Iterable[str], time: int = 0):
+        """
+        Open the log file and write its header
+
+        args:
+            path: path of the file to write
+            bond_types: names of the bond types [params.classes.bond_types]
+            time: the time step events are currently being logged at
+        """
+        self.bond_types: List[str] = list(bond_types)
+        self.bond_index = {bond: i for i, bond in enumerate(self.bond_types)}
+        self.time = time
+        self.buffer = bytearray()
+
+        header = json.dumps({"bond_types": self.bond_types}).encode()
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + struct.pack("<II", VERSION, len(header)) + header)
+
+    def record(self, event: int, rel: "ag.Relationship"):
+        """
+        Buffer a record for a relationship at the current time
+
+        args:
+            event: the event type (e.g. `ADD`)
+            rel: the relationship the event is for
+        """
+        self.buffer += RECORD.pack(
+            self.time,
+            event,
+            self.bond_index[rel.bond_type],
+            rel.id,
+            rel.agent1.id,
+            rel.agent2.id,
+        )
+
+    def add_relationship(self, rel: "ag.Relationship"):
+        """
+        Log a new relationship at the current time
+
+        args:
+            rel: the relationship added
+        """
+        self.record(ADD, rel)
+
+    def remove_relationship(self, rel: "ag.Relationship"):
+        """
+        Log the end of a relationship at the current time
+
+        args:
+            rel: the relationship removed
+        """
+        self.record(REMOVE, rel)
+
+    def write_keyframe(self, relationships: Iterable["ag.Relationship"]):
+        """
+        Log every current relationship at the current time
+
+        args:
+            relationships: all of the population's relationships
+        """
+        relationships = list(relationships)
+        self.buffer += RECORD.pack(self.time, KEYFRAME, 0, len(relationships), 0, 0)
+        for rel in relationships:
+            self.record(KEYFRAME_REL, rel)
+        self.flush()
+
+    def flush(self):
+        """
+        Write any buffered records to the file
+        """
+        self.file.write(self.buffer)
+        self.buffer = bytearray()
+
+    def close(self):
+        """
+        Flush and close the file
+        """
+        self.flush()
+        self.file.close()
+
+
+def read_log(path: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Read a temporal network log
+
+    args:
+        path: path of the log file
+
+    returns:
+        the bond type names and a structured array of the records (fields `t`, `event`, `bond_type`, `rel_id`, `agent1`, `agent2`)
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a temporal network log")
+        version, header_len = struct.unpack("<II", f.read(8))
+        if version != VERSION:
+            raise ValueError(f"Unsupported temporal network log version {version}")
+        header = json.loads(f.read(header_len))
+        records = np.frombuffer(f.read(), dtype=RECORD_DTYPE)
+
+    return header["bond_types"], records
+
+
+def read_relationships(path: str, time: int) -> Dict[int, Tuple[int, int, str]]:
+    """
+    Rebuild the relationships in the network at the end of a time step from a temporal network log.  Starts from the last keyframe at or before `time` and replays the events after it.
+
+    args:
+        path: path of the log file
+        time: the time step to rebuild the network at
+
+    returns:
+        dictionary of relationship id to (agent1 id, agent2 id, bond type)
+    """
+    bond_types, records = read_log(path)
+
+    keyframes = np.flatnonzero((records["event"] == KEYFRAME) & (records["t"] <= time))
+    if len(keyframes) == 0:
+        raise ValueError(f"No keyframe at or before time {time}")
+    start = keyframes[-1]
+    num_rels = records["rel_id"][start]
+
+    rels = {}
+    for rec in records[start + 1 : start + 1 + num_rels].tolist():
+        rels[rec[3]] = (rec[4], rec[5], bond_types[rec[2]])
+
+    events = records[start + 1 + num_rels :]
+    events = events[(events["t"] <= time) & (events["event"] <= REMOVE)]
+    for t, event, bond, rel_id, agent1, agent2 in events.tolist():
+        if event == ADD:
+            rels[rel_id] = (agent1, agent2, bond_types[bond])
+        else:
+            rels.pop(rel_id, None)
+
+    return rels
+
+
+def read_graph(path: str, time: int):
+    """
+    Rebuild the network at the end of a time step from a temporal network log as a networkx graph.  Nodes are agent ids and edges have the relationship's bond type as the `type` attribute (as in `output.write_graph_edgelist`).  Agents without relationships are not included.
+
+    args:
+        path: path of the log file
+        time: the time step to rebuild the network at
+
+    returns:
+        the network graph
+    """
+    import networkx as nx  # type: ignore
+
+    graph = nx.Graph()
+    for agent1, agent2, bond_type in read_relationships(path, time).values():
+        graph.add_edge(agent1, agent2, type=bond_type)
+
+    return graph
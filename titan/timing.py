@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+from contextlib import contextmanager
+import csv
+import os
+from time import perf_counter
+from typing import Dict
+
+
+class PhaseTimer:
+    """
+    Accumulates wall clock time and call counts for named phases of a model run.  When disabled, `phase` does no timing and callers timing many small calls should check `enabled` to skip timing entirely.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        args:
+            enabled: whether to record timings
+        """
+        self.enabled = enabled
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float):
+        """
+        Record a call of a phase
+
+        args:
+            name: name of the phase
+            seconds: wall clock time the call took
+        """
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Context manager which times the code inside it as a call of a phase
+
+        example:
+            ```py
+            with model.timer.phase("die_and_replace"):
+                model.die_and_replace()
+            ```
+
+        args:
+            name: name of the phase
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def write(self, run_id: str, outdir: str):
+        """
+        Append the timings to `timingReport.txt` in outdir, one row per phase.
+
+        args:
+            run_id: unique identifer for this run of the model
+            outdir: path where the file should be saved
+        """
+        with open(os.path.join(outdir, "timingReport.txt"), "a") as f:
+            if f.tell() == 0:
+                f.write("run_id\tphase\tcalls\tseconds\n")
+            for name, seconds in self.seconds.items():
+                f.write(f"{run_id}\t{name}\t{self.calls[name]}\t{seconds:.6f}\n")
+
+
+def write_timing_summary(outdir: str):
+    """
+    Roll up the timing reports of all runs in outdir (`timingReport.txt`, as consolidated by `run_titan`) into `timingSummary.txt`, with the number of runs, total calls, total seconds, and mean seconds per run for each phase.
+
+    args:
+        outdir: path where the timing report is and the summary should be saved
+    """
+    runs: Dict[str, set] = {}
+    calls: Dict[str, int] = {}
+    seconds: Dict[str, float] = {}
+    with open(os.path.join(outdir, "timingReport.txt"), newline="") as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            name = row["phase"]
+            runs.setdefault(name, set()).add(row["run_id"])
+            calls[name] = calls.get(name, 0) + int(row["calls"])
+            seconds[name] = seconds.get(name, 0.0) + float(row["seconds"])
+
+    with open(os.path.join(outdir, "timingSummary.txt"), "w") as f:
+        f.write("phase\truns\tcalls\tseconds\tmean_seconds\n")
+        for name in sorted(seconds, key=lambda name: seconds[name], reverse=True):
+            num_runs = len(runs[name])
+            f.write(
+                f"{name}\t{num_runs}\t{calls[name]}\t{seconds[name]:.6f}"
+                f"\t{seconds[name] / num_runs:.6f}\n"
+            )
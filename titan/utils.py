@@ -1,13 +1,23 @@
 import random
+from copy import copy
 from functools import wraps
-from typing import TypeVar, Collection, Union, Iterable
+from typing import (
+    Any,
+    TypeVar,
+    Collection,
+    Union,
+    Iterable,
+    Iterator,
+    Set,
+    Dict,
+    List,
+    Generic,
+)
 from math import floor
 import logging
 import os
 from datetime import datetime
 
-import networkx as nx  # type: ignore
-
 from . import distributions
 from .parse_params import ObjMap
 
@@ -130,6 +140,133 @@ def safe_shuffle(seq: Collection[T], rand_gen) -> Iterable[T]:
         return []
 
 
+def get_attrs(obj: Any) -> List[str]:
+    """
+    Get the names of an object's attributes: the `__slots__` declared by its class and base classes (base classes first), followed by any other attributes in its `__dict__`.
+
+    args:
+        obj: the object to get attributes of
+
+    returns:
+        list of attribute names
+    """
+    attrs: List[str] = []
+    for cls in reversed(type(obj).__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for attr in slots:
+            if attr not in ("__dict__", "__weakref__") and attr not in attrs:
+                attrs.append(attr)
+
+    for attr in getattr(obj, "__dict__", {}):
+        if attr not in attrs:
+            attrs.append(attr)
+
+    return attrs
+
+
+def make_inactive(cls):
+    """
+    Create an inactive, read only instance of a feature or exposure class, to be shared by all agents when it is not enabled.  It has the class's initial attribute values (with `agent` as `None`).  Setting an attribute to a different value raises an `AttributeError`.
+
+    args:
+        cls: the feature or exposure class
+
+    returns:
+        the inactive instance
+    """
+
+    def set_attr(self, attr, value):
+        if getattr(self, attr, None) != value:
+            raise AttributeError(
+                f"{cls.name} is not enabled, can't set its {attr} to {value}"
+            )
+
+    def del_attr(self, attr):
+        raise AttributeError(f"{cls.name} is not enabled, can't delete its {attr}")
+
+    template = cls(None)
+    inactive_cls = type(
+        f"Inactive{cls.__name__}",
+        (cls,),
+        {"__slots__": (), "__setattr__": set_attr, "__delattr__": del_attr},
+    )
+    inactive = object.__new__(inactive_cls)
+    for attr in get_attrs(template):
+        object.__setattr__(inactive, attr, getattr(template, attr))
+
+    return inactive
+
+
+class IndexedSet(Generic[T]):
+    """
+    A set which also supports uniform random selection in constant time.  Items are stored in a list with a dictionary of each item's position, removal swaps the last item into the removed item's slot.
+    """
+
+    def __init__(self, items: Iterable[T] = ()):
+        self.items: List[T] = []
+        self.index: Dict[T, int] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item) -> bool:
+        return item in self.index
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def add(self, item: T):
+        """
+        Add an item to the set if it is not already present
+
+        args:
+            item: the item to add
+        """
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item: T):
+        """
+        Remove an item from the set if it is present
+
+        args:
+            item: the item to remove
+        """
+        i = self.index.pop(item, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.index[last] = i
+
+    def clear(self):
+        """
+        Remove all items from the set
+        """
+        self.items = []
+        self.index = {}
+
+    def pop_random(self, rand_gen) -> T:
+        """
+        Remove and return a uniformly random item from the set
+
+        args:
+            rand_gen: random number generator
+
+        returns:
+            the removed item
+        """
+        item = self.items[safe_random_int(0, len(self.items), rand_gen)]
+        self.discard(item)
+        return item
+
+
 @memo
 def parse_var(dist_value, dist_type):
     type_caster = eval(dist_type)
@@ -204,6 +341,35 @@ def get_param_from_path(params: ObjMap, param_path: str, delimiter: str):
     return path_params, path[-1]
 
 
+def copy_param_path(
+    params: ObjMap, param_path: str, owned: Set[int], delimiter: str = "|"
+):
+    """
+    Given the params and a parameter path in the format prep|cap, replace every
+    container along the path (excluding the leaf value) with a shallow copy so the
+    leaf can be changed without affecting any other params object sharing the
+    rest of the tree.
+
+    args:
+        params: the params object whose path should be made writable
+        param_path: delimited path to the parameter
+        owned: ids of containers already copied for this params object (updated in place)
+        delimiter: the delimiter used in `param_path`
+    """
+    path = param_path.split(delimiter)
+    path_params = params
+    for p in path[:-1]:
+        key: Union[str, int] = p
+        if key not in path_params:
+            key = int(p)
+        child = path_params[key]
+        if id(child) not in owned:
+            child = copy(child)
+            owned.add(id(child))
+            path_params[key] = child
+        path_params = child
+
+
 def scale_param(params: ObjMap, param_path: str, scalar: float, delimiter="|"):
     """
     Given the params and a parameter path in the format prep|cap, scale the
@@ -261,6 +427,8 @@ def connected_components(graph):
     returns:
         list of connected components
     """
+    import networkx as nx  # type: ignore
+
     return sorted(
         list(graph.subgraph(c) for c in nx.connected_components(graph)),
         key=len,